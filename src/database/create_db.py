@@ -7,5 +7,9 @@ def create_tables():
     Base.metadata.create_all(bind=engine)
     print("Sucesso! As tabelas foram criadas.")
 
+    # Registra o banco novo na última versão do schema (os índices já vieram com o create_all)
+    from migracoes import aplicar_migracoes
+    aplicar_migracoes(engine)
+
 if __name__ == "__main__":
     create_tables()
\ No newline at end of file
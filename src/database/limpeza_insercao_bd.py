@@ -1,8 +1,16 @@
+import json
+import os
 import pandas as pd
 import numpy as np
-from sqlalchemy import text
-from database import engine, SessionLocal
-from models import Jogador, Estatistica2025, SetorRef, PosicaoRef, ArquetipoRef, CaracteristicaTatica
+from sqlalchemy import text, MetaData, select, and_, bindparam
+from database import engine, SessionLocal, Base
+from operacoes_bd import (comando_upsert, esvaziar_tabela, chaves_estrangeiras_desligadas, trocar_tabelas,
+                          indices_por_tabela)
+from matriz_metricas import exportar_matriz
+from metricas_derivadas import calcular_metricas_derivadas
+from snapshot_fontes import atualizar_snapshot, arquivo_do_snapshot
+from models import (Jogador, Estatistica2025, HashEstatistica2025, DeusesArquetipos, SetorRef, PosicaoRef, ArquetipoRef,
+                    CaracteristicaTatica, jogador_setor, jogador_posicao, estatisticas_posicao_2025)
 
 # --- CONFIGURAÇÃO DE URLs ---
 BASE_URL = "LINK"
@@ -17,6 +25,12 @@ URLS = {
     'deuses': f"{BASE_URL}?gid=946728303&single=true&output=csv"
 }
 
+# --- STAGING LOCAL ---
+# Tabelas raspadas (geral, stats, tatica) deixadas pelos scrapers em src/scrappers/area_staging.py.
+# Só as referências continuam vindo das planilhas publicadas.
+PASTA_STAGING = 'caminho/staging'
+ARQUIVO_PONTEIRO = f'{PASTA_STAGING}/atual.json'
+
 # Dicionário de Tradução Explícito (Inglês -> EAFC Brasil)
 TRADUCAO_POSICOES = {
     'GK': 'GL',    # Goleiro
@@ -35,6 +49,21 @@ TRADUCAO_POSICOES = {
 
 MAPA_SETORES = {'F': 'Ataque', 'M': 'Meio', 'D': 'Defesa', 'G': 'Gol'}
 
+# Linhas por INSERT ... ON DUPLICATE KEY UPDATE (limita o tamanho do pacote enviado ao MariaDB)
+LOTE_UPSERT = 1000
+
+URL_IMAGEM_JOGADOR = "https://api.sofascore.app/api/v1/player/{}/image"
+
+# --- CARGA POR TABELA-SOMBRA ---
+# True: cada tabela de referência é montada numa cópia, validada e só então entra no lugar da atual
+# (quem consulta durante a sincronização nunca vê a tabela vazia). False: TRUNCATE + INSERT como antes.
+CARGA_POR_SOMBRA = True
+SUFIXO_SOMBRA = '__nova'
+SUFIXO_ANTIGA = '__antiga'
+
+# A carga nova é recusada se trouxer menos que esta fração das linhas atuais (planilha cortada)
+FRACAO_MINIMA_LINHAS = 0.5
+
 
 def limpar_valor(val, tipo_func):
     if pd.isna(val):
@@ -59,132 +88,398 @@ def traduzir_posicao_eafc(sigla_en):
     return ", ".join(posicoes_traduzidas)
 
 
+def preparar_jogadores(df_geral):
+    """
+    Limpa a tabela 'geral' de uma vez só, já no formato da tabela jogadores
+
+    Args:
+        df_geral: DataFrame da tabela 'geral' (já sem as linhas sem posição)
+
+    Returns:
+        DataFrame: uma linha por player_id, com as colunas da tabela jogadores e None no lugar de NaN
+    """
+    df = pd.DataFrame({
+        'player_id': df_geral['id'].astype('int64'),
+        'name': df_geral['name'].astype(str),
+        'slug': df_geral['slug'].astype(str),
+        'posicao_bruta': df_geral['position'].astype(str),
+        'height': pd.to_numeric(df_geral['height'], errors='coerce'),
+        'preferredFoot': df_geral['preferredFoot'].where(df_geral['preferredFoot'].notna(), "N/A").astype(str),
+        'dateOfBirthTimestamp': pd.to_numeric(df_geral['dateOfBirthTimestamp'], errors='coerce'),
+        'time_id': df_geral['time_id'].astype('int64'),
+        'time_nome': df_geral['time_nome'].astype(str),
+    })
+
+    if 'country.name' in df_geral.columns:
+        df['country_name'] = df_geral['country.name'].astype(str)
+    else:
+        df['country_name'] = "Brazil"
+    df['url_imagem'] = df['player_id'].map(URL_IMAGEM_JOGADOR.format)
+
+    # Jogador transferido no meio da coleta aparece duas vezes: vale a última linha
+    df = df.drop_duplicates(subset=['player_id'], keep='last')
+    return df.astype(object).where(df.notna(), None)
+
+
+def upsert_em_lotes(conexao, tabela, df, tamanho_lote=LOTE_UPSERT):
+    """
+    Upsert de um DataFrame inteiro, em lotes (ON DUPLICATE KEY UPDATE no MariaDB, ver operacoes_bd.py)
+
+    Args:
+        conexao: conexão já dentro de uma transação (engine.begin())
+        tabela: Table do SQLAlchemy (ex: Jogador.__table__)
+        df: DataFrame com as colunas da tabela, sem NaN
+        tamanho_lote: nº de linhas por comando
+
+    Returns:
+        int: nº de linhas enviadas
+    """
+    comando = comando_upsert(conexao, tabela, df.columns)
+
+    registros = df.to_dict('records')
+    for inicio in range(0, len(registros), tamanho_lote):
+        conexao.execute(comando, registros[inicio:inicio + tamanho_lote])
+    return len(registros)
+
+
+def upsert_jogadores(df_jogadores, tamanho_lote=LOTE_UPSERT):
+    """
+    Grava os jogadores com INSERT ... ON DUPLICATE KEY UPDATE em lotes, numa transação só
+
+    Jogador que já existe tem time, posição etc. atualizados em vez de ser ignorado.
+
+    Args:
+        df_jogadores: DataFrame de preparar_jogadores
+        tamanho_lote: nº de linhas por comando
+
+    Returns:
+        int: nº de jogadores enviados
+    """
+    with engine.begin() as conexao:
+        return upsert_em_lotes(conexao, Jogador.__table__, df_jogadores, tamanho_lote)
+
+
+def sincronizar_vinculos(conexao, tabela, coluna_ref, df_vinculos):
+    """
+    Deixa a tabela de associação igual ao conjunto de vínculos calculado, com poucos comandos
+
+    Os vínculos atuais são lidos numa consulta só e comparados em pandas. Só os jogadores que
+    aparecem em df_vinculos têm vínculos removidos (quem não veio na carga fica como está).
+
+    Args:
+        conexao: conexão já dentro de uma transação (engine.begin())
+        tabela: tabela de associação (jogador_setor, jogador_posicao)
+        coluna_ref: coluna do lado da referência ('id_setor', 'id_posicao')
+        df_vinculos: DataFrame com player_id e coluna_ref (sem repetições)
+
+    Returns:
+        tuple: (vínculos inseridos, vínculos removidos)
+    """
+    df_atuais = pd.DataFrame(conexao.execute(select(tabela.c.player_id, tabela.c[coluna_ref])).all(),
+                             columns=['player_id', coluna_ref])
+    comparacao = df_vinculos.astype('int64').merge(df_atuais.astype('int64'), how='outer', indicator=True)
+
+    novos = comparacao[comparacao['_merge'] == 'left_only'][['player_id', coluna_ref]]
+    removidos = comparacao[(comparacao['_merge'] == 'right_only')
+                           & comparacao['player_id'].isin(df_vinculos['player_id'])][['player_id', coluna_ref]]
+
+    if len(novos):
+        conexao.execute(tabela.insert(), novos.to_dict('records'))
+    if len(removidos):
+        condicao = and_(tabela.c.player_id == bindparam('b_player_id'), tabela.c[coluna_ref] == bindparam('b_ref'))
+        parametros = [{'b_player_id': pid, 'b_ref': ref} for pid, ref in zip(removidos['player_id'].tolist(),
+                                                                              removidos[coluna_ref].tolist())]
+        conexao.execute(tabela.delete().where(condicao), parametros)
+    return len(novos), len(removidos)
+
+
+def hash_metricas(df_metricas):
+    """
+    Hash de 64 bits do vetor de métricas de cada jogador
+
+    Tudo vira float64 e as colunas entram em ordem alfabética, para o hash não mudar só porque
+    uma coluna veio como int numa carga e como float na outra.
+
+    Args:
+        df_metricas: DataFrame indexado por player_id, só com as colunas numéricas
+
+    Returns:
+        Series: hash em hexadecimal (16 caracteres) por player_id
+    """
+    normalizado = df_metricas[sorted(df_metricas.columns)].astype('float64')
+    hashes = pd.util.hash_pandas_object(normalizado, index=False)
+    return hashes.map('{:016x}'.format)
+
+
+def carregar_estatisticas_incremental(df_final_stats, tamanho_lote=LOTE_UPSERT):
+    """
+    Carga incremental da estatisticas_2025: só grava o que mudou desde a última sincronização
+
+    Compara o hash das métricas de cada jogador com o guardado em hash_estatisticas_2025.
+    Jogador novo ou com métricas diferentes vai por upsert; jogador que sumiu da planilha é
+    apagado. Tudo numa transação só.
+
+    Args:
+        df_final_stats: DataFrame com player_id + as colunas da tabela estatisticas_2025
+        tamanho_lote: nº de linhas por comando de upsert
+
+    Returns:
+        dict: contagens de 'inseridos', 'atualizados', 'inalterados' e 'removidos'
+    """
+    HashEstatistica2025.__table__.create(engine, checkfirst=True)
+
+    df_novo = df_final_stats.drop_duplicates(subset=['player_id'], keep='last').set_index('player_id')
+    hashes_novos = hash_metricas(df_novo)
+
+    # LEFT JOIN: linha já gravada sem hash (carga antiga, por TRUNCATE) conta como atualizada
+    hashes_guardados = pd.read_sql(
+        text("SELECT e.player_id, h.hash_metricas FROM estatisticas_2025 e "
+             "LEFT JOIN hash_estatisticas_2025 h ON h.player_id = e.player_id"),
+        engine, index_col='player_id')['hash_metricas']
+
+    ja_gravados = hashes_novos.index.isin(hashes_guardados.index)
+    iguais = ja_gravados & (hashes_novos.values == hashes_guardados.reindex(hashes_novos.index).values)
+    ids_alterados = hashes_novos.index[~iguais]
+    ids_removidos = hashes_guardados.index[~hashes_guardados.index.isin(hashes_novos.index)].tolist()
+
+    with engine.begin() as conexao:
+        if ids_removidos:
+            for tabela in (HashEstatistica2025.__table__, Estatistica2025.__table__):
+                for inicio in range(0, len(ids_removidos), tamanho_lote):
+                    lote = ids_removidos[inicio:inicio + tamanho_lote]
+                    conexao.execute(tabela.delete().where(tabela.c.player_id.in_(lote)))
+
+        upsert_em_lotes(conexao, Estatistica2025.__table__, df_novo.loc[ids_alterados].reset_index(), tamanho_lote)
+        df_hashes = pd.DataFrame({'player_id': ids_alterados, 'hash_metricas': hashes_novos.loc[ids_alterados].values})
+        upsert_em_lotes(conexao, HashEstatistica2025.__table__, df_hashes, tamanho_lote)
+
+    return {
+        'inseridos': int((~ja_gravados).sum()),
+        'atualizados': int((ja_gravados & ~iguais).sum()),
+        'inalterados': int(iguais.sum()),
+        'removidos': len(ids_removidos),
+    }
+
+
+def _tem_dependentes(nome_tabela):
+    """True se alguma tabela do models.py tem chave estrangeira apontando para esta."""
+    for tabela in Base.metadata.tables.values():
+        for fk in tabela.foreign_keys:
+            if fk.column.table.name == nome_tabela:
+                return True
+    return False
+
+
+def _criar_sombra(conexao, nome_tabela, nome_sombra):
+    """Cria a tabela-sombra com a mesma definição do models.py (colunas, índices e FKs)."""
+    metadata = MetaData()
+    for tabela in Base.metadata.tables.values():
+        tabela.to_metadata(metadata)
+    sombra = metadata.tables[nome_tabela].to_metadata(metadata, name=nome_sombra)
+    # Onde o nome do índice é global, a sombra nasce sem índices (recriados depois da troca)
+    if not indices_por_tabela(conexao):
+        sombra.indexes.clear()
+    sombra.create(conexao)
+
+
+def _contar(conexao, nome_tabela):
+    return conexao.execute(text(f"SELECT COUNT(*) FROM {nome_tabela}")).scalar()
+
+
+def substituir_tabela(nome_tabela, df):
+    """
+    Troca todo o conteúdo de uma tabela pelo DataFrame sem deixá-la vazia no meio do caminho
+
+    A carga vai para uma tabela-sombra ({nome}__nova), que é validada (linhas gravadas ==
+    linhas do DataFrame e pelo menos FRACAO_MINIMA_LINHAS das linhas atuais). Se passar:
+        - tabela sem FKs apontando para ela: RENAME TABLE atômico da sombra no lugar da atual;
+        - tabela referenciada por outras (setores_ref, posicoes_ref, arquetipos_ref): o conteúdo
+          é trocado a partir da sombra numa transação só, porque o RENAME levaria junto as FKs
+          das tabelas filhas (jogador_setor, jogador_posicao...) para a tabela antiga.
+    Quem lê durante a carga continua vendo a versão anterior até a troca.
+
+    Args:
+        nome_tabela: nome da tabela no banco
+        df: DataFrame com as colunas da tabela
+
+    Raises:
+        ValueError: a validação da sombra falhou (a tabela atual fica intacta)
+    """
+    if not CARGA_POR_SOMBRA:
+        with engine.connect() as conexao:
+            with chaves_estrangeiras_desligadas(conexao):
+                esvaziar_tabela(conexao, nome_tabela)
+            conexao.commit()
+        df.to_sql(nome_tabela, engine, if_exists='append', index=False)
+        return
+
+    sombra = nome_tabela + SUFIXO_SOMBRA
+    antiga = nome_tabela + SUFIXO_ANTIGA
+
+    # --- 1. MONTA E VALIDA A SOMBRA ---
+    with engine.begin() as conexao:
+        conexao.execute(text(f"DROP TABLE IF EXISTS {sombra}"))
+        conexao.execute(text(f"DROP TABLE IF EXISTS {antiga}"))
+        _criar_sombra(conexao, nome_tabela, sombra)
+    df.to_sql(sombra, engine, if_exists='append', index=False)
+
+    with engine.connect() as conexao:
+        linhas_sombra = _contar(conexao, sombra)
+        linhas_atuais = _contar(conexao, nome_tabela)
+    if linhas_sombra != len(df) or linhas_sombra == 0 or linhas_sombra < FRACAO_MINIMA_LINHAS * linhas_atuais:
+        with engine.begin() as conexao:
+            conexao.execute(text(f"DROP TABLE IF EXISTS {sombra}"))
+        raise ValueError(f"Carga de '{nome_tabela}' recusada: {linhas_sombra} linhas gravadas, "
+                         f"{len(df)} esperadas, {linhas_atuais} na tabela atual.")
+
+    # --- 2. TROCA ---
+    if _tem_dependentes(nome_tabela):
+        with engine.begin() as conexao:
+            # DELETE (e não TRUNCATE, que faz commit implícito): a troca inteira é uma transação só
+            # Colunas pelo nome: a ordem física da tabela viva pode não ser a do models.py
+            # (tabela criada antes pelo to_sql ou alterada à mão)
+            nome_seguro = conexao.dialect.identifier_preparer.quote
+            colunas = ", ".join(nome_seguro(c.name) for c in Base.metadata.tables[nome_tabela].columns)
+            with chaves_estrangeiras_desligadas(conexao):
+                conexao.execute(text(f"DELETE FROM {nome_tabela}"))
+                conexao.execute(text(f"INSERT INTO {nome_tabela} ({colunas}) SELECT {colunas} FROM {sombra}"))
+        with engine.begin() as conexao:
+            conexao.execute(text(f"DROP TABLE {sombra}"))
+    else:
+        with engine.begin() as conexao:
+            trocar_tabelas(conexao, nome_tabela, sombra, antiga)
+            conexao.execute(text(f"DROP TABLE {antiga}"))
+            if not indices_por_tabela(conexao):
+                for indice in Base.metadata.tables[nome_tabela].indexes:
+                    indice.create(conexao)
+    print(f"'{nome_tabela}' substituída ({linhas_atuais} -> {linhas_sombra} linhas).")
+
+
+def ler_fonte(nome, **opcoes_csv):
+    """
+    Lê uma planilha publicada do snapshot local (ver snapshot_fontes.py)
+
+    Args:
+        nome: chave em URLS
+        opcoes_csv: opções repassadas ao read_csv
+
+    Returns:
+        DataFrame: dados da fonte (direto da url, se ela não estiver no snapshot)
+    """
+    arquivo = arquivo_do_snapshot(nome)
+    if arquivo is None:
+        return pd.read_csv(URLS[nome], **opcoes_csv)
+    return pd.read_csv(arquivo, **opcoes_csv)
+
+
+def _entrada_staging(nome):
+    if not os.path.exists(ARQUIVO_PONTEIRO):
+        return None
+    with open(ARQUIVO_PONTEIRO, 'r', encoding='utf-8') as f:
+        return json.load(f).get(nome)
+
+
+def carregar_tabela(nome, **opcoes_csv_nuvem):
+    """
+    Lê a versão atual de uma tabela raspada direto do staging local
+
+    Args:
+        nome: chave da tabela ('geral', 'stats', 'tatica')
+        opcoes_csv_nuvem: opções do read_csv usadas só no fallback pela planilha publicada
+
+    Returns:
+        DataFrame: dados da tabela (da planilha publicada, se o staging não tiver a tabela)
+    """
+    entrada = _entrada_staging(nome)
+    if entrada is None:
+        print(f"[Staging] Tabela '{nome}' não está no staging local, usando a planilha publicada...")
+        return ler_fonte(nome, **opcoes_csv_nuvem)
+
+    caminho = os.path.join(PASTA_STAGING, entrada['arquivo'])
+    print(f"[Staging] Lendo '{nome}' de {caminho} ({entrada['linhas']} linhas, {entrada['gerado_em']})")
+    if caminho.endswith('.parquet'):
+        return pd.read_parquet(caminho)
+    return pd.read_csv(caminho, sep=';', encoding='utf-8-sig')
+
+
 def sincronizar_banco_de_dados():
     db = SessionLocal()
     try:
+        # --- 0. FONTES ---
+        # Todas as planilhas que não estão no staging são baixadas de uma vez, em paralelo
+        print("Atualizando o snapshot local das planilhas publicadas...")
+        fontes = {}
+        for nome, url in URLS.items():
+            if _entrada_staging(nome) is None:
+                fontes[nome] = url
+        atualizar_snapshot(fontes)
+
         # --- 1. REFERÊNCIAS (Lógica Anti-Duplicata) ---
         print("Povoando tabelas de referência...")
 
-        # Lista das tabelas de referência para limpar antes de repovoar
-        tabelas_ref = ['setores_ref', 'posicoes_ref', 'arquetipos_ref', 'deuses_arquetipos']
-
-        with engine.connect() as conn:
-            # Desativa verificações de FK temporariamente para limpar sem erros
-            conn.execute(text("SET FOREIGN_KEY_CHECKS = 0;"))
-            for tabela in tabelas_ref:
-                conn.execute(text(f"TRUNCATE TABLE {tabela};"))
-            conn.execute(text("SET FOREIGN_KEY_CHECKS = 1;"))
-            conn.commit()
-
-        # Agora insere normalmente, sem risco de ID duplicado
-        pd.read_csv(URLS['setores']).to_sql('setores_ref', engine, if_exists='append', index=False)
-        pd.read_csv(URLS['posicoes_ref']).to_sql('posicoes_ref', engine, if_exists='append', index=False)
-        pd.read_csv(URLS['arquetipos']).to_sql('arquetipos_ref', engine, if_exists='append', index=False)
+        # Cada tabela só sai do ar na troca, depois de carregada e validada (ver substituir_tabela)
+        substituir_tabela('setores_ref', ler_fonte('setores'))
+        substituir_tabela('posicoes_ref', ler_fonte('posicoes_ref'))
+        substituir_tabela('arquetipos_ref', ler_fonte('arquetipos'))
 
         # --- 2. JOGADORES ---
         print("Cadastrando jogadores e vinculando setores...")
-        df_geral = pd.read_csv(URLS['geral'])
+        df_geral = carregar_tabela('geral')
         df_geral.columns = df_geral.columns.str.strip()
         df_geral = df_geral.dropna(subset=['position'])
 
-        for _, row in df_geral.iterrows():
-            player_id_planilha = int(row['id'])
-            jogador = db.query(Jogador).filter_by(player_id=player_id_planilha).first()
-
-            if not jogador:
-
-                # 1. Preparação dos dados (extração e limpeza)
-                nome = str(row['name'])
-                slug = str(row['slug'])
-                posicao = str(row['position'])
-                altura = limpar_valor(row['height'], float)
-                nascimento = limpar_valor(row['dateOfBirthTimestamp'], float)
-                id_time = int(row['time_id'])
-                nome_time = str(row['time_nome'])
-
-                # 2. Lógica condicional explícita para o pé preferido
-                if pd.notna(row['preferredFoot']):
-                    pe_preferido = str(row['preferredFoot'])
-                else:
-                    pe_preferido = "N/A"
-
-                # 3. Lógica condicional explícita para o país
-                if 'country.name' in row:
-                    pais = str(row['country.name'])
-                else:
-                    pais = "Brazil"
-
-                # 4. Construção da URL de imagem
-                url_foto = "https://api.sofascore.app/api/v1/player/" + str(player_id_planilha) + "/image"
-
-                # 5. Instanciação do objeto com variáveis limpas
-                jogador = Jogador(
-                    player_id=player_id_planilha,
-                    name=nome,
-                    slug=slug,
-                    posicao_bruta=posicao,
-                    height=altura,
-                    preferredFoot=pe_preferido,
-                    dateOfBirthTimestamp=nascimento,
-                    country_name=pais,
-                    time_id=id_time,
-                    time_nome=nome_time,
-                    url_imagem=url_foto
-                )
-                db.add(jogador)
-                db.flush()
-
-            # Vincula apenas o SETOR (F, M, D, G)
-            nome_setor = MAPA_SETORES.get(row['position'])
-            if nome_setor:
-                setor_obj = db.query(SetorRef).filter_by(nome_setor=nome_setor).first()
-                if setor_obj and setor_obj not in jogador.setores:
-                    jogador.setores.append(setor_obj)
-        db.commit()
+        total = upsert_jogadores(preparar_jogadores(df_geral))
+        print(f"{total} jogadores gravados (novos inseridos, existentes atualizados).")
+
+        # Referências carregadas uma vez; o vínculo sai de um merge em pandas
+        with engine.connect() as conexao:
+            mapa_setores = dict(conexao.execute(select(SetorRef.nome_setor, SetorRef.id_setor)).all())
+            mapa_posicoes = {}
+            for sigla, id_posicao in conexao.execute(select(PosicaoRef.sigla_posicao, PosicaoRef.id_posicao)).all():
+                mapa_posicoes.setdefault(sigla, id_posicao)
+            ids_jogadores = set(conexao.execute(select(Jogador.player_id)).scalars())
+
+        # Vincula apenas o SETOR (F, M, D, G)
+        df_setores = pd.DataFrame({
+            'player_id': df_geral['id'].astype('int64'),
+            'id_setor': df_geral['position'].map(MAPA_SETORES).map(mapa_setores),
+        }).dropna().drop_duplicates()
+        with engine.begin() as conexao:
+            inseridos, removidos = sincronizar_vinculos(conexao, jogador_setor, 'id_setor', df_setores)
+        print(f"Setores: {inseridos} vínculos novos, {removidos} removidos.")
 
         # --- 3. CARACTERÍSTICAS TÁTICAS E ASSOCIAÇÃO DE POSIÇÕES ---
         print("Traduzindo táticas e vinculando jogador na posição...")
-        df_tatica = pd.read_csv(URLS['tatica'])
-
-        for _, row in df_tatica.iterrows():
-            player_id_planilha = int(row['player_id'])
-            jogador = db.query(Jogador).filter_by(player_id=player_id_planilha).first()
-
-            if not jogador:
-                continue
-
-            # 1. Traduz a string para o CaracteristicaTatica (Ex: "ST, CAM" -> "ATA, MEI")
-            pos_traduzida = traduzir_posicao_eafc(row['posicoes_detalhadas'])
-
-            if pos_traduzida:
-                # 2. Salva o texto traduzido na tabela de tática
-                tatica = CaracteristicaTatica(
-                    player_id=player_id_planilha,
-                    posicoes_detalhadas=pos_traduzida,
-                    ids_fortes=str(row.get('ids_fortes', '')),
-                    ids_fracos=str(row.get('ids_fracos', ''))
-                )
-                db.merge(tatica)
-
-                # 3. VÍNCULO REAL NA TABELA jogador_posicao
-                # Quebra a string traduzida ("ATA, MEI") para buscar cada ID no banco
-                siglas = []
-                partes_da_posicao = pos_traduzida.split(',')
-
-                for s in partes_da_posicao:
-                    sigla_limpa = s.strip()
-                    siglas.append(sigla_limpa)
-
-                for sigla in siglas:
-                    pos_ref = db.query(PosicaoRef).filter_by(sigla_posicao=sigla).first()
-                    if pos_ref and pos_ref not in jogador.posicoes:
-                        jogador.posicoes.append(pos_ref)
-
-        db.commit()
+        df_tatica = carregar_tabela('tatica')
+        df_tatica = df_tatica[df_tatica['player_id'].isin(ids_jogadores)]
+
+        # 1. Traduz a string para o CaracteristicaTatica (Ex: "ST, CAM" -> "ATA, MEI")
+        posicoes_traduzidas = df_tatica['posicoes_detalhadas'].map(traduzir_posicao_eafc)
+        df_tatica = df_tatica[posicoes_traduzidas.notna()]
+        posicoes_traduzidas = posicoes_traduzidas[posicoes_traduzidas.notna()]
+
+        # 2. Texto traduzido na tabela de tática
+        df_caracteristicas = pd.DataFrame({'player_id': df_tatica['player_id'].astype('int64'),
+                                           'posicoes_detalhadas': posicoes_traduzidas})
+        for coluna in ('ids_fortes', 'ids_fracos'):
+            df_caracteristicas[coluna] = df_tatica[coluna].astype(str) if coluna in df_tatica.columns else ''
+        df_caracteristicas = df_caracteristicas.drop_duplicates(subset=['player_id'], keep='last')
+
+        # 3. VÍNCULO REAL NA TABELA jogador_posicao: "ATA, MEI" vira uma linha por sigla
+        siglas = posicoes_traduzidas.str.split(',').explode().str.strip()
+        df_posicoes = pd.DataFrame({
+            'player_id': df_tatica['player_id'].astype('int64').reindex(siglas.index),
+            'id_posicao': siglas.map(mapa_posicoes),
+        }).dropna().drop_duplicates()
+
+        with engine.begin() as conexao:
+            upsert_em_lotes(conexao, CaracteristicaTatica.__table__, df_caracteristicas)
+            inseridos, removidos = sincronizar_vinculos(conexao, jogador_posicao, 'id_posicao', df_posicoes)
+        print(f"Posições: {len(df_caracteristicas)} táticas gravadas, {inseridos} vínculos novos, {removidos} removidos.")
 
         # --- 4. ESTATÍSTICAS (As 116 Colunas) ---
         print("Processando as 116 estatísticas para jogadores válidos...")
-        df_stats = pd.read_csv(URLS['stats'], decimal=',')
+        df_stats = carregar_tabela('stats', decimal=',')
 
         # Sincroniza os IDs
         # Realiza a consulta no banco de dados
@@ -217,17 +512,32 @@ def sincronizar_banco_de_dados():
         # 2. Executar a remoção das colunas identificadas
         df_final_stats = df_stats.drop(columns=colunas_para_remover)
 
-        with engine.connect() as conexao:
-            conexao.execute(text("TRUNCATE TABLE estatisticas_2025;"))
-            conexao.commit()
-
-        # Agora o player_id será a única "chave" enviada junto com as métricas
-        df_final_stats.to_sql('estatisticas_2025', con=engine, if_exists='append', index=False)
-        print("Sucesso! Dados limpos e 116 colunas integradas no MariaDB.")
+        # Só o que mudou desde a última sincronização é escrito (sem TRUNCATE + reinserção)
+        contagem = carregar_estatisticas_incremental(df_final_stats)
+        print(f"Sucesso! Estatísticas sincronizadas: {contagem['inseridos']} inseridos, "
+              f"{contagem['atualizados']} atualizados, {contagem['inalterados']} inalterados, "
+              f"{contagem['removidos']} removidos.")
+
+        # Matriz float32 em disco para pontuação/similaridade (só é regravada se o conteúdo mudou)
+        df_estatisticas = pd.read_sql(select(Estatistica2025.__table__), engine)
+        exportar_matriz('estatisticas_2025', df_estatisticas, 'player_id')
+
+        # --- 4.1 MÉTRICAS POR 90 MINUTOS E PERCENTIS POR POSIÇÃO ---
+        print("Calculando métricas por 90 minutos e percentis por posição...")
+        consulta_posicoes = select(jogador_posicao.c.player_id, PosicaoRef.sigla_posicao).join(
+            PosicaoRef, PosicaoRef.id_posicao == jogador_posicao.c.id_posicao)
+        df_posicoes = pd.read_sql(consulta_posicoes, engine)
+
+        df_derivadas = calcular_metricas_derivadas(df_estatisticas, df_posicoes)
+        if df_derivadas.empty:
+            print("Nenhum jogador com posição e estatísticas: estatisticas_posicao_2025 não foi alterada.")
+        else:
+            estatisticas_posicao_2025.create(engine, checkfirst=True)
+            substituir_tabela('estatisticas_posicao_2025', df_derivadas)
 
         # --- 5. DEUSES DOS ARQUÉTIPOS ---
         print("Processando os atributos dos Deuses (Arquétipos)...")
-        df_deuses = pd.read_csv(URLS['deuses'], decimal=',')
+        df_deuses = ler_fonte('deuses', decimal=',')
 
         # As colunas inúteis para ignorar
         cols_para_ignorar_deuses = ['player_name', 'type', 'position', 'team_name', 'team_id', 'id', 'statisticsType',
@@ -246,9 +556,10 @@ def sincronizar_banco_de_dados():
 
         df_final_deuses = df_deuses.drop(columns=colunas_para_remover_deuses)
 
-        # Insere na nova tabela deuses_arquetipos
-        df_final_deuses.to_sql('deuses_arquetipos', con=engine, if_exists='append', index=False)
+        # Substitui a tabela deuses_arquetipos inteira (ver substituir_tabela)
+        substituir_tabela('deuses_arquetipos', df_final_deuses)
         print("Sucesso! Deuses integrados no MariaDB.")
+        exportar_matriz('deuses_arquetipos', pd.read_sql(select(DeusesArquetipos.__table__), engine), 'id_arquetipo')
 
     except Exception as e:
         print(f"Erro crítico: {e}")
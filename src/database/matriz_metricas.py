@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# --- MATRIZES DE MÉTRICAS EM DISCO (np.memmap) ---
+# estatisticas_2025 e deuses_arquetipos exportadas como matriz float32 contígua (linhas = jogadores
+# ou arquétipos, colunas = métricas). Quem pontua/agrupa abre o arquivo sem consultar o banco, e
+# vários processos mapeando o mesmo arquivo dividem a mesma memória (page cache do sistema).
+#
+# Cada versão é um arquivo novo ({nome}.{assinatura}.f32); o manifesto {nome}.json aponta para a
+# atual. Quem já abriu a versão anterior continua lendo ela até reabrir.
+PASTA_MATRIZES = 'caminho/matrizes'
+VERSOES_MANTIDAS = 2
+
+
+def _caminho_manifesto(nome, pasta):
+    return os.path.join(pasta, f"{nome}.json")
+
+
+def ler_manifesto(nome, pasta=PASTA_MATRIZES):
+    """Manifesto da versão atual da matriz (ou None se ela nunca foi exportada)."""
+    caminho = _caminho_manifesto(nome, pasta)
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def assinatura(df):
+    """Hash do conteúdo (chaves, colunas e valores): muda só se a carga mudou."""
+    valores = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    colunas = pd.util.hash_array(np.array(list(df.columns), dtype=object))
+    return hashlib.sha256(valores.tobytes() + colunas.tobytes()).hexdigest()[:16]
+
+
+def exportar_matriz(nome, df, coluna_chave, pasta=PASTA_MATRIZES):
+    """
+    Grava a tabela como matriz float32 mapeável, se o conteúdo mudou desde a última exportação
+
+    Args:
+        nome: nome da matriz (ex: 'estatisticas_2025')
+        df: DataFrame com a coluna_chave e as métricas
+        coluna_chave: coluna que vira o índice de linhas ('player_id', 'id_arquetipo')
+        pasta: pasta das matrizes
+
+    Returns:
+        bool: True se uma versão nova foi gravada, False se a atual já era igual
+    """
+    df = df.drop_duplicates(subset=[coluna_chave], keep='last').set_index(coluna_chave).sort_index()
+    metricas = df.apply(pd.to_numeric, errors='coerce').astype('float32')
+    if metricas.empty:
+        # np.memmap não mapeia arquivo vazio; a versão anterior continua valendo
+        print(f"[Matriz] '{nome}' sem linhas, exportação ignorada.")
+        return False
+    versao = assinatura(metricas)
+
+    anterior = ler_manifesto(nome, pasta)
+    if anterior is not None and anterior['assinatura'] == versao \
+            and os.path.exists(os.path.join(pasta, anterior['arquivo'])):
+        print(f"[Matriz] '{nome}' já está atualizada ({anterior['linhas']}x{len(anterior['colunas'])}).")
+        return False
+
+    os.makedirs(pasta, exist_ok=True)
+    arquivo = f"{nome}.{versao}.f32"
+    arquivo_ids = f"{nome}.{versao}.ids.npy"
+
+    matriz = np.memmap(os.path.join(pasta, arquivo), dtype='float32', mode='w+', shape=metricas.shape)
+    matriz[:] = metricas.to_numpy()
+    matriz.flush()
+    del matriz
+    np.save(os.path.join(pasta, arquivo_ids), metricas.index.to_numpy(dtype='int64'))
+
+    manifesto = {
+        'arquivo': arquivo,
+        'arquivo_ids': arquivo_ids,
+        'chave': coluna_chave,
+        'colunas': list(metricas.columns),
+        'linhas': int(metricas.shape[0]),
+        'dtype': 'float32',
+        'assinatura': versao,
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+    }
+    caminho = _caminho_manifesto(nome, pasta)
+    with open(caminho + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+    os.replace(caminho + '.tmp', caminho)
+
+    _podar_versoes(nome, pasta, versao, anterior)
+    print(f"[Matriz] '{nome}' exportada: {manifesto['linhas']}x{len(manifesto['colunas'])} float32 em {arquivo}")
+    return True
+
+
+def _podar_versoes(nome, pasta, versao_atual, anterior):
+    # Fica a atual e a anterior (processo que abriu a anterior ainda pode estar lendo)
+    manter = {versao_atual}
+    if anterior is not None and VERSOES_MANTIDAS > 1:
+        manter.add(anterior['assinatura'])
+    for arquivo in os.listdir(pasta):
+        partes = arquivo.split('.')
+        if arquivo.startswith(f"{nome}.") and len(partes) >= 3 and partes[1] not in manter:
+            os.remove(os.path.join(pasta, arquivo))
+
+
+class MatrizMetricas:
+    """Matriz aberta só para leitura, sem cópia: linhas por chave e colunas por nome."""
+
+    def __init__(self, nome, pasta=PASTA_MATRIZES):
+        manifesto = ler_manifesto(nome, pasta)
+        if manifesto is None:
+            raise FileNotFoundError(f"Matriz '{nome}' não encontrada em {pasta}. Rode o limpeza_insercao_bd.py.")
+
+        self.colunas = manifesto['colunas']
+        self.assinatura = manifesto['assinatura']
+        self.ids = np.load(os.path.join(pasta, manifesto['arquivo_ids']))
+        self.matriz = np.memmap(os.path.join(pasta, manifesto['arquivo']), dtype=manifesto['dtype'], mode='r',
+                                shape=(manifesto['linhas'], len(self.colunas)))
+        self._linha_da_chave = {int(chave): i for i, chave in enumerate(self.ids)}
+        self._indice_coluna = {coluna: j for j, coluna in enumerate(self.colunas)}
+
+    def linha(self, chave):
+        """Vetor de métricas de um jogador/arquétipo (visão da matriz, sem cópia)."""
+        return self.matriz[self._linha_da_chave[chave]]
+
+    def coluna(self, nome_coluna):
+        """Uma métrica para todas as linhas (na ordem de self.ids)."""
+        return self.matriz[:, self._indice_coluna[nome_coluna]]
+
+    def linhas(self, chaves):
+        """Submatriz de várias chaves (cópia, na ordem pedida)."""
+        return self.matriz[[self._linha_da_chave[c] for c in chaves]]
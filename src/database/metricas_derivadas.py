@@ -0,0 +1,45 @@
+import pandas as pd
+from models import COLUNAS_METRICAS, METRICAS_POR_90
+
+# --- MÉTRICAS POR 90 MINUTOS E PERCENTIS POR POSIÇÃO ---
+# As métricas da estatisticas_2025 são totais da temporada: comparar jogadores exige dividir pelos
+# minutos e ranquear dentro da posição. Isso é feito aqui, uma vez por carga, em cima da tabela
+# inteira (sem laço por jogador), e o resultado vai para estatisticas_posicao_2025.
+
+# Abaixo disso o "por 90" de um jogador é barulho (ex: 1 gol em 20 minutos): ele fica sem percentil
+MINUTOS_MINIMOS = 300
+
+
+def calcular_metricas_derivadas(df_estatisticas, df_posicoes, minutos_minimos=MINUTOS_MINIMOS):
+    """
+    Métricas por 90 minutos e percentil de cada métrica entre os jogadores da mesma posição
+
+    Args:
+        df_estatisticas: tabela estatisticas_2025 (player_id + métricas)
+        df_posicoes: vínculos jogador x posição (player_id, sigla_posicao)
+        minutos_minimos: minutos mínimos para entrar no cálculo dos percentis
+
+    Returns:
+        DataFrame: uma linha por (player_id, sigla_posicao) com as colunas de estatisticas_posicao_2025
+    """
+    df = df_estatisticas.drop_duplicates(subset=['player_id'], keep='last').set_index('player_id')
+    df = df.reindex(columns=COLUNAS_METRICAS).apply(pd.to_numeric, errors='coerce')
+
+    # Jogador sem minutos fica sem "por 90" (NaN), em vez de divisão por zero
+    minutos = df['minutesPlayed'].where(df['minutesPlayed'] > 0)
+    por_90 = df[METRICAS_POR_90].div(minutos, axis=0) * 90
+
+    # Base dos percentis: acumuladas por 90 minutos, taxas e percentuais como vieram
+    comparaveis = df.copy()
+    comparaveis[METRICAS_POR_90] = por_90
+
+    vinculos = df_posicoes[['player_id', 'sigla_posicao']].drop_duplicates()
+    base = vinculos.merge(comparaveis, left_on='player_id', right_index=True, how='inner')
+
+    qualificados = base[base['minutesPlayed'] >= minutos_minimos]
+    percentis = qualificados.groupby('sigla_posicao')[COLUNAS_METRICAS].rank(pct=True) * 100
+
+    resultado = base[['player_id', 'sigla_posicao', 'minutesPlayed']].copy()
+    resultado = resultado.join(base[METRICAS_POR_90].add_suffix('_p90'))
+    resultado = resultado.join(percentis.add_suffix('_pct'))
+    return resultado.reset_index(drop=True)
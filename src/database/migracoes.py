@@ -0,0 +1,86 @@
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, select
+from database import engine, Base
+from models import METRICAS_RANQUEADAS
+
+# --- MIGRAÇÕES VERSIONADAS DO SCHEMA ---
+# O create_db.py cria as tabelas do zero; aqui ficam as mudanças para bancos que já existem.
+# Cada migração roda uma vez só e fica registrada em versao_schema. Migração nova entra no fim
+# da lista MIGRACOES com o próximo número.
+
+metadata_versao = MetaData()
+versao_schema = Table(
+    "versao_schema",
+    metadata_versao,
+    Column("versao", Integer, primary_key=True),
+    Column("descricao", String(255), nullable=False),
+    Column("aplicada_em", DateTime, nullable=False),
+)
+
+
+def criar_indices(conexao, nomes):
+    """
+    Cria os índices declarados no models.py que ainda não existem no banco
+
+    Args:
+        conexao: conexão do SQLAlchemy
+        nomes: nomes dos índices (como declarados no models.py)
+    """
+    indices = {}
+    for tabela in Base.metadata.tables.values():
+        for indice in tabela.indexes:
+            indices[indice.name] = indice
+
+    for nome in nomes:
+        indices[nome].create(conexao, checkfirst=True)
+
+
+def _m001_indices_recomendacao(conexao):
+    # Ranking por posição: posicoes_ref (sigla) -> jogador_posicao (id_posicao) -> estatisticas (métrica)
+    criar_indices(conexao, ['ix_posicoes_ref_sigla', 'ix_jogador_posicao_posicao', 'ix_jogador_setor_setor',
+                            'ix_jogadores_time_id'])
+    criar_indices(conexao, [f"ix_estatisticas_2025_{m}" for m in METRICAS_RANQUEADAS])
+
+
+MIGRACOES = [
+    (1, "Índices das consultas de recomendação", _m001_indices_recomendacao),
+]
+
+
+def versao_atual(conexao):
+    """Maior versão já aplicada (0 se nenhuma)."""
+    versoes = conexao.execute(select(versao_schema.c.versao)).scalars().all()
+    return max(versoes, default=0)
+
+
+def aplicar_migracoes(engine_alvo=engine):
+    """
+    Aplica, em ordem, as migrações que o banco ainda não tem
+
+    Args:
+        engine_alvo: engine do banco a migrar
+
+    Returns:
+        list: versões aplicadas nesta execução
+    """
+    metadata_versao.create_all(engine_alvo, checkfirst=True)
+    with engine_alvo.connect() as conexao:
+        atual = versao_atual(conexao)
+
+    aplicadas = []
+    for versao, descricao, migracao in MIGRACOES:
+        if versao <= atual:
+            continue
+        print(f"Aplicando migração {versao}: {descricao}...")
+        with engine_alvo.begin() as conexao:
+            migracao(conexao)
+            conexao.execute(versao_schema.insert().values(versao=versao, descricao=descricao,
+                                                          aplicada_em=datetime.now()))
+        aplicadas.append(versao)
+
+    print(f"Schema na versão {MIGRACOES[-1][0] if aplicadas else atual} ({len(aplicadas)} migrações aplicadas agora).")
+    return aplicadas
+
+
+if __name__ == "__main__":
+    aplicar_migracoes()
@@ -1,15 +1,21 @@
+import re
 from typing import List, Optional
 from datetime import datetime
-from sqlalchemy import ForeignKey, String, Float, Integer, BigInteger, Table, Column, DateTime, Text
+from sqlalchemy import ForeignKey, String, Float, Integer, BigInteger, Table, Column, DateTime, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from database import Base
 
+# Métricas usadas para ordenar rankings de recomendação: cada uma ganha um índice (métrica, player_id)
+METRICAS_RANQUEADAS = ['rating', 'goals', 'assists', 'expectedGoals', 'expectedAssists', 'keyPasses']
+
 # --- Tabelas de Associação (N:M) ---
 jogador_posicao = Table(
     "jogador_posicao",
     Base.metadata,
     Column("player_id", ForeignKey("jogadores.player_id"), primary_key=True),
     Column("id_posicao", ForeignKey("posicoes_ref.id_posicao"), primary_key=True),
+    # A PK (player_id, id_posicao) não serve para "todos os jogadores da posição X"
+    Index("ix_jogador_posicao_posicao", "id_posicao", "player_id"),
 )
 
 jogador_setor = Table(
@@ -17,6 +23,7 @@ jogador_setor = Table(
     Base.metadata,
     Column("player_id", ForeignKey("jogadores.player_id"), primary_key=True),
     Column("id_setor", ForeignKey("setores_ref.id_setor"), primary_key=True),
+    Index("ix_jogador_setor_setor", "id_setor", "player_id"),
 )
 
 
@@ -24,6 +31,7 @@ jogador_setor = Table(
 
 class Jogador(Base):
     __tablename__ = "jogadores"
+    __table_args__ = (Index("ix_jogadores_time_id", "time_id"),)
 
     player_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     name: Mapped[str] = mapped_column(String(150), nullable=False)
@@ -47,6 +55,7 @@ class Jogador(Base):
 
 class Estatistica2025(Base):
     __tablename__ = "estatisticas_2025"
+    __table_args__ = tuple(Index(f"ix_estatisticas_2025_{m}", m, "player_id") for m in METRICAS_RANQUEADAS)
 
     player_id: Mapped[int] = mapped_column(ForeignKey("jogadores.player_id"), primary_key=True)
 
@@ -165,10 +174,42 @@ class Estatistica2025(Base):
     jogador: Mapped["Jogador"] = relationship(back_populates="estatisticas")
 
 
+class HashEstatistica2025(Base):
+    __tablename__ = "hash_estatisticas_2025"
+
+    # Hash do vetor de métricas gravado em estatisticas_2025 (carga incremental do limpeza_insercao_bd.py)
+    player_id: Mapped[int] = mapped_column(ForeignKey("jogadores.player_id"), primary_key=True)
+    hash_metricas: Mapped[str] = mapped_column(String(16), nullable=False)
+
+
+# --- Estatísticas derivadas (calculadas no limpeza_insercao_bd.py a cada carga) ---
+
+COLUNAS_METRICAS = [c.name for c in Estatistica2025.__table__.columns if c.name != 'player_id']
+
+# Taxas, médias e percentuais já são comparáveis entre jogadores: não entram no "por 90 minutos"
+_NAO_ACUMULADAS = re.compile(r'Percentage$|Conversion$|^rating$|^scoringFrequency$|^minutesPlayed$')
+METRICAS_POR_90 = [m for m in COLUNAS_METRICAS if not _NAO_ACUMULADAS.search(m)]
+
+# Uma linha por (jogador, posição): métricas por 90 minutos ({m}_p90) e percentil de cada métrica
+# entre os jogadores da mesma posição ({m}_pct, 0-100; acumuladas comparadas já por 90 minutos)
+estatisticas_posicao_2025 = Table(
+    "estatisticas_posicao_2025",
+    Base.metadata,
+    Column("player_id", ForeignKey("jogadores.player_id"), primary_key=True),
+    Column("sigla_posicao", String(10), primary_key=True),
+    Column("minutesPlayed", Float),
+    *[Column(f"{m}_p90", Float) for m in METRICAS_POR_90],
+    *[Column(f"{m}_pct", Float) for m in COLUNAS_METRICAS],
+    # Ranking por posição vira leitura do índice: WHERE sigla_posicao = ? ORDER BY {m}_pct DESC
+    *[Index(f"ix_estatisticas_posicao_2025_{m}", "sigla_posicao", f"{m}_pct") for m in METRICAS_RANQUEADAS],
+)
+
+
 # --- Tabelas de Referência ---
 
 class PosicaoRef(Base):
     __tablename__ = "posicoes_ref"
+    __table_args__ = (Index("ix_posicoes_ref_sigla", "sigla_posicao", "id_posicao"),)
     id_posicao: Mapped[int] = mapped_column(primary_key=True)
     sigla_posicao: Mapped[str] = mapped_column(String(10))
     nome_posicao: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -0,0 +1,131 @@
+from contextlib import contextmanager
+from sqlalchemy import text
+
+# --- OPERAÇÕES QUE MUDAM DE UM BANCO PARA OUTRO ---
+# O limpeza_insercao_bd.py só usa estas funções para upsert, esvaziar tabela, desligar FKs e
+# trocar tabelas; o dialeto sai da própria conexão (conexao.dialect.name).
+
+
+def comando_upsert(conexao, tabela, colunas):
+    """
+    INSERT que atualiza a linha se a chave primária já existir
+
+    Args:
+        conexao: conexão do SQLAlchemy
+        tabela: Table do SQLAlchemy
+        colunas: colunas enviadas (as que não são chave primária são atualizadas)
+
+    Returns:
+        Insert: comando pronto para executemany
+    """
+    dialeto = conexao.dialect.name
+    chaves = [c.name for c in tabela.primary_key]
+
+    if dialeto in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert
+        comando = insert(tabela)
+        novos = comando.inserted
+    elif dialeto == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        comando = insert(tabela)
+        novos = comando.excluded
+    else:
+        raise ValueError(f"Upsert não implementado para o banco '{dialeto}'")
+
+    atualizar = {}
+    for coluna in colunas:
+        if coluna not in chaves:
+            atualizar[coluna] = novos[coluna]
+
+    if dialeto in ('mysql', 'mariadb'):
+        return comando.on_duplicate_key_update(atualizar) if atualizar else comando.prefix_with('IGNORE')
+    if not atualizar:
+        return comando.on_conflict_do_nothing(index_elements=chaves)
+    return comando.on_conflict_do_update(index_elements=chaves, set_=atualizar)
+
+
+def esvaziar_tabela(conexao, nome_tabela):
+    """TRUNCATE no MariaDB; DELETE no SQLite (que não tem TRUNCATE)."""
+    if conexao.dialect.name in ('mysql', 'mariadb'):
+        conexao.execute(text(f"TRUNCATE TABLE {nome_tabela}"))
+    else:
+        conexao.execute(text(f"DELETE FROM {nome_tabela}"))
+
+
+def checar_chaves_estrangeiras(conexao, ativo):
+    """
+    Liga/desliga a checagem de FKs na conexão (para esvaziar e repovoar tabelas referenciadas)
+
+    No SQLite o PRAGMA foreign_keys não muda dentro de transação: ao desligar, as checagens
+    são adiadas para o commit (defer_foreign_keys).
+    """
+    dialeto = conexao.dialect.name
+    if dialeto in ('mysql', 'mariadb'):
+        conexao.execute(text(f"SET FOREIGN_KEY_CHECKS = {1 if ativo else 0}"))
+    elif dialeto == 'sqlite':
+        conexao.execute(text(f"PRAGMA defer_foreign_keys = {'OFF' if ativo else 'ON'}"))
+
+
+@contextmanager
+def chaves_estrangeiras_desligadas(conexao):
+    """
+    Desliga a checagem de FKs só dentro do bloco e religa sempre na saída, mesmo com erro
+
+    No MariaDB o SET FOREIGN_KEY_CHECKS vale para a sessão e o rollback não desfaz: sem religar,
+    a conexão voltaria para o pool com as FKs desligadas. Se nem religar der certo, a conexão é
+    invalidada (o pool descarta em vez de reaproveitar).
+    """
+    checar_chaves_estrangeiras(conexao, False)
+    try:
+        yield conexao
+    finally:
+        try:
+            checar_chaves_estrangeiras(conexao, True)
+        except Exception:
+            conexao.invalidate()
+            raise
+
+
+def indices_por_tabela(conexao):
+    """
+    True se o nome de um índice só precisa ser único dentro da tabela (MariaDB)
+
+    No SQLite o nome é único no banco todo: uma cópia da tabela não pode repetir
+    os nomes dos índices da original.
+    """
+    return conexao.dialect.name in ('mysql', 'mariadb')
+
+
+def trocar_tabelas(conexao, nome_tabela, nome_sombra, nome_antiga):
+    """
+    Coloca a sombra no lugar da tabela atual, que passa a se chamar nome_antiga
+
+    MariaDB: um RENAME TABLE só (atômico). SQLite: dois ALTER TABLE ... RENAME na
+    mesma transação (DDL transacional), o que dá o mesmo efeito para quem lê.
+    """
+    if conexao.dialect.name in ('mysql', 'mariadb'):
+        conexao.execute(text(f"RENAME TABLE {nome_tabela} TO {nome_antiga}, {nome_sombra} TO {nome_tabela}"))
+    else:
+        conexao.execute(text(f"ALTER TABLE {nome_tabela} RENAME TO {nome_antiga}"))
+        conexao.execute(text(f"ALTER TABLE {nome_sombra} RENAME TO {nome_tabela}"))
+
+
+def explicar(conexao, sql, parametros):
+    """
+    Plano de execução de uma consulta, no formato de cada banco
+
+    Só as partes estáveis do plano entram (tabela, tipo de acesso, índice): estimativas de linhas
+    mudam a cada carga e não indicam mudança de plano.
+
+    Returns:
+        list: uma string por passo do plano
+    """
+    dialeto = conexao.dialect.name
+    if dialeto == 'sqlite':
+        linhas = conexao.execute(text("EXPLAIN QUERY PLAN " + sql), parametros).mappings().all()
+        return [linha['detail'] for linha in linhas]
+
+    linhas = conexao.execute(text("EXPLAIN " + sql), parametros).mappings().all()
+    if dialeto in ('mysql', 'mariadb'):
+        return [f"{l['table']} | {l['type']} | {l['key']} | {l['Extra']}" for l in linhas]
+    return [" | ".join("" if v is None else str(v) for v in linha.values()) for linha in linhas]
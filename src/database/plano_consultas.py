@@ -0,0 +1,205 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from sqlalchemy import text
+from database import engine
+from operacoes_bd import explicar
+
+# --- PLANOS E LATÊNCIA DAS CONSULTAS DE RECOMENDAÇÃO ---
+# Roda um catálogo de consultas canônicas, guarda o EXPLAIN e a latência de cada uma num
+# histórico e compara com a execução anterior: plano diferente ou p50 bem maior aparece como
+# regressão (ex: um índice que sumiu, ou a tabela que cresceu de uma temporada para outra).
+
+PASTA_PLANOS = 'caminho/planos_consultas'
+ARQUIVO_HISTORICO = f'{PASTA_PLANOS}/historico.jsonl'
+
+REPETICOES = 20
+LIMITE_REGRESSAO = 1.5   # p50 acima de 1,5x o da execução anterior
+RUIDO_MS = 1.0           # abaixo disso a diferença de tempo é ruído
+
+TABELAS_MONITORADAS = ['jogadores', 'jogador_posicao', 'posicoes_ref', 'estatisticas_2025']
+
+# Nome -> (SQL, parâmetros). ':player_id' e ':time_id' são preenchidos com um jogador do banco.
+CONSULTAS_CANONICAS = {
+    'top_posicao_rating': ("""
+        SELECT j.name, j.time_nome, e.rating
+        FROM jogadores j
+        JOIN jogador_posicao jp ON j.player_id = jp.player_id
+        JOIN posicoes_ref p ON jp.id_posicao = p.id_posicao
+        JOIN estatisticas_2025 e ON j.player_id = e.player_id
+        WHERE p.sigla_posicao = :sigla
+        ORDER BY e.rating DESC
+        LIMIT :limite
+    """, {'sigla': 'ATA', 'limite': 10}),
+    'top_posicao_percentil': ("""
+        SELECT ep.player_id, ep.rating_pct, ep.goals_p90
+        FROM estatisticas_posicao_2025 ep
+        WHERE ep.sigla_posicao = :sigla
+        ORDER BY ep.rating_pct DESC
+        LIMIT :limite
+    """, {'sigla': 'ATA', 'limite': 10}),
+    'top_posicao_gols': ("""
+        SELECT j.name, e.goals, e.expectedGoals
+        FROM jogador_posicao jp
+        JOIN posicoes_ref p ON jp.id_posicao = p.id_posicao
+        JOIN jogadores j ON j.player_id = jp.player_id
+        JOIN estatisticas_2025 e ON e.player_id = jp.player_id
+        WHERE p.sigla_posicao = :sigla
+        ORDER BY e.goals DESC
+        LIMIT :limite
+    """, {'sigla': 'ATA', 'limite': 10}),
+    'top_setor_rating': ("""
+        SELECT j.name, e.rating
+        FROM jogador_setor js
+        JOIN setores_ref s ON js.id_setor = s.id_setor
+        JOIN jogadores j ON j.player_id = js.player_id
+        JOIN estatisticas_2025 e ON e.player_id = js.player_id
+        WHERE s.nome_setor = :setor
+        ORDER BY e.rating DESC
+        LIMIT :limite
+    """, {'setor': 'Meio', 'limite': 10}),
+    'elenco_time': ("""
+        SELECT j.name, j.posicao_bruta, e.rating
+        FROM jogadores j
+        LEFT JOIN estatisticas_2025 e ON e.player_id = j.player_id
+        WHERE j.time_id = :time_id
+        ORDER BY e.rating DESC
+    """, {}),
+    'perfil_jogador': ("""
+        SELECT j.name, p.sigla_posicao, e.rating, e.goals, e.assists
+        FROM jogadores j
+        LEFT JOIN jogador_posicao jp ON jp.player_id = j.player_id
+        LEFT JOIN posicoes_ref p ON p.id_posicao = jp.id_posicao
+        LEFT JOIN estatisticas_2025 e ON e.player_id = j.player_id
+        WHERE j.player_id = :player_id
+    """, {}),
+}
+
+
+def percentil(valores, fracao):
+    """Percentil por posição na lista ordenada (sem interpolação)."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))]
+
+
+def _jogador_exemplo(conexao):
+    linha = conexao.execute(text("SELECT player_id, time_id FROM jogadores ORDER BY player_id LIMIT 1")).first()
+    if linha is None:
+        return {'player_id': 0, 'time_id': 0}
+    return {'player_id': linha.player_id, 'time_id': linha.time_id}
+
+
+def medir_consultas(engine_alvo=engine, consultas=CONSULTAS_CANONICAS, repeticoes=REPETICOES):
+    """
+    Captura o plano e a latência de cada consulta do catálogo
+
+    Args:
+        engine_alvo: engine do banco
+        consultas: dicionário {nome: (sql, parâmetros)}
+        repeticoes: execuções medidas por consulta (depois de uma de aquecimento)
+
+    Returns:
+        dict: execução com data, banco, tamanho das tabelas e, por consulta, p50/p99 (ms), linhas e plano
+    """
+    with engine_alvo.connect() as conexao:
+        exemplo = _jogador_exemplo(conexao)
+        tamanhos = {}
+        for tabela in TABELAS_MONITORADAS:
+            tamanhos[tabela] = conexao.execute(text(f"SELECT COUNT(*) FROM {tabela}")).scalar()
+
+        resultados = {}
+        for nome, (sql, parametros) in consultas.items():
+            parametros = dict(exemplo, **parametros)
+            plano = explicar(conexao, sql, parametros)
+
+            linhas = len(conexao.execute(text(sql), parametros).all())  # aquecimento
+            tempos = []
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                conexao.execute(text(sql), parametros).all()
+                tempos.append(time.perf_counter() - inicio)
+
+            resultados[nome] = {
+                'p50_ms': round(percentil(tempos, 0.50) * 1000, 3),
+                'p99_ms': round(percentil(tempos, 0.99) * 1000, 3),
+                'linhas': linhas,
+                'plano': plano,
+            }
+
+    return {
+        'executado_em': datetime.now().isoformat(timespec='seconds'),
+        'banco': engine_alvo.dialect.name,
+        'tamanho_tabelas': tamanhos,
+        'consultas': resultados,
+    }
+
+
+def ultima_execucao(banco, arquivo_historico=ARQUIVO_HISTORICO):
+    """Última execução gravada no histórico para o mesmo banco (ou None)."""
+    if not os.path.exists(arquivo_historico):
+        return None
+    anterior = None
+    with open(arquivo_historico, 'r', encoding='utf-8') as f:
+        for linha in f:
+            execucao = json.loads(linha)
+            if execucao['banco'] == banco:
+                anterior = execucao
+    return anterior
+
+
+def comparar(execucao, anterior):
+    """
+    Regressões da execução em relação à anterior
+
+    Returns:
+        list: mensagens (vazia se nada piorou)
+    """
+    if anterior is None:
+        return []
+
+    regressoes = []
+    for nome, atual in execucao['consultas'].items():
+        antes = anterior['consultas'].get(nome)
+        if antes is None:
+            continue
+        if atual['plano'] != antes['plano']:
+            regressoes.append(f"{nome}: o plano de execução mudou (conferir se usa os índices esperados)")
+        if atual['p50_ms'] > RUIDO_MS and atual['p50_ms'] > LIMITE_REGRESSAO * antes['p50_ms']:
+            regressoes.append(f"{nome}: p50 {antes['p50_ms']} -> {atual['p50_ms']} ms")
+    return regressoes
+
+
+def imprimir_relatorio(execucao, regressoes):
+    print(f"\n--- Consultas de recomendação ({execucao['banco']}, {execucao['executado_em']}) ---")
+    print("Tabelas: " + ", ".join(f"{t}={n}" for t, n in execucao['tamanho_tabelas'].items()))
+    print(f"{'consulta':<22}{'linhas':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for nome, r in execucao['consultas'].items():
+        print(f"{nome:<22}{r['linhas']:>8}{r['p50_ms']:>10}{r['p99_ms']:>10}")
+        for linha in r['plano']:
+            print(f"    {linha}")
+    for regressao in regressoes:
+        print(f"⚠️ {regressao}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN e latência das consultas canônicas de recomendação")
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES)
+    parser.add_argument('--nao-gravar', action='store_true', help="não acrescenta a execução ao histórico")
+    parser.add_argument('--falhar-em-regressao', action='store_true', help="sai com código 1 se houver regressão")
+    args = parser.parse_args()
+
+    execucao = medir_consultas(repeticoes=args.repeticoes)
+    regressoes = comparar(execucao, ultima_execucao(execucao['banco']))
+    imprimir_relatorio(execucao, regressoes)
+
+    if not args.nao_gravar:
+        os.makedirs(PASTA_PLANOS, exist_ok=True)
+        with open(ARQUIVO_HISTORICO, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(execucao, ensure_ascii=False) + '\n')
+
+    if regressoes and args.falhar_em_regressao:
+        raise SystemExit(1)
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# --- SNAPSHOT LOCAL DAS PLANILHAS PUBLICADAS ---
+# Todas as fontes do limpeza_insercao_bd.py são baixadas em paralelo para esta pasta antes da carga;
+# as etapas leem do disco. Sem rede, vale o último snapshot bom.
+PASTA_SNAPSHOT = 'caminho/snapshot_fontes'
+NOME_MANIFESTO = 'manifesto.json'
+
+MAX_DOWNLOADS_PARALELOS = 7
+TIMEOUT_SEGUNDOS = 60
+
+
+def _ler_manifesto(pasta):
+    caminho = os.path.join(pasta, NOME_MANIFESTO)
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _gravar_atomico(caminho, conteudo):
+    temporario = caminho + '.tmp'
+    with open(temporario, 'wb') as f:
+        f.write(conteudo)
+    os.replace(temporario, caminho)
+
+
+def _sha256_arquivo(caminho):
+    with open(caminho, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _baixar(nome, url, anterior, pasta):
+    """
+    Baixa uma fonte com GET condicional (ETag / Last-Modified do snapshot anterior)
+
+    Args:
+        nome: chave da fonte (ex: 'setores')
+        url: url da planilha publicada
+        anterior: entrada do manifesto do último snapshot desta fonte (ou None)
+        pasta: pasta do snapshot
+
+    Returns:
+        tuple: (situação, entrada do manifesto). Situação é 'nova', 'alterada', 'igual'
+            (304 ou mesmo sha256), 'offline' (falhou, ficou o snapshot anterior) ou 'falha'
+            (falhou e não há snapshot; entrada None)
+    """
+    arquivo = f"{nome}.csv"
+    caminho = os.path.join(pasta, arquivo)
+    tem_anterior = anterior is not None and os.path.exists(caminho)
+
+    cabecalhos = {}
+    if tem_anterior:
+        if anterior.get('etag'):
+            cabecalhos['If-None-Match'] = anterior['etag']
+        if anterior.get('last_modified'):
+            cabecalhos['If-Modified-Since'] = anterior['last_modified']
+
+    agora = datetime.now().isoformat(timespec='seconds')
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=cabecalhos), timeout=TIMEOUT_SEGUNDOS) as resp:
+            conteudo = resp.read()
+            etag = resp.headers.get('ETag')
+            last_modified = resp.headers.get('Last-Modified')
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and tem_anterior:
+            return 'igual', dict(anterior, verificado_em=agora)
+        erro = f"HTTP {e.code}"
+    except (urllib.error.URLError, OSError) as e:
+        erro = str(e)
+    else:
+        sha = hashlib.sha256(conteudo).hexdigest()
+        entrada = {'url': url, 'arquivo': arquivo, 'etag': etag, 'last_modified': last_modified,
+                   'sha256': sha, 'bytes': len(conteudo), 'verificado_em': agora}
+        if tem_anterior and anterior.get('sha256') == sha:
+            # Servidor sem suporte a GET condicional: o conteúdo é o mesmo, o arquivo fica como está
+            entrada['baixado_em'] = anterior.get('baixado_em')
+            return 'igual', entrada
+        _gravar_atomico(caminho, conteudo)
+        entrada['baixado_em'] = agora
+        return ('alterada' if tem_anterior else 'nova'), entrada
+
+    if tem_anterior:
+        print(f"[Snapshot] '{nome}': falha ao baixar ({erro}), usando o snapshot de {anterior.get('baixado_em')}.")
+        return 'offline', anterior
+    print(f"[Snapshot] '{nome}': falha ao baixar ({erro}) e não há snapshot anterior.")
+    return 'falha', None
+
+
+def atualizar_snapshot(urls, pasta=PASTA_SNAPSHOT, max_paralelo=MAX_DOWNLOADS_PARALELOS):
+    """
+    Baixa todas as fontes ao mesmo tempo para o snapshot local
+
+    O tempo total fica o do download mais lento, não a soma deles.
+
+    Args:
+        urls: dicionário {nome: url}
+        pasta: pasta do snapshot
+        max_paralelo: nº máximo de downloads simultâneos
+
+    Returns:
+        dict: situação de cada fonte (ver _baixar)
+    """
+    os.makedirs(pasta, exist_ok=True)
+    manifesto = _ler_manifesto(pasta)
+
+    with ThreadPoolExecutor(max_workers=max_paralelo) as executor:
+        futuros = {}
+        for nome, url in urls.items():
+            futuros[nome] = executor.submit(_baixar, nome, url, manifesto.get(nome), pasta)
+        situacoes = {}
+        for nome, futuro in futuros.items():
+            situacoes[nome], entrada = futuro.result()
+            if entrada is not None:
+                manifesto[nome] = entrada
+
+    _gravar_atomico(os.path.join(pasta, NOME_MANIFESTO),
+                    json.dumps(manifesto, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    contagem = {}
+    for situacao in situacoes.values():
+        contagem[situacao] = contagem.get(situacao, 0) + 1
+    print(f"[Snapshot] {len(urls)} fontes verificadas: {contagem}")
+    return situacoes
+
+
+def arquivo_do_snapshot(nome, pasta=PASTA_SNAPSHOT):
+    """
+    Caminho local da fonte no snapshot, conferido pelo sha256 do manifesto
+
+    Args:
+        nome: chave da fonte
+        pasta: pasta do snapshot
+
+    Returns:
+        str: caminho do arquivo, ou None se a fonte não está no snapshot (ou está corrompida)
+    """
+    entrada = _ler_manifesto(pasta).get(nome)
+    if entrada is None:
+        return None
+
+    caminho = os.path.join(pasta, entrada['arquivo'])
+    if not os.path.exists(caminho) or _sha256_arquivo(caminho) != entrada['sha256']:
+        print(f"[Snapshot] '{nome}': arquivo ausente ou diferente do manifesto, ignorando o snapshot.")
+        return None
+    return caminho
@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+
+# Parquet é opcional: sem o pyarrow as tabelas vão para o staging em CSV
+try:
+    import pyarrow  # noqa: F401
+    TEM_PARQUET = True
+except ImportError:
+    TEM_PARQUET = False
+
+# --- CONFIGURAÇÃO ---
+# Área local onde os scrapers deixam as tabelas prontas para o limpeza_insercao_bd.py
+PASTA_STAGING = 'caminho/staging'
+ARQUIVO_PONTEIRO = f'{PASTA_STAGING}/atual.json'
+
+# Versões antigas mantidas por tabela (as demais são apagadas a cada publicação)
+VERSOES_MANTIDAS = 3
+
+# O Google Sheets passa a ser só um espelho: False desliga o envio das tabelas de dados
+ESPELHAR_NO_SHEETS = True
+
+# Extração e especificador rodam em paralelo e atualizam o mesmo ponteiro
+_trava = threading.Lock()
+
+
+def _id_execucao():
+    return datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+
+def _ler_ponteiro(arquivo_ponteiro):
+    if not os.path.exists(arquivo_ponteiro):
+        return {}
+    try:
+        with open(arquivo_ponteiro, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _apontar(nome, caminho, linhas, pasta_staging):
+    """Troca a versão atual da tabela no ponteiro (escrita atômica) e apaga versões antigas."""
+    arquivo_ponteiro = os.path.join(pasta_staging, os.path.basename(ARQUIVO_PONTEIRO))
+    with _trava:
+        ponteiro = _ler_ponteiro(arquivo_ponteiro)
+        ponteiro[nome] = {
+            'arquivo': os.path.relpath(caminho, pasta_staging),
+            'linhas': int(linhas),
+            'gerado_em': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        temporario = arquivo_ponteiro + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(ponteiro, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, arquivo_ponteiro)
+
+    pasta_tabela = os.path.dirname(caminho)
+    versoes = sorted(os.listdir(pasta_tabela))
+    for antiga in versoes[:-VERSOES_MANTIDAS]:
+        os.remove(os.path.join(pasta_tabela, antiga))
+    print(f"[Staging] Tabela '{nome}' publicada: {caminho} ({linhas} linhas)")
+
+
+def publicar_tabela(nome, df, pasta_staging=PASTA_STAGING):
+    """
+    Grava uma nova versão da tabela no staging e aponta o ponteiro para ela
+
+    Args:
+        nome: nome da tabela ('geral', 'stats', 'tatica')
+        df: DataFrame a publicar
+        pasta_staging: raiz da área de staging
+
+    Returns:
+        str: caminho do arquivo gravado
+    """
+    pasta_tabela = os.path.join(pasta_staging, nome)
+    os.makedirs(pasta_tabela, exist_ok=True)
+
+    if TEM_PARQUET:
+        caminho = os.path.join(pasta_tabela, f'{_id_execucao()}.parquet')
+        df_saida = df.copy()
+        # Colunas de texto podem misturar tipos (ex: números e textos): o Parquet exige um só.
+        # Nulos continuam nulos, para a carga ler NaN como lia no CSV
+        for coluna in df_saida.columns:
+            if df_saida[coluna].dtype == 'object':
+                df_saida[coluna] = df_saida[coluna].map(
+                    lambda v: v if isinstance(v, str) else str(v), na_action='ignore'
+                )
+        df_saida.to_parquet(caminho, index=False)
+    else:
+        caminho = os.path.join(pasta_tabela, f'{_id_execucao()}.csv')
+        df.to_csv(caminho, index=False, sep=';', encoding='utf-8')
+
+    _apontar(nome, caminho, len(df), pasta_staging)
+    return caminho
+
+
+def publicar_arquivo(nome, arquivo_origem, linhas, pasta_staging=PASTA_STAGING):
+    """
+    Publica no staging um arquivo já gerado (ex: o Parquet do conversor), sem reler os dados
+
+    Args:
+        nome: nome da tabela
+        arquivo_origem: arquivo .parquet ou .csv (separador ';') já pronto
+        linhas: nº de linhas do arquivo (vai para o ponteiro)
+        pasta_staging: raiz da área de staging
+    """
+    pasta_tabela = os.path.join(pasta_staging, nome)
+    os.makedirs(pasta_tabela, exist_ok=True)
+    extensao = os.path.splitext(arquivo_origem)[1]
+    caminho = os.path.join(pasta_tabela, f'{_id_execucao()}{extensao}')
+    shutil.copyfile(arquivo_origem, caminho)
+    _apontar(nome, caminho, linhas, pasta_staging)
+    return caminho
@@ -0,0 +1,135 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from servidor_falso import ServidorFalso
+
+# --- BENCHMARK DOS SCRAPERS (OFFLINE) ---
+# Sobe o servidor_falso.py, aponta o cliente_http para ele e roda cada estágio numa pasta
+# temporária (os caminhos 'caminho/...' dos módulos são relativos e resolvem lá dentro).
+
+ESTAGIOS_PADRAO = ['discovery', 'coleta_jogadores']
+
+
+def percentil(valores, fracao):
+    """Percentil por posição na lista ordenada (sem interpolação)."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))]
+
+
+def resumir(nome, registros, segundos):
+    """
+    Junta os registros do servidor de um estágio num resumo
+
+    Args:
+        nome: nome do estágio
+        registros: lista de (rota, status, segundos de atendimento, instante) do servidor falso
+        segundos: tempo total (parede) do estágio
+
+    Returns:
+        dict: requisições, req/s, p50/p99 de latência (ms), contagem por status e tempo total
+    """
+    latencias = [r[2] for r in registros]
+    por_status = {}
+    for _, status, _, _ in registros:
+        por_status[str(status)] = por_status.get(str(status), 0) + 1
+
+    # req/s na janela em que o estágio estava de fato fazendo requisições
+    janela = (registros[-1][3] - registros[0][3]) if len(registros) > 1 else segundos
+    return {
+        'estagio': nome,
+        'requisicoes': len(registros),
+        'req_por_segundo': round(len(registros) / janela, 2) if janela > 0 else 0.0,
+        'p50_ms': round(percentil(latencias, 0.50) * 1000, 1),
+        'p99_ms': round(percentil(latencias, 0.99) * 1000, 1),
+        'status': por_status,
+        'segundos': round(segundos, 1),
+    }
+
+
+def executar_benchmark(servidor, estagios=ESTAGIOS_PADRAO, taxa=None):
+    """
+    Roda os estágios contra o servidor falso e mede cada um
+
+    Args:
+        servidor: ServidorFalso ainda não iniciado
+        estagios: nomes dos estágios, na ordem em que devem rodar
+        taxa: se informada, fixa a taxa do LIMITADOR (req/s) em vez da política de produção
+
+    Returns:
+        list: um resumo (ver resumir) por estágio
+    """
+    os.environ['SOFASCORE_URL_SITE'] = servidor.iniciar()
+
+    # Só agora: o cliente_http lê a url do site na importação
+    import area_staging
+    from limitador_taxa import LIMITADOR
+    from modulo_discovery import modulo_discovery
+    from modulo_extraction import modulo_extracao
+    from especificador_de_posicoes import especificador_posicoes
+    from modulo_coleta_jogadores import modulo_coleta_jogadores
+    from modulo_partidas import modulo_partidas
+
+    funcoes = {'discovery': modulo_discovery, 'extracao': modulo_extracao,
+               'especificador': especificador_posicoes, 'coleta_jogadores': modulo_coleta_jogadores,
+               'partidas': modulo_partidas}
+
+    area_staging.ESPELHAR_NO_SHEETS = False
+    if taxa is not None:
+        LIMITADOR.taxa = taxa
+        LIMITADOR.taxa_maxima = max(LIMITADOR.taxa_maxima, taxa)
+
+    pasta_original = os.getcwd()
+    resumos = []
+    with tempfile.TemporaryDirectory(prefix='benchmark_scrapers_') as pasta:
+        os.chdir(pasta)
+        os.makedirs('caminho', exist_ok=True)
+        try:
+            for nome in estagios:
+                print(f"\n[Benchmark] Estágio '{nome}'...")
+                servidor.zerar_registros()
+                inicio = time.perf_counter()
+                try:
+                    funcoes[nome]()
+                except SystemExit:
+                    print(f"[Benchmark] '{nome}' encerrou com exit().")
+                resumos.append(resumir(nome, servidor.zerar_registros(), time.perf_counter() - inicio))
+        finally:
+            os.chdir(pasta_original)
+            servidor.parar()
+    return resumos
+
+
+def imprimir_relatorio(resumos):
+    print("\n--- Benchmark dos scrapers ---")
+    print(f"{'estágio':<15}{'req':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'total s':>10}  status")
+    for r in resumos:
+        print(f"{r['estagio']:<15}{r['requisicoes']:>8}{r['req_por_segundo']:>10}{r['p50_ms']:>10}"
+              f"{r['p99_ms']:>10}{r['segundos']:>10}  {r['status']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede a vazão dos scrapers contra o servidor falso")
+    parser.add_argument('--times', type=int, default=20)
+    parser.add_argument('--jogadores-por-time', type=int, default=30)
+    parser.add_argument('--latencia-ms', type=float, default=50)
+    parser.add_argument('--taxa-403', type=float, default=0.0)
+    parser.add_argument('--taxa-429', type=float, default=0.0)
+    parser.add_argument('--taxa-5xx', type=float, default=0.0)
+    parser.add_argument('--taxa', type=float, default=None, help="fixa o limitador em N req/s")
+    parser.add_argument('--estagios', default=','.join(ESTAGIOS_PADRAO))
+    parser.add_argument('--saida', default=None, help="arquivo JSON com os resultados")
+    args = parser.parse_args()
+
+    servidor = ServidorFalso(times=args.times, jogadores_por_time=args.jogadores_por_time,
+                             latencia_ms=args.latencia_ms, taxa_403=args.taxa_403,
+                             taxa_429=args.taxa_429, taxa_5xx=args.taxa_5xx)
+    resumos = executar_benchmark(servidor, args.estagios.split(','), taxa=args.taxa)
+    imprimir_relatorio(resumos)
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resumos, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import re
+import time
+
+# --- CONFIGURAÇÃO DO CACHE ---
+PASTA_CACHE = 'caminho/cache_http'
+
+HORA = 60 * 60
+DIA = 24 * HORA
+
+# Validade (TTL) por tipo de endpoint: a primeira expressão que casar com a url vale
+TTL_POR_ENDPOINT = [
+    (re.compile(r'/standings/'), 6 * HORA),             # tabela muda a cada rodada
+    (re.compile(r'/team/\d+/players'), 7 * DIA),        # elencos mudam pouco
+    (re.compile(r'/characteristics'), 7 * DIA),         # características táticas mudam pouco
+    (re.compile(r'/statistics/overall'), 12 * HORA),    # estatísticas mudam depois de cada rodada
+]
+TTL_PADRAO = HORA
+
+# Só guardamos respostas definitivas com conteúdo útil (o 403 nunca é guardado)
+STATUS_CACHEAVEIS = [200, 404]
+
+
+class RespostaCache:
+    """Resposta servida a partir do disco, com a mesma interface usada pelos scrapers."""
+
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.do_cache = True
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def ttl_da_url(url):
+    """
+    Descobre a validade de uma url de acordo com o endpoint
+
+    Args:
+        url: url da requisição
+
+    Returns:
+        int: tempo de vida da entrada em segundos
+    """
+    for padrao, ttl in TTL_POR_ENDPOINT:
+        if padrao.search(url):
+            return ttl
+    return TTL_PADRAO
+
+
+def _caminho_entrada(url):
+    chave = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    # Subpastas pelos 2 primeiros caracteres para não ter milhares de arquivos num diretório só
+    return os.path.join(PASTA_CACHE, chave[:2], f"{chave}.json")
+
+
+def buscar(url):
+    """
+    Lê a entrada da url no cache
+
+    Args:
+        url: url da requisição
+
+    Returns:
+        dict: entrada com 'status_code', 'corpo', 'etag', 'last_modified', 'salvo_em' e 'ttl'
+        None: a url nunca foi guardada (ou o arquivo está corrompido)
+    """
+    caminho = _caminho_entrada(url)
+    if not os.path.exists(caminho):
+        return None
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def esta_fresca(entrada):
+    """Diz se a entrada ainda está dentro do TTL (pode ser usada sem ir ao servidor)."""
+    return time.time() - entrada['salvo_em'] < entrada['ttl']
+
+
+def headers_condicionais(entrada):
+    """
+    Cabeçalhos para revalidar uma entrada vencida (o servidor responde 304 se nada mudou)
+
+    Args:
+        entrada: entrada retornada por buscar()
+
+    Returns:
+        dict: If-None-Match / If-Modified-Since, quando o servidor os forneceu
+    """
+    headers_req = {}
+    if entrada.get('etag'):
+        headers_req['If-None-Match'] = entrada['etag']
+    if entrada.get('last_modified'):
+        headers_req['If-Modified-Since'] = entrada['last_modified']
+    return headers_req
+
+
+def para_resposta(entrada):
+    """Transforma a entrada do disco num objeto parecido com a resposta do curl_cffi."""
+    headers = {}
+    if entrada.get('etag'):
+        headers['ETag'] = entrada['etag']
+    if entrada.get('last_modified'):
+        headers['Last-Modified'] = entrada['last_modified']
+    return RespostaCache(entrada['status_code'], entrada['corpo'].encode('utf-8'), headers)
+
+
+def _gravar(url, entrada):
+    caminho = _caminho_entrada(url)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+    # Escreve num temporário e troca de uma vez: uma queda no meio nunca deixa entrada pela metade
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(entrada, f, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+
+def guardar(url, resp):
+    """
+    Guarda a resposta no cache, se ela for cacheável
+
+    Args:
+        url: url da requisição
+        resp: resposta recebida do servidor
+    """
+    if resp.status_code not in STATUS_CACHEAVEIS:
+        return
+
+    _gravar(url, {
+        'url': url,
+        'status_code': resp.status_code,
+        'corpo': resp.content.decode('utf-8', errors='replace'),
+        'etag': resp.headers.get('ETag'),
+        'last_modified': resp.headers.get('Last-Modified'),
+        'salvo_em': time.time(),
+        'ttl': ttl_da_url(url),
+    })
+
+
+def renovar(url, entrada):
+    """
+    Renova a validade de uma entrada depois de um 304 (Not Modified)
+
+    Args:
+        url: url da requisição
+        entrada: entrada retornada por buscar()
+    """
+    entrada['salvo_em'] = time.time()
+    entrada['ttl'] = ttl_da_url(url)
+    _gravar(url, entrada)
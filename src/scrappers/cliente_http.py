@@ -0,0 +1,257 @@
+import os
+import threading
+import time
+from curl_cffi import requests
+from curl_cffi.requests import AsyncSession
+from limitador_taxa import LIMITADOR
+from metricas import METRICAS
+import cache_http
+
+# --- ENDEREÇOS DO SOFASCORE ---
+# SOFASCORE_URL_SITE permite apontar os scrapers para o servidor_falso.py (testes e benchmarks)
+URL_SITE = os.environ.get('SOFASCORE_URL_SITE', "https://www.sofascore.com")
+URL_API = f"{URL_SITE}/api/v1"
+REFERER_TORNEIO = f"{URL_SITE}/pt/torneio/futebol/brazil/brasileirao-serie-a/325"
+
+# --- CABEÇALHOS DE SIMULAÇÃO (ÚNICA CÓPIA PARA TODOS OS SCRAPERS) ---
+HEADERS_PADRAO = {
+    'authority': 'www.sofascore.com',
+    'accept': '*/*',
+    'referer': f'{URL_SITE}/',
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'x-requested-with': 'x',
+    'cookie': 'cookie',
+}
+IMPERSONATE = "chrome"
+
+# --- POLÍTICA DE RETRY (ÚNICA) ---
+# A espera entre tentativas não é mais fixa: quem decide é o LIMITADOR (limitador_taxa.py)
+TENTATIVAS_PADRAO = 5
+# 200 (sucesso), 404 (não existe) e 403 (bloqueio) são respostas definitivas: não adianta repetir
+STATUS_DEFINITIVOS = [200, 404, 403]
+
+# Uma sessão por thread: a Session do curl_cffi não é thread-safe, mas dentro da
+# mesma thread ela mantém a conexão TLS aberta (keep-alive) entre as chamadas
+_local = threading.local()
+
+
+def obter_sessao():
+    """
+    Retorna a sessão persistente da thread atual, criando-a na primeira chamada
+
+    Returns:
+        requests.Session: sessão do curl_cffi com pool de conexões e impersonate do Chrome
+    """
+    sessao = getattr(_local, 'sessao', None)
+    if sessao is None:
+        sessao = requests.Session(impersonate=IMPERSONATE)
+        _local.sessao = sessao
+    return sessao
+
+
+def fechar_sessao():
+    """Fecha a sessão da thread atual (a próxima chamada abre uma nova)."""
+    sessao = getattr(_local, 'sessao', None)
+    if sessao is not None:
+        sessao.close()
+        _local.sessao = None
+
+
+def montar_headers(referer=None):
+    """
+    Monta os cabeçalhos de uma requisição a partir do padrão
+
+    Args:
+        referer: url a ser enviada no 'referer' (ex: perfil do jogador). Se None, usa o padrão.
+
+    Returns:
+        dict: cópia dos cabeçalhos padrão, com o referer sobrescrito se informado
+    """
+    headers_req = dict(HEADERS_PADRAO)
+    if referer:
+        headers_req['referer'] = referer
+    return headers_req
+
+
+def referer_torneio(id_torneio):
+    """Referer das requisições de um torneio (a página pública só é conhecida para o Brasileirão)."""
+    if id_torneio == 325:
+        return REFERER_TORNEIO
+    return f"{URL_SITE}/"
+
+
+def url_perfil_jogador(slug, player_id):
+    """Url do perfil público do jogador, usada como referer dinâmico."""
+    return f"{URL_SITE}/pt/football/player/{slug}/{player_id}"
+
+
+def _preparar(url, referer, usar_cache):
+    """
+    Consulta o cache e monta os cabeçalhos da requisição
+
+    Returns:
+        tuple: (resposta do cache se ainda estiver fresca ou None, entrada do cache ou None, headers)
+    """
+    entrada = cache_http.buscar(url) if usar_cache else None
+    if entrada is not None and cache_http.esta_fresca(entrada):
+        METRICAS.registrar_cache(url)
+        return cache_http.para_resposta(entrada), entrada, None
+
+    headers_req = montar_headers(referer)
+    if entrada is not None:
+        # Entrada vencida: pede ao servidor só se algo mudou (ETag / Last-Modified)
+        headers_req.update(cache_http.headers_condicionais(entrada))
+    return None, entrada, headers_req
+
+
+def _processar_resposta(url, resp, entrada, ultima_resposta, usar_cache):
+    """
+    Informa a resposta ao limitador, atualiza o cache e decide se ela encerra as tentativas
+
+    Args:
+        url: url da requisição
+        resp: resposta recebida do servidor
+        entrada: entrada vencida do cache que foi revalidada (ou None)
+        ultima_resposta: resposta da tentativa anterior desta mesma chamada (ou None)
+        usar_cache: se a resposta deve ser guardada no cache
+
+    Returns:
+        resp: resposta a ser devolvida ao chamador
+        None: vale tentar de novo
+    """
+    LIMITADOR.registrar_resposta(resp.status_code, resp.headers.get('Retry-After'))
+
+    # 304: nada mudou desde a última coleta, reaproveita o corpo guardado
+    if resp.status_code == 304 and entrada is not None:
+        cache_http.renovar(url, entrada)
+        return cache_http.para_resposta(entrada)
+
+    # O primeiro 403 costuma ser um bloqueio temporário por excesso de ritmo: o limitador já
+    # derrubou a taxa e pausou o processo, então tentamos mais uma vez antes de declarar bloqueio
+    if resp.status_code == 403:
+        if ultima_resposta is not None and ultima_resposta.status_code == 403:
+            return resp
+        return None
+
+    if resp.status_code in STATUS_DEFINITIVOS:
+        if usar_cache:
+            cache_http.guardar(url, resp)
+        return resp
+
+    return None
+
+
+def faz_requisicao(url, referer=None, contexto="", tentativas=TENTATIVAS_PADRAO, usar_cache=True):
+    """
+    Tenta fazer a requisição X vezes antes de desistir, reaproveitando a conexão da thread.
+    O ritmo (e a espera entre as tentativas) é controlado pelo LIMITADOR do processo, e
+    respostas ainda válidas no cache em disco são devolvidas sem passar pelo limitador.
+
+    Args:
+        url: url da requisição
+        referer: referer específico desta requisição (ex: perfil do jogador)
+        contexto: texto para identificar nos logs o que está sendo baixado (ex: nome do jogador)
+        tentativas: número máximo de vezes que o código tentará conectar
+        usar_cache: se False, ignora o cache em disco (nem lê, nem grava)
+
+    Returns:
+        resp: O objeto da resposta se o status for 200 (sucesso), 404 (não encontrado) ou 403 (bloqueado)
+        None: A requisição não funcionou e mesmo após as tentativas o algoritmo não retornou.
+        Nesse caso, ele desiste da URL.
+    """
+    resposta_cache, entrada, headers_req = _preparar(url, referer, usar_cache)
+    if resposta_cache is not None:
+        return resposta_cache
+
+    ultima_resposta = None
+
+    for i in range(tentativas):
+        METRICAS.registrar_espera(LIMITADOR.aguardar())
+        resp = None
+        inicio = time.perf_counter()
+        try:
+            resp = obter_sessao().get(url, headers=headers_req)
+            METRICAS.registrar_requisicao(url, resp.status_code, time.perf_counter() - inicio, len(resp.content), i + 1)
+
+            resposta_final = _processar_resposta(url, resp, entrada, ultima_resposta, usar_cache)
+            if resposta_final is not None:
+                return resposta_final
+
+            ultima_resposta = resp
+            print(f"\n{contexto} -> Tentativa {i + 1}/{tentativas} falhou (Status {resp.status_code})...")
+
+        except Exception as e:
+            print(f"\n{contexto} -> Tentativa {i + 1}/{tentativas} falhou (Erro {e})...")
+            if resp is None:
+                METRICAS.registrar_requisicao(url, 'erro_conexao', time.perf_counter() - inicio, 0, i + 1)
+            LIMITADOR.registrar_falha_conexao()
+            # Conexão quebrada: descarta a sessão para a próxima tentativa abrir uma nova
+            fechar_sessao()
+
+    if ultima_resposta is not None and ultima_resposta.status_code == 403:
+        return ultima_resposta
+    return None
+
+
+# --- VERSÃO ASSÍNCRONA (usada pelo motor_assincrono) ---
+
+def criar_sessao_assincrona(max_em_voo):
+    """
+    Cria uma AsyncSession com pool de conexões dimensionado para o paralelismo
+
+    Args:
+        max_em_voo: nº máximo de requisições simultâneas (e de conexões mantidas abertas)
+
+    Returns:
+        AsyncSession: sessão assíncrona do curl_cffi com impersonate do Chrome
+    """
+    return AsyncSession(impersonate=IMPERSONATE, max_clients=max_em_voo)
+
+
+async def faz_requisicao_async(sessao, url, referer=None, contexto="", tentativas=TENTATIVAS_PADRAO,
+                               usar_cache=True):
+    """
+    Versão assíncrona do faz_requisicao, com a mesma política de retry, o mesmo LIMITADOR e o mesmo cache
+
+    Args:
+        sessao: AsyncSession compartilhada (ver criar_sessao_assincrona)
+        url: url da requisição
+        referer: referer específico desta requisição
+        contexto: texto para identificar nos logs o que está sendo baixado
+        tentativas: nº de vezes que o algoritmo tentará requisitar antes de desistir
+        usar_cache: se False, ignora o cache em disco (nem lê, nem grava)
+
+    Returns:
+        resp: resposta com status 200, 404 ou 403
+        None: A requisição não funcionou após todas as tentativas.
+    """
+    resposta_cache, entrada, headers_req = _preparar(url, referer, usar_cache)
+    if resposta_cache is not None:
+        return resposta_cache
+
+    ultima_resposta = None
+
+    for i in range(tentativas):
+        METRICAS.registrar_espera(await LIMITADOR.aguardar_async())
+        resp = None
+        inicio = time.perf_counter()
+        try:
+            resp = await sessao.get(url, headers=headers_req)
+            METRICAS.registrar_requisicao(url, resp.status_code, time.perf_counter() - inicio, len(resp.content), i + 1)
+
+            resposta_final = _processar_resposta(url, resp, entrada, ultima_resposta, usar_cache)
+            if resposta_final is not None:
+                return resposta_final
+
+            ultima_resposta = resp
+            print(f"\n{contexto} -> Tentativa {i + 1}/{tentativas} falhou (Status {resp.status_code})...")
+
+        except Exception as e:
+            print(f"\n{contexto} -> Tentativa {i + 1}/{tentativas} falhou (Erro {e})...")
+            if resp is None:
+                METRICAS.registrar_requisicao(url, 'erro_conexao', time.perf_counter() - inicio, 0, i + 1)
+            LIMITADOR.registrar_falha_conexao()
+
+    if ultima_resposta is not None and ultima_resposta.status_code == 403:
+        return ultima_resposta
+    return None
@@ -0,0 +1,174 @@
+import os
+import re
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from conectar_google_api import salvar_dataframe
+
+# --- CONFIGURAÇÃO ---
+PASTA_PROJETO = 'caminho'
+PASTA_PARTICOES = f'{PASTA_PROJETO}/particoes'
+PASTA_MESCLA = f'{PASTA_PROJETO}/mescla'
+SPREADSHEET_ID = "id"
+
+# (id_torneio, id_season) no Sofascore. Descubra os ids na url da página do torneio.
+COMPETICOES = [
+    (325, 72034),   # Brasileirão Série A 2025
+]
+
+PROCESSOS_PADRAO = 4
+
+# Arquivos que cada partição produz (mesmos nomes do fluxo normal)
+ARQUIVO_JOGADORES = 'jogadores_brasileirao_2025.csv'
+ARQUIVO_STATS = 'tabela_final_stats_2025.csv'
+
+PADRAO_PARTICAO = re.compile(r'torneio=(\d+)[\\/]season=(\d+)$')
+
+
+def pasta_da_particao(id_torneio, id_season, pasta_particoes=PASTA_PARTICOES):
+    """Pasta onde ficam todos os arquivos de uma competição/temporada."""
+    return os.path.join(pasta_particoes, f"torneio={id_torneio}", f"season={id_season}")
+
+
+def colher_competicao(id_torneio, id_season, processos=1, pasta_particoes=PASTA_PARTICOES):
+    """
+    Monta o elenco da temporada e extrai as estatísticas dele (roda dentro de um processo do pool)
+
+    O elenco sai das escalações das partidas da própria temporada (modulo_partidas), não do
+    /team/{id}/players: esse só conhece o elenco atual, e numa temporada passada traria jogadores
+    que nem estavam no clube (e deixaria de fora quem já saiu).
+
+    Args:
+        id_torneio: id do torneio no Sofascore
+        id_season: id da temporada no Sofascore
+        processos: quantos processos estão colhendo ao mesmo tempo (divide o orçamento de requisições)
+        pasta_particoes: pasta raiz das partições
+
+    Returns:
+        dict: resumo da partição (ids, pasta, tempo gasto e erro, se houver)
+    """
+    # Importações aqui dentro: cada processo do pool cria o seu próprio LIMITADOR e as suas sessões
+    from limitador_taxa import LIMITADOR
+    from metricas import METRICAS
+    from modulo_partidas import modulo_partidas, elenco_da_temporada
+    from modulo_extraction import modulo_extracao
+
+    LIMITADOR.dividir_orcamento(processos)
+    # Cada partição exporta as próprias métricas (o coletor do Prometheus lê todos os .prom da pasta)
+    METRICAS.configurar(nome=f'scrapers_{id_torneio}_{id_season}')
+
+    pasta = pasta_da_particao(id_torneio, id_season, pasta_particoes)
+    os.makedirs(pasta, exist_ok=True)
+    inicio = time.time()
+    erro = None
+
+    try:
+        pasta_partidas = os.path.join(pasta, 'partidas')
+        modulo_partidas(id_torneio, id_season, pasta_partidas=pasta_partidas,
+                        arquivo_forma=os.path.join(pasta, 'forma_recente.csv'), publicar=False)
+
+        df_elenco = elenco_da_temporada(id_torneio, id_season, pasta_partidas)
+        if df_elenco.empty:
+            raise ValueError("Nenhuma escalação gravada para a temporada")
+        df_elenco.to_csv(os.path.join(pasta, ARQUIVO_JOGADORES), index=False, sep=';', encoding='utf-8-sig')
+        print(f"[Colheita] Elenco de torneio={id_torneio} season={id_season}: {len(df_elenco)} jogadores.")
+
+        modulo_extracao(id_torneio=id_torneio, id_season=id_season, pasta_particao=pasta)
+    except SystemExit:
+        # Os módulos usam exit() quando não há como continuar (ex: tabela não encontrada)
+        erro = "Estágio encerrado antes do fim (veja o log da partição)"
+    except Exception as e:
+        erro = str(e)
+
+    return {
+        'id_torneio': id_torneio,
+        'id_season': id_season,
+        'pasta': pasta,
+        'segundos': round(time.time() - inicio, 1),
+        'erro': erro,
+    }
+
+
+def mesclar_particoes(pasta_particoes=PASTA_PARTICOES, pasta_saida=PASTA_MESCLA, publicar=True):
+    """
+    Junta os arquivos de todas as partições em uma tabela única por tipo de dado
+
+    Args:
+        pasta_particoes: pasta raiz das partições
+        pasta_saida: pasta onde os arquivos mesclados serão gravados
+        publicar: se True, envia as tabelas mescladas para o Google Sheets
+
+    Returns:
+        dict: {nome do arquivo: DataFrame mesclado}
+    """
+    print("\n>>> Mesclando partições...")
+    mesclados = {}
+
+    for nome_arquivo in [ARQUIVO_JOGADORES, ARQUIVO_STATS]:
+        partes = []
+        for raiz, _, arquivos in os.walk(pasta_particoes):
+            encontrado = PADRAO_PARTICAO.search(raiz)
+            if not encontrado or nome_arquivo not in arquivos:
+                continue
+
+            df = pd.read_csv(os.path.join(raiz, nome_arquivo), sep=';')
+            # Identifica a origem de cada linha: o mesmo jogador pode estar em várias competições
+            df.insert(0, 'id_season', int(encontrado.group(2)))
+            df.insert(0, 'id_torneio', int(encontrado.group(1)))
+            partes.append(df)
+
+        if not partes:
+            print(f"Nenhuma partição com '{nome_arquivo}'.")
+            continue
+
+        df_mesclado = pd.concat(partes, ignore_index=True, sort=False)
+        os.makedirs(pasta_saida, exist_ok=True)
+        caminho = os.path.join(pasta_saida, nome_arquivo)
+        df_mesclado.to_csv(caminho, index=False, sep=';', encoding='utf-8-sig')
+        print(f"[Local] {len(partes)} partições -> {caminho} ({len(df_mesclado)} linhas)")
+        mesclados[nome_arquivo] = df_mesclado
+
+    if publicar and ARQUIVO_STATS in mesclados:
+        salvar_dataframe(mesclados[ARQUIVO_STATS], SPREADSHEET_ID, "Dataset_Stats_Multicompeticao")
+
+    return mesclados
+
+
+def colher_competicoes(competicoes=COMPETICOES, processos=PROCESSOS_PADRAO, pasta_particoes=PASTA_PARTICOES,
+                       mesclar=True):
+    """
+    Colhe várias competições/temporadas em paralelo, uma partição por processo
+
+    Args:
+        competicoes: lista de pares (id_torneio, id_season)
+        processos: nº de processos simultâneos (o orçamento de requisições é dividido entre eles)
+        pasta_particoes: pasta raiz das partições
+        mesclar: se True, junta as partições no final
+
+    Returns:
+        list: resumo de cada partição
+    """
+    processos = max(1, min(processos, len(competicoes)))
+    print(f">>> Colhendo {len(competicoes)} competições em {processos} processos...")
+
+    resumos = []
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = []
+        for id_torneio, id_season in competicoes:
+            futuros.append(executor.submit(colher_competicao, id_torneio, id_season, processos, pasta_particoes))
+
+        for futuro in as_completed(futuros):
+            resumo = futuro.result()
+            resumos.append(resumo)
+            situacao = f"ERRO: {resumo['erro']}" if resumo['erro'] else "ok"
+            print(f"[Colheita] torneio={resumo['id_torneio']} season={resumo['id_season']} "
+                  f"em {resumo['segundos']}s -> {situacao}")
+
+    if mesclar:
+        mesclar_particoes(pasta_particoes)
+
+    return resumos
+
+
+if __name__ == "__main__":
+    colher_competicoes()
@@ -1,9 +1,25 @@
 import gspread
 import os
+import threading
+from gspread.utils import rowcol_to_a1
 from google.oauth2.service_account import Credentials
 
 CAMINHO_PADRAO = os.path.join(os.getcwd(), 'credentials.json')
 
+# Quantas linhas vão em cada requisição à API do Sheets (mantém o payload bem abaixo do limite)
+LOTE_LINHAS = 500
+
+# Modos de escrita do salvar_dataframe
+SUBSTITUIR = 'substituir'   # limpa a aba e escreve tudo (em lotes)
+ANEXAR = 'anexar'           # só acrescenta linhas cuja chave ainda não está na aba
+ALTERADOS = 'alterados'     # acrescenta as novas e reescreve só as linhas que mudaram
+
+# Cliente autenticado e abas já abertas são reaproveitados entre chamadas
+_clientes = {}
+_abas = {}
+_trava = threading.Lock()
+
+
 def conectar(json_keyfile):
     """Cria a conexão autenticada com o Google."""
     try:
@@ -18,49 +34,257 @@ def conectar(json_keyfile):
         print(f"[Sheets] Erro na autenticação: {e}")
         return None
 
-def salvar_dataframe(dataframe, id_planilha, nome_aba, json_file=CAMINHO_PADRAO):
+
+def obter_cliente(json_keyfile=CAMINHO_PADRAO):
+    """
+    Retorna o cliente autenticado, autenticando só na primeira vez
+
+    Args:
+        json_keyfile: arquivo de credenciais da conta de serviço
+
+    Returns:
+        gspread.Client: cliente autenticado (ou None se a autenticação falhou)
+    """
+    with _trava:
+        if json_keyfile not in _clientes:
+            client = conectar(json_keyfile)
+            if client is None:
+                return None
+            _clientes[json_keyfile] = client
+        return _clientes[json_keyfile]
+
+
+def definir_cliente(client, json_keyfile=CAMINHO_PADRAO):
+    """
+    Injeta um cliente já pronto (ex: um serviço falso local para testes)
+
+    Args:
+        client: objeto com a mesma interface do gspread.Client (open_by_key, etc.)
+        json_keyfile: credencial à qual o cliente fica associado
+    """
+    with _trava:
+        _clientes[json_keyfile] = client
+        _abas.clear()
+
+
+def limpar_cache():
+    """Esquece clientes e abas (a próxima chamada autentica de novo)."""
+    with _trava:
+        _clientes.clear()
+        _abas.clear()
+
+
+def _obter_aba(client, id_planilha, nome_aba, linhas, colunas):
+    chave = (id(client), id_planilha, nome_aba)
+    with _trava:
+        if chave in _abas:
+            return _abas[chave], False
+
+    sh = client.open_by_key(id_planilha)
+    criada = False
+    try:
+        worksheet = sh.worksheet(nome_aba)
+    except gspread.WorksheetNotFound:
+        print(f"[Sheets] Criando nova aba: {nome_aba}")
+        worksheet = sh.add_worksheet(title=nome_aba, rows=linhas + 50, cols=colunas + 5)
+        criada = True
+
+    with _trava:
+        _abas[chave] = worksheet
+    return worksheet, criada
+
+
+def _preparar_valores(dataframe):
     """
-    Converte dicionários/listas para string antes de enviar.
+    Cabeçalho + linhas prontos para a API
+
+    Só células com dicionários/listas viram texto (impede o erro "struct_value" / "Invalid values");
+    números continuam números.
     """
-    print(f"[Sheets] Iniciando exportação para aba '{nome_aba}'...")
+    df_limpo = dataframe.astype(object).where(dataframe.notna(), '')
+
+    for col in df_limpo.columns:
+        if dataframe[col].dtype == 'object':
+            df_limpo[col] = df_limpo[col].map(lambda v: str(v) if isinstance(v, (dict, list, tuple, set)) else v)
+
+    cabecalho = [str(c) for c in df_limpo.columns]
+    return cabecalho, df_limpo.values.tolist()
+
+
+def _normalizar(valor):
+    """Forma comparável de uma célula (o Sheets devolve 7 para 7.0 e '' para vazio)."""
+    if isinstance(valor, bool):
+        return str(valor).upper()
+    if isinstance(valor, (int, float)):
+        return repr(float(valor))
+    texto = str(valor)
+    try:
+        return repr(float(texto))
+    except ValueError:
+        return texto
+
+
+def _garantir_tamanho(worksheet, linhas, colunas):
+    """Aumenta a grade da aba se for preciso (escrever fora dela dá erro na API)."""
+    if worksheet.row_count < linhas or worksheet.col_count < colunas:
+        worksheet.resize(rows=max(worksheet.row_count, linhas), cols=max(worksheet.col_count, colunas))
+
+
+def _escrever_em_lotes(worksheet, linha_inicial, linhas, lote_linhas):
+    for inicio in range(0, len(linhas), lote_linhas):
+        lote = linhas[inicio:inicio + lote_linhas]
+        worksheet.update(range_name=rowcol_to_a1(linha_inicial + inicio, 1), values=lote)
+
 
-    client = conectar(json_file)
+def _substituir(worksheet, cabecalho, linhas, lote_linhas):
+    worksheet.clear()
+    _garantir_tamanho(worksheet, len(linhas) + 1, len(cabecalho))
+    _escrever_em_lotes(worksheet, 1, [cabecalho] + linhas, lote_linhas)
+    return len(linhas)
+
+
+def _compactar(numeros_vagos, total_linhas):
+    """
+    Plano para tirar linhas do meio da aba sem apagar linha a linha
+
+    As últimas linhas vivas descem para as vagas e a grade é cortada no fim (um resize só).
+
+    Args:
+        numeros_vagos: linhas (nº na aba) que devem sumir
+        total_linhas: nº de linhas ocupadas hoje (com o cabeçalho)
+
+    Returns:
+        tuple: (lista de (origem, destino) das linhas movidas, nº de linhas que sobram)
+    """
+    vagos = set(numeros_vagos)
+    total_final = total_linhas - len(vagos)
+    destinos = sorted(n for n in vagos if n <= total_final)
+    origens = [n for n in range(total_final + 1, total_linhas + 1) if n not in vagos]
+    return list(zip(origens, destinos)), total_final
+
+
+def _sincronizar(worksheet, cabecalho, linhas, chave, modo, lote_linhas):
+    """
+    Escreve só o que falta (ANEXAR) ou deixa a aba igual ao DataFrame mexendo só no que mudou (ALTERADOS)
+
+    No modo ALTERADOS, linhas da aba cuja chave não está mais no DataFrame (ou repetida) saem:
+    as chaves novas ocupam essas vagas primeiro e o que sobrar de vaga é compactado.
+
+    Returns:
+        int: nº de linhas escritas ou removidas
+    """
+    existentes = worksheet.get_all_values(value_render_option='UNFORMATTED_VALUE')
+
+    # Aba vazia ou com outras colunas: não há como comparar linha a linha
+    if not existentes or existentes[0] != cabecalho:
+        print("[Sheets] Cabeçalho diferente do atual: reescrevendo a aba inteira.")
+        return _substituir(worksheet, cabecalho, linhas, lote_linhas)
+
+    pos_chave = cabecalho.index(chave)
+    linha_da_chave = {}
+    for numero, valores in enumerate(existentes[1:], start=2):
+        if len(valores) > pos_chave:
+            linha_da_chave[_normalizar(valores[pos_chave])] = (numero, valores)
+
+    novas = []
+    escritas = {}  # nº da linha na aba -> valores (uma entrada do batch_update)
+    for valores in linhas:
+        encontrado = linha_da_chave.get(_normalizar(valores[pos_chave]))
+        if encontrado is None:
+            novas.append(valores)
+            continue
+        if modo == ALTERADOS:
+            numero, antigos = encontrado
+            antigos = list(antigos) + [''] * (len(valores) - len(antigos))
+            if [_normalizar(v) for v in valores] != [_normalizar(v) for v in antigos[:len(valores)]]:
+                escritas[numero] = valores
+    atualizadas = len(escritas)
+
+    reaproveitadas = 0
+    removidas = 0
+    total_linhas = len(existentes)
+    if modo == ALTERADOS:
+        chaves_atuais = {_normalizar(valores[pos_chave]) for valores in linhas}
+        mantidas = {numero for c, (numero, _) in linha_da_chave.items() if c in chaves_atuais}
+        vagos = [numero for numero in range(2, total_linhas + 1) if numero not in mantidas]
+        removidas = max(len(vagos) - len(novas), 0)
+
+        # Chaves novas reaproveitam as linhas que saíram
+        while vagos and novas:
+            escritas[vagos.pop(0)] = novas.pop(0)
+            reaproveitadas += 1
+
+        movidas, total_linhas = _compactar(vagos, total_linhas)
+        for origem, destino in movidas:
+            valores = escritas.pop(origem, None)
+            if valores is None:
+                valores = list(existentes[origem - 1]) + [''] * (len(cabecalho) - len(existentes[origem - 1]))
+            escritas[destino] = valores
+
+    atualizacoes = []
+    for numero in sorted(escritas):
+        valores = escritas[numero]
+        atualizacoes.append({
+            'range': f"{rowcol_to_a1(numero, 1)}:{rowcol_to_a1(numero, len(valores))}",
+            'values': [valores],
+        })
+    for inicio in range(0, len(atualizacoes), lote_linhas):
+        worksheet.batch_update(atualizacoes[inicio:inicio + lote_linhas])
+
+    if removidas:
+        # O que sobrou abaixo da última linha viva sai num corte só da grade
+        worksheet.resize(rows=total_linhas)
+
+    if novas:
+        primeira_livre = total_linhas + 1
+        _garantir_tamanho(worksheet, primeira_livre + len(novas) - 1, len(cabecalho))
+        _escrever_em_lotes(worksheet, primeira_livre, novas, lote_linhas)
+
+    adicionadas = len(novas) + reaproveitadas
+    print(f"[Sheets] {adicionadas} linhas novas, {atualizadas} atualizadas e {removidas} removidas.")
+    return adicionadas + atualizadas + removidas
+
+
+def salvar_dataframe(dataframe, id_planilha, nome_aba, json_file=CAMINHO_PADRAO, modo=SUBSTITUIR,
+                     chave='player_id', lote_linhas=LOTE_LINHAS):
+    """
+    Envia um DataFrame para uma aba do Google Sheets, em lotes de linhas
+
+    Args:
+        dataframe: dados a enviar
+        id_planilha: id da planilha (está na url)
+        nome_aba: nome da aba (criada se não existir)
+        json_file: arquivo de credenciais da conta de serviço
+        modo: SUBSTITUIR (limpa e escreve tudo), ANEXAR (só chaves novas) ou
+            ALTERADOS (chaves novas + linhas que mudaram)
+        chave: coluna que identifica a linha nos modos ANEXAR e ALTERADOS
+        lote_linhas: nº máximo de linhas por requisição
+    """
+    print(f"[Sheets] Iniciando exportação para aba '{nome_aba}' (modo {modo})...")
+
+    client = obter_cliente(json_file)
     if not client:
         return
 
     try:
-        # Tenta abrir a planilha pelo ID
+        # Tenta abrir a planilha pelo ID e selecionar a aba (ou criar uma nova)
         try:
-            sh = client.open_by_key(id_planilha)
+            worksheet, criada = _obter_aba(client, id_planilha, nome_aba, dataframe.shape[0], dataframe.shape[1])
         except gspread.SpreadsheetNotFound:
             print(f"[Sheets] Planilha ID '{id_planilha}' não encontrada.")
             return
 
-        # Tenta selecionar a aba ou cria uma nova
-        try:
-            worksheet = sh.worksheet(nome_aba)
-            worksheet.clear()  # Limpa dados antigos
-        except gspread.WorksheetNotFound:
-            print(f"[Sheets] Criando nova aba: {nome_aba}")
-            worksheet = sh.add_worksheet(title=nome_aba, rows=dataframe.shape[0] + 50, cols=dataframe.shape[1] + 5)
-
-        # --- TRATAMENTO DE DADOS (A CORREÇÃO ESTÁ AQUI) ---
-        df_limpo = dataframe.fillna('')
-
-        # Verifica cada coluna: se tiver dicionários ou listas, converte para Texto (String)
-        # Isso impede o erro "struct_value" / "Invalid values"
-        for col in df_limpo.columns:
-            # Se a coluna for do tipo 'object' (pode conter dicts), forçamos string
-            if df_limpo[col].dtype == 'object':
-                df_limpo[col] = df_limpo[col].astype(str)
-
-        # Prepara os dados: Cabeçalho + Linhas
-        dados = [df_limpo.columns.values.tolist()] + df_limpo.values.tolist()
+        cabecalho, linhas = _preparar_valores(dataframe)
 
-        # Envia
-        worksheet.update(range_name='A1', values=dados)
+        if modo == SUBSTITUIR or criada or chave not in cabecalho:
+            enviadas = _substituir(worksheet, cabecalho, linhas, lote_linhas)
+        else:
+            enviadas = _sincronizar(worksheet, cabecalho, linhas, chave, modo, lote_linhas)
 
-        print(f"[Sheets] Sucesso! {len(dataframe)} linhas enviadas para '{nome_aba}'.")
+        print(f"[Sheets] Sucesso! {enviadas} linhas enviadas para '{nome_aba}'.")
 
     except Exception as e:
-        print(f"[Sheets] Erro durante o envio: {e}")
\ No newline at end of file
+        # A aba pode ter sido apagada/renomeada: esquece o handle para a próxima chamada reabrir
+        with _trava:
+            _abas.pop((id(client), id_planilha, nome_aba), None)
+        print(f"[Sheets] Erro durante o envio: {e}")
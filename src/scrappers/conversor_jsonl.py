@@ -1,6 +1,16 @@
 import pandas as pd
 import os
-from conectar_google_api import salvar_dataframe
+import json
+from conectar_google_api import salvar_dataframe, ALTERADOS
+from area_staging import publicar_arquivo, ESPELHAR_NO_SHEETS
+
+# Parquet é opcional: sem o pyarrow instalado o conversor gera só o CSV
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
 
 # --- CONFIGURAÇÃO DE CAMINHOS ---
 # Usando o mesmo caminho do script anterior para garantir que eles se encontrem
@@ -9,47 +19,209 @@ ARQUIVO_JSONL = f'{PASTA_PROJETO}/dados_brutos_stats.jsonl'
 ARQUIVO_CSV_FINAL = f'{PASTA_PROJETO}/tabela_final_stats_2025.csv'
 SPREADSHEET_ID = "id"  # <--- SEU ID
 
+# Quantas linhas do JSONL ficam em memória por vez
+TAMANHO_BLOCO = 5000
+
+# Garante que identificadores fiquem na esquerda
+COLUNAS_FIXAS = ['player_id', 'player_name', 'team_id']
+
+# Tipo pandas e tipo Arrow de cada "família" de coluna descoberta no JSONL
+TIPOS_PANDAS = {'int': 'Int64', 'float': 'float64', 'bool': 'boolean', 'texto': 'string'}
+
+
+def _tipo_do_valor(valor):
+    # bool antes de int: em Python, True também é int
+    if isinstance(valor, bool):
+        return 'bool'
+    if isinstance(valor, int):
+        return 'int'
+    if isinstance(valor, float):
+        return 'float'
+    return 'texto'
+
+
+def _unir_tipos(atual, novo):
+    """Combina o tipo já visto de uma coluna com o tipo de um novo valor."""
+    if atual is None or atual == novo:
+        return novo
+    if {atual, novo} == {'int', 'float'}:
+        return 'float'
+    return 'texto'
+
+
+def _ler_linhas(arquivo_jsonl):
+    """
+    Percorre o JSONL devolvendo (nº da linha, registro), sem carregar o arquivo inteiro
+
+    Linhas corrompidas (ex: a última linha cortada por uma queda) são avisadas e ignoradas.
+    """
+    with open(arquivo_jsonl, 'r', encoding='utf-8') as f:
+        for numero, linha in enumerate(f):
+            if not linha.strip():
+                continue
+            try:
+                yield numero, json.loads(linha)
+            except ValueError:
+                print(f"Aviso: linha {numero + 1} do JSONL está corrompida e foi ignorada.")
+
 
-def processar_conversao():
+def mapear_esquema(arquivo_jsonl):
     """
-        Converte a planilha de extração dos jogadores de jsonl para CSV
+    1ª passada: descobre a união das colunas dinâmicas, o tipo de cada uma e a última
+    linha de cada jogador (jogadores recoletados aparecem mais de uma vez)
+
+    Args:
+        arquivo_jsonl: JSONL bruto gerado pelo modulo_extracao
+
+    Returns:
+        tuple: (dict coluna -> tipo, dict player_id -> nº da última linha)
+    """
+    tipos = {}
+    ultima_linha = {}
+
+    for numero, registro in _ler_linhas(arquivo_jsonl):
+        ultima_linha[registro.get('player_id')] = numero
+        for coluna, valor in registro.items():
+            if valor is None:
+                tipos.setdefault(coluna, None)
+                continue
+            tipos[coluna] = _unir_tipos(tipos.get(coluna), _tipo_do_valor(valor))
+
+    # Colunas que só tiveram nulos viram float (NaN)
+    for coluna, tipo in tipos.items():
+        if tipo is None:
+            tipos[coluna] = 'float'
+
+    return tipos, ultima_linha
+
+
+def _esquema_arrow(colunas, tipos):
+    tipos_arrow = {'int': pa.int64(), 'float': pa.float64(), 'bool': pa.bool_(), 'texto': pa.string()}
+    campos = []
+    for coluna in colunas:
+        campos.append(pa.field(coluna, tipos_arrow[tipos[coluna]]))
+    return pa.schema(campos)
+
+
+def _montar_bloco(registros, colunas, tipos):
+    """Transforma uma lista de registros num DataFrame com o esquema unificado e tipos reais."""
+    df = pd.DataFrame.from_records(registros, columns=colunas)
+    for coluna in colunas:
+        tipo = tipos[coluna]
+        if tipo == 'texto':
+            # Dicionários/listas aninhados viram texto (mesma regra do envio ao Sheets)
+            df[coluna] = df[coluna].map(
+                lambda v: json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v
+            )
+        df[coluna] = df[coluna].astype(TIPOS_PANDAS[tipo])
+    return df
+
+
+def processar_conversao(arquivo_jsonl=ARQUIVO_JSONL, arquivo_csv=ARQUIVO_CSV_FINAL, publicar=True,
+                        tamanho_bloco=TAMANHO_BLOCO, ids_validos=None):
+    """
+        Converte a planilha de extração dos jogadores de jsonl para CSV (e Parquet, se houver pyarrow)
+
+        A leitura é feita em blocos de tamanho fixo, então a memória usada não cresce com o arquivo.
+        As colunas numéricas mantêm o tipo real (inteiro/decimal) em vez de virar texto.
+
+        Args:
+            arquivo_jsonl: JSONL bruto gerado pelo modulo_extracao
+            arquivo_csv: CSV final a ser gerado (o Parquet vai ao lado, com extensão .parquet)
+            publicar: se False, não publica a tabela no staging nem no Google Sheets (ex: partições da colheita)
+            tamanho_bloco: nº de linhas do JSONL processadas por vez
+            ids_validos: se informado, só esses jogadores vão para a saída (ex: os que ainda estão na
+                fila; quem saiu do campeonato continua no JSONL, mas não volta para o CSV nem para o banco)
     """
     print("Iniciando processamento dos dados...")
 
-    if not os.path.exists(ARQUIVO_JSONL):
-        print(f"Erro: Arquivo '{ARQUIVO_JSONL}' não encontrado.")
+    if not os.path.exists(arquivo_jsonl):
+        print(f"Erro: Arquivo '{arquivo_jsonl}' não encontrado.")
         return
 
-    # 1. Lê o arquivo JSONL
-    # O lines=True é a mágica que alinha Goleiros com Atacantes
-    try:
-        df = pd.read_json(ARQUIVO_JSONL, lines=True)
-    except ValueError:
+    # 1. Primeira passada: esquema e deduplicação
+    tipos, ultima_linha = mapear_esquema(arquivo_jsonl)
+    if ids_validos is not None:
+        ids_validos = {int(pid) for pid in ids_validos}
+        fora = [pid for pid in ultima_linha if pid not in ids_validos]
+        for pid in fora:
+            del ultima_linha[pid]
+        if fora:
+            print(f"{len(fora)} jogadores que saíram do campeonato ficaram fora da tabela.")
+    if not ultima_linha:
         print("Erro: O arquivo JSONL parece estar vazio ou corrompido.")
         return
 
-    print(f"Lido com sucesso: {len(df)} registros.")
-
-    # 2. Organização de Colunas
-    # Garante que identificadores fiquem na esquerda
-    colunas_fixas = ['player_id', 'player_name', 'team_id']
-    # Pega o resto das colunas dinâmicas (goals, assists, saves, etc)
+    # 2. Organização de Colunas: fixas na esquerda, o resto das dinâmicas (goals, assists, saves, etc)
+    colunas_fixas = []
+    for c in COLUNAS_FIXAS:
+        if c in tipos:
+            colunas_fixas.append(c)
     outras_colunas = []
-
-    for c in df.columns:
+    for c in tipos:
         if c not in colunas_fixas:
             outras_colunas.append(c)
     ordem_final = colunas_fixas + outras_colunas
 
-    # Reordena e PREENCHE VAZIOS (Importante para o Sheets)
-    df = df[ordem_final].fillna('')
+    print(f"Esquema com {len(ordem_final)} colunas para {len(ultima_linha)} jogadores.")
+
+    # 3. Segunda passada: escreve CSV e Parquet bloco a bloco
+    arquivo_parquet = os.path.splitext(arquivo_csv)[0] + '.parquet'
+    escritor_parquet = None
+    if pa is not None:
+        escritor_parquet = pq.ParquetWriter(arquivo_parquet, _esquema_arrow(ordem_final, tipos))
+    else:
+        print("[Local] pyarrow não instalado: Parquet não será gerado.")
+
+    total = 0
+    primeiro_bloco = True
+
+    def gravar(registros):
+        nonlocal primeiro_bloco, total
+        df_bloco = _montar_bloco(registros, ordem_final, tipos)
+        # Vazios saem como '' no CSV (igual antes), mas o DataFrame continua numérico
+        df_bloco.to_csv(arquivo_csv, index=False, sep=';', na_rep='',
+                        mode='w' if primeiro_bloco else 'a', header=primeiro_bloco,
+                        encoding='utf-8-sig' if primeiro_bloco else 'utf-8')
+        if escritor_parquet is not None:
+            escritor_parquet.write_table(pa.Table.from_pandas(df_bloco, preserve_index=False,
+                                                              schema=escritor_parquet.schema))
+        primeiro_bloco = False
+        total += len(df_bloco)
+
+    try:
+        registros = []
+        for numero, registro in _ler_linhas(arquivo_jsonl):
+            # Jogadores recoletados (mudaram de time/posição) aparecem mais de uma vez: vale a linha mais recente
+            if ultima_linha.get(registro.get('player_id')) != numero:
+                continue
+            registros.append(registro)
+            if len(registros) >= tamanho_bloco:
+                gravar(registros)
+                registros = []
+        if registros:
+            gravar(registros)
+    finally:
+        if escritor_parquet is not None:
+            escritor_parquet.close()
+
+    print(f"Lido com sucesso: {total} registros.")
+    print(f"[Local] CSV salvo em: {arquivo_csv}")
+    if escritor_parquet is not None:
+        print(f"[Local] Parquet salvo em: {arquivo_parquet}")
+
+    if not publicar:
+        return
 
-    # 3. Salva o CSV final limpo (Backup Local)
-    df.to_csv(ARQUIVO_CSV_FINAL, index=False, sep=';', encoding='utf-8-sig')
-    print(f"[Local] CSV salvo em: {ARQUIVO_CSV_FINAL}")
+    # 4. Entrega local para a carga no banco (o limpeza_insercao_bd.py lê direto daqui)
+    if escritor_parquet is not None:
+        publicar_arquivo('stats', arquivo_parquet, total)
+    else:
+        publicar_arquivo('stats', arquivo_csv, total)
 
-    # 4. Envia para o Google Sheets (Nuvem)
-    if salvar_dataframe:
+    # 5. Espelho no Google Sheets (Nuvem)
+    if salvar_dataframe and ESPELHAR_NO_SHEETS:
         print("[Nuvem] Enviando Tabela Final para o Google Sheets...")
+        df = pd.read_csv(arquivo_csv, sep=';')
         # Salva numa aba chamada "Dataset_Final_Stats"
-        salvar_dataframe(df, SPREADSHEET_ID, "Dataset_Final_Stats")
\ No newline at end of file
+        salvar_dataframe(df, SPREADSHEET_ID, "Dataset_Final_Stats", modo=ALTERADOS)
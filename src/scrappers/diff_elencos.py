@@ -0,0 +1,92 @@
+import json
+import os
+import pandas as pd
+from datetime import datetime
+
+# --- CONFIGURAÇÃO ---
+PASTA_PROJETO = 'caminho'
+ARQUIVO_ALTERACOES = f'{PASTA_PROJETO}/alteracoes_elenco.json'
+
+# Colunas que, se mudarem, obrigam a coletar o jogador de novo
+COLUNAS_MONITORADAS = ['time_id', 'position']
+
+
+def calcular_alteracoes(df_anterior, df_novo, times_com_falha=()):
+    """
+    Compara o elenco anterior com o recém baixado
+
+    Args:
+        df_anterior: DataFrame do CSV da execução anterior (ou None na primeira execução)
+        df_novo: DataFrame com os elencos que acabaram de ser coletados
+        times_com_falha: ids dos times cujo elenco não pôde ser baixado nesta execução.
+            Os jogadores deles não contam como 'saidas' (não sabemos se saíram).
+
+    Returns:
+        dict: conjunto de mudanças com as listas de ids 'novos', 'saidas' e 'alterados'.
+            'completo' é True quando não havia snapshot anterior (todos contam como novos).
+    """
+    ids_novos = set(df_novo['id'].astype(int).tolist())
+
+    if df_anterior is None or df_anterior.empty:
+        return {
+            'gerado_em': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'completo': True,
+            'novos': sorted(ids_novos),
+            'saidas': [],
+            'alterados': [],
+        }
+
+    ids_anteriores = set(df_anterior['id'].astype(int).tolist())
+    ids_sem_informacao = set(df_anterior.loc[df_anterior['time_id'].isin(list(times_com_falha)), 'id'].astype(int).tolist())
+
+    # Compara só quem está nos dois snapshots, coluna a coluna
+    colunas = ['id']
+    for coluna in COLUNAS_MONITORADAS:
+        if coluna in df_novo.columns and coluna in df_anterior.columns:
+            colunas.append(coluna)
+
+    comparacao = df_anterior[colunas].astype(str).merge(
+        df_novo[colunas].astype(str), on='id', suffixes=('_anterior', '_novo')
+    )
+
+    mudou = pd.Series(False, index=comparacao.index)
+    for coluna in colunas[1:]:
+        mudou = mudou | (comparacao[f'{coluna}_anterior'] != comparacao[f'{coluna}_novo'])
+
+    alterados = set(comparacao.loc[mudou, 'id'].astype(int).tolist())
+
+    return {
+        'gerado_em': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'completo': False,
+        'novos': sorted(ids_novos - ids_anteriores),
+        'saidas': sorted(ids_anteriores - ids_novos - ids_sem_informacao),
+        'alterados': sorted(alterados),
+    }
+
+
+def salvar_alteracoes(alteracoes, caminho=ARQUIVO_ALTERACOES):
+    """Grava o conjunto de mudanças para os próximos estágios consumirem."""
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(alteracoes, f, ensure_ascii=False, indent=2)
+
+
+def carregar_alteracoes(caminho=ARQUIVO_ALTERACOES):
+    """
+    Lê o conjunto de mudanças gerado pelo modulo_discovery
+
+    Args:
+        caminho: caminho do JSON de alterações
+
+    Returns:
+        dict: conjunto de mudanças (mesmo formato de calcular_alteracoes)
+        None: não existe arquivo ou a última descoberta foi completa (todo mundo deve ser processado)
+    """
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, 'r', encoding='utf-8') as f:
+        alteracoes = json.load(f)
+    if alteracoes.get('completo'):
+        return None
+    return alteracoes
+
@@ -1,10 +1,126 @@
-def especificador_posicoes():
-    from curl_cffi import requests
+def montar_item_tatico(pid, nome, data=None):
+    """
+    Monta a linha tática de um jogador a partir do payload de /characteristics
+
+    Args:
+        pid: id do jogador
+        nome: nome do jogador
+        data: JSON da resposta (None quando não há dados táticos, ex: 404)
+
+    Returns:
+        dict: player_id, player_name, posicoes_detalhadas, ids_fortes e ids_fracos
+    """
+    item = {
+        'player_id': pid,
+        'player_name': nome,
+        'posicoes_detalhadas': '',
+        'ids_fortes': '',
+        'ids_fracos': ''
+    }
+    if not data:
+        return item
+
+    # 1. Posições
+    lista_pos = data.get('positions', [])
+    item['posicoes_detalhadas'] = ", ".join(lista_pos)
+
+    # 2. Pontos Fortes e Fracos
+    fortes = []
+    positivos = data.get('positive', [])
+
+    for x in positivos:
+        valor = x.get('type')
+        fortes.append(str(valor))
+
+    fracos = []
+    negativos = data.get('negative', [])
+
+    for x in negativos:
+        valor = x.get('type')
+        fracos.append(str(valor))
+
+    item['ids_fortes'] = ", ".join(fortes)
+    item['ids_fracos'] = ", ".join(fracos)
+    return item
+
+
+def salvar_caracteristicas(dados_coletados, lista_erros, arquivo_saida, spreadsheet_id):
+    """
+    Salva as características táticas (CSV local, staging e espelho no Sheets) e o log de erros
+
+    Args:
+        dados_coletados: linhas táticas (ver montar_item_tatico)
+        lista_erros: erros registrados na execução
+        arquivo_saida: CSV local das características
+        spreadsheet_id: id da planilha do espelho e dos logs
+    """
+    import pandas as pd
+    from conectar_google_api import salvar_dataframe, ALTERADOS
+    from area_staging import publicar_tabela, ESPELHAR_NO_SHEETS
+
+    if dados_coletados:
+        df_out = pd.DataFrame(dados_coletados)
+        df_out.to_csv(arquivo_saida, index=False, sep=';', encoding='utf-8-sig')
+        print(f"CSV Tático salvo: {arquivo_saida}")
+
+        publicar_tabela('tatica', df_out)
+
+        # Espelho dos Dados (Nuvem)
+        if salvar_dataframe and ESPELHAR_NO_SHEETS:
+            print("Enviando Características para o Google Sheets...")
+            salvar_dataframe(df_out, spreadsheet_id, "Características_Táticas", modo=ALTERADOS)
+    else:
+        print("Nenhum dado tático coletado.")
+
+    # Logs de Erro (Nuvem)
+    if lista_erros and salvar_dataframe:
+        print("Enviando Logs de erro...")
+        df_erros = pd.DataFrame(lista_erros)
+        salvar_dataframe(df_erros, spreadsheet_id, "Log_Erros_Taticos")
+
+
+def semear_caracteristicas(fila, arquivo_saida, endpoint='caracteristicas'):
+    """
+    Primeira execução com a fila: o CSV tático que já existe entra como concluído
+
+    Sem isso a fila começa só com quem entrou ou mudou, e o salvar_caracteristicas
+    sobrescreve o CSV (e a tabela 'tatica' do staging) com essas poucas linhas.
+
+    Args:
+        fila: FilaTrabalho aberta
+        arquivo_saida: CSV local das características
+        endpoint: nome do endpoint na fila
+
+    Returns:
+        int: quantidade de jogadores semeados (0 se a fila já tinha o endpoint ou não há CSV)
+    """
+    import os
+    import pandas as pd
+
+    if not fila.esta_vazia(endpoint) or not os.path.exists(arquivo_saida):
+        return 0
+
+    # Tudo como texto: campos vazios continuam '' (como o montar_item_tatico grava)
+    df = pd.read_csv(arquivo_saida, sep=';', dtype=str, keep_default_na=False, encoding='utf-8-sig')
+    resultados = {}
+    for item in df.to_dict('records'):
+        if not item.get('player_id'):
+            continue
+        item['player_id'] = int(item['player_id'])
+        resultados[item['player_id']] = item
+
+    fila.semear(endpoint, resultados)
+    print(f"{len(resultados)} jogadores de {arquivo_saida} registrados como concluídos na fila '{endpoint}'.")
+    return len(resultados)
+
+
+def especificador_posicoes(reprocessar_falhas=False):
     import pandas as pd
-    import time
-    import random
     from datetime import datetime
-    from conectar_google_api import salvar_dataframe
+    from cliente_http import faz_requisicao, URL_API, url_perfil_jogador
+    from metricas import METRICAS
+    from diff_elencos import carregar_alteracoes
+    from fila_trabalho import FilaTrabalho
 
     # --- CONFIGURAÇÃO ---
     PASTA_PROJETO = 'caminho'
@@ -13,15 +129,7 @@ def especificador_posicoes():
 
     # Configure seu ID aqui
     SPREADSHEET_ID = "id"
-
-    headers = {
-        'authority': 'www.sofascore.com',
-        'accept': '*/*',
-        'referer': 'https://www.sofascore.com/',
-        'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-        'x-requested-with': 'x',
-        'cookie': 'cookie',
-    }
+    ENDPOINT = 'caracteristicas'  # nome deste estágio na fila de trabalho
 
     # --- SISTEMA DE LOGS ---
     lista_erros = []
@@ -46,74 +154,23 @@ def especificador_posicoes():
         lista_erros.append(erro_encontrado)  # Adiciona na lista de erros
         print(f"Foi encontrado um erro com a mensagem {mensagem}. Já adicionei na lista de erros")
 
-    def finalizar_execucao(dados_coletados):
+    def finalizar_execucao():
         """
-        Salva tudo (Dados e Logs) localmente e na nuvem para finalizar a execução
-
-        Args:
-            dados_coletados: lista contendo os dados táticos que foram raspados e processados
+        Salva tudo (Dados e Logs) localmente e na nuvem para finalizar a execução.
+        Os dados táticos vêm da fila de trabalho, que guarda o resultado de cada jogador
+        assim que ele é processado (nada se perde se a execução cair no meio).
 
         Returns:
             None: A função não retorna valores, apenas realiza a persistência dos dados (CSV e Google Sheets) e logs de erro
         """
         print("\nFinalizando e salvando dados...")
 
-        # 1. Salvar Dados (CSV Local)
-        if dados_coletados:
-            df_out = pd.DataFrame(dados_coletados)
-            df_out.to_csv(ARQUIVO_SAIDA, index=False, sep=';', encoding='utf-8-sig')
-            print(f"CSV Tático salvo: {ARQUIVO_SAIDA}")
-
-            # 2. Salvar Dados (Nuvem)
-            if salvar_dataframe:
-                print("Enviando Características para o Google Sheets...")
-                salvar_dataframe(df_out, SPREADSHEET_ID, "Características_Táticas")
-        else:
-            print("Nenhum dado tático coletado.")
-
-        # 3. Salvar Logs de Erro (Nuvem)
-        if lista_erros and salvar_dataframe:
-            print("Enviando Logs de erro...")
-            df_erros = pd.DataFrame(lista_erros)
-            salvar_dataframe(df_erros, SPREADSHEET_ID, "Log_Erros_Taticos")
-
-    def faz_requisicao(url, headers_req, contexto="", tentativas=5, espera=3):
-        """
-        Tenta fazer a requisição X vezes antes de desistir
-
-        Args:
-            url: url da requisição
-            headers_req: cabeçalhos para simular o navegador (ex: user-agent)
-            contexto: texto para identificar nos logs o que está sendo baixado (ex: nome do jogador)
-            tentativas: número máximo de vezes que o código tentará conectar
-            espera: tempo em segundos de aguardo entre uma falha e a próxima tentativa
-
-        Returns:
-            resp: O objeto da resposta se o status for 200 (sucesso), 404 (não encontrado) ou 403 (bloqueado)
-            None: A requisição não funcionou e mesmo após as tentativas o algoritmo não retornou.
-            Nesse caso, ele desiste da URL.
-        """
-        for i in range(tentativas):
-            try:
-                resp = requests.get(url, headers=headers_req, impersonate="chrome")
-
-                # Se for sucesso (200), 404 (não existe) ou 403 (bloqueio), retorna
-                if resp.status_code in [200, 404, 403]:
-                    return resp
-
-                # Se falhar, pula linha e avisa qual jogador deu erro
-                print(
-                    f"\n{contexto} -> Tentativa {i + 1}/{tentativas} falhou (Status {resp.status_code})... Tentando de novo em {espera}s.")
-
-            except Exception as e:
-                # Tratamento para erro de DNS/Internet (seu erro curl 6)
-                print(
-                    f"\n{contexto} -> Tentativa {i + 1}/{tentativas} falhou (Erro de Conexão). Aguardando {espera}s...")
-
-            if i < tentativas - 1:
-                time.sleep(espera)
+        # 1. Os dados vêm da fila; CSV, staging, Sheets e logs ficam com o salvar_caracteristicas
+        dados_coletados = fila.resultados(ENDPOINT)
+        print(f"Situação da fila: {fila.resumo(ENDPOINT)}")
+        fila.fechar()
 
-        return None  # Falhou todas
+        salvar_caracteristicas(dados_coletados, lista_erros, ARQUIVO_SAIDA, SPREADSHEET_ID)
 
     # --- INÍCIO ---
     print(f"Lendo {ARQUIVO_ENTRADA}...")
@@ -123,86 +180,74 @@ def especificador_posicoes():
         print("Erro: CSV de entrada não encontrado. Rode o primeiro script antes.")
         exit()
 
-    dados_finais = []
+    fila = FilaTrabalho()
+    semear_caracteristicas(fila, ARQUIVO_SAIDA, ENDPOINT)
+
+    # Se o discovery gerou um conjunto de mudanças, só revisita quem entrou ou mudou
+    fila.sincronizar_elenco(ENDPOINT, df_jogadores['id'].tolist(), carregar_alteracoes())
+
+    if reprocessar_falhas:
+        print(f"Reabrindo {fila.reabrir_falhas(ENDPOINT)} tarefas que falharam antes.")
+
+    # Retomada: só quem está pendente na fila
+    ids_pendentes = fila.pendentes(ENDPOINT)
+    df_jogadores = df_jogadores[df_jogadores['id'].isin(ids_pendentes)]
+    print(f"{len(df_jogadores)} jogadores pendentes.")
+
     print(">>> Buscando características táticas...")
 
     try:
         for index, row in df_jogadores.iterrows():
-            pid = row['id']
+            pid = int(row['id'])
             nome = row['name']
             slug = row.get('slug', 'player')
 
-            url = f"https://www.sofascore.com/api/v1/player/{pid}/characteristics"
-
-            # Header Referer dinâmico
-            headers['referer'] = f"https://www.sofascore.com/pt/football/player/{slug}/{pid}"
+            url = f"{URL_API}/player/{pid}/characteristics"
 
             try:
-                # Pausa antes de começar
-                time.sleep(random.uniform(1.0, 2.0))
+                fila.iniciar(ENDPOINT, pid)
 
                 # --- CHAMADA COM RETRY ---
-                resp = faz_requisicao(url, headers, contexto=f"[{index}] {nome}")
+                # Header Referer dinâmico
+                resp = faz_requisicao(url, referer=url_perfil_jogador(slug, pid), contexto=f"[{index}] {nome}")
 
-                item = {
-                    'player_id': pid,
-                    'player_name': nome,
-                    'posicoes_detalhadas': '',
-                    'ids_fortes': '',
-                    'ids_fracos': ''
-                }
+                item = montar_item_tatico(pid, nome)
 
                 if resp:  # Se houve resposta
                     if resp.status_code == 200:
                         data = resp.json()
+                        item = montar_item_tatico(pid, nome, data)
 
-                        # 1. Posições
-                        lista_pos = data.get('positions', [])
-                        item['posicoes_detalhadas'] = ", ".join(lista_pos)
-
-                        # 2. Pontos Fortes e Fracos
-                        fortes = []
-                        positivos = data.get('positive', [])
-
-                        for x in positivos:
-                            valor = x.get('type')
-                            fortes.append(str(valor))
-
-                        fracos = []
-                        negativos = data.get('negative', [])
-
-                        for x in negativos:
-                            valor = x.get('type')
-                            fracos.append(str(valor))
-
-                        item['ids_fortes'] = ", ".join(fortes)
-                        item['ids_fracos'] = ", ".join(fracos)
-
-                        print(f"[{index}] {nome}: {item['posicoes_detalhadas']} | +{len(fortes)} | -{len(fracos)}")
-                        dados_finais.append(item)
+                        print(f"[{index}] {nome}: {item['posicoes_detalhadas']} | +{len(data.get('positive', []))} | -{len(data.get('negative', []))}")
+                        fila.concluir(ENDPOINT, pid, resultado=item)
+                        METRICAS.registrar_itens('especificador')
 
                     elif resp.status_code == 404:
                         print(f"[{index}] {nome}: Sem dados táticos (404).")
-                        dados_finais.append(item)  # Salva vazio
+                        fila.concluir(ENDPOINT, pid, resultado=item)  # Salva vazio
 
                     elif resp.status_code == 403:
                         registrar_erro("FATAL", "Bloqueio 403 detectado", nome)
+                        fila.devolver(ENDPOINT, pid)
                         break  # Encerra o loop para salvar o que já temos
 
                     else:
                         registrar_erro("HTTP", f"Status {resp.status_code}", nome)
+                        fila.falhar(ENDPOINT, pid, f"Status {resp.status_code}")
 
                 else:
                     # Falhou as 5 tentativas
                     print(f"[{index}] {nome}: Falha Total de Conexão.")
                     registrar_erro("Conexão", "Falha após 5 tentativas", nome)
+                    fila.falhar(ENDPOINT, pid, "Falha de conexão")
 
             except Exception as e:
                 registrar_erro("Exceção Loop", str(e), nome)
+                fila.falhar(ENDPOINT, pid, e)
 
     except KeyboardInterrupt:
         print("\nInterrupção manual.")
 
     finally:
         # Garante que salva tudo mesmo se der erro no meio
-        finalizar_execucao(dados_finais)
\ No newline at end of file
+        finalizar_execucao()
\ No newline at end of file
@@ -0,0 +1,272 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+# --- CONFIGURAÇÃO ---
+PASTA_PROJETO = 'caminho'
+ARQUIVO_FILA = f'{PASTA_PROJETO}/fila_trabalho.sqlite'
+
+# Estados possíveis de uma tarefa
+PENDENTE = 'pendente'
+EM_ANDAMENTO = 'em_andamento'
+CONCLUIDO = 'concluido'
+FALHOU = 'falhou'
+
+# Por quanto tempo (segundos) uma tarefa concluída vale antes de ser coletada de novo.
+# As estatísticas são totais da temporada e mudam a cada rodada: mesma validade do cache_http
+# para /statistics/overall. Endpoint fora daqui (ex: características) só volta se o jogador mudar.
+VALIDADE_CONCLUIDAS = {
+    'estatisticas': 12 * 60 * 60,
+}
+
+SQL_CRIACAO = """
+CREATE TABLE IF NOT EXISTS tarefas (
+    endpoint      TEXT    NOT NULL,
+    player_id     INTEGER NOT NULL,
+    estado        TEXT    NOT NULL DEFAULT 'pendente',
+    tentativas    INTEGER NOT NULL DEFAULT 0,
+    ultimo_erro   TEXT,
+    resultado     TEXT,
+    atualizado_em TEXT,
+    PRIMARY KEY (endpoint, player_id)
+);
+CREATE INDEX IF NOT EXISTS idx_tarefas_estado ON tarefas (endpoint, estado);
+"""
+
+
+def _agora():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class FilaTrabalho:
+    """
+    Fila de trabalho persistente (SQLite) compartilhada por todos os estágios dos scrapers.
+
+    Cada tarefa é um par (endpoint, player_id) com estado pendente, em andamento,
+    concluído ou falhou, além do número de tentativas. Retomar uma execução é só
+    consultar as pendentes pelo índice, sem reler nenhum arquivo de saída.
+    """
+
+    def __init__(self, caminho=ARQUIVO_FILA):
+        self.caminho = caminho
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False, timeout=30)
+        # WAL: vários estágios (threads/processos) podem ler e escrever no mesmo arquivo
+        self._conexao.execute("PRAGMA journal_mode=WAL;")
+        self._conexao.execute("PRAGMA synchronous=NORMAL;")
+        self._conexao.executescript(SQL_CRIACAO)
+        self._trava = threading.Lock()
+
+    def _executar(self, sql, parametros=()):
+        with self._trava, self._conexao:
+            return self._conexao.execute(sql, parametros)
+
+    def _executar_varios(self, sql, lista_parametros):
+        with self._trava, self._conexao:
+            self._conexao.executemany(sql, lista_parametros)
+
+    def fechar(self):
+        self._conexao.close()
+
+    # --- ENFILEIRAMENTO ---
+
+    def enfileirar(self, endpoint, ids, reabrir=False):
+        """
+        Coloca jogadores na fila de um endpoint
+
+        Args:
+            endpoint: nome do endpoint (ex: 'estatisticas', 'caracteristicas')
+            ids: ids dos jogadores
+            reabrir: se True, tarefas já concluídas/falhas voltam para pendente (ex: jogador mudou de time)
+        """
+        agora = _agora()
+        linhas = [(endpoint, int(pid), agora) for pid in ids]
+        if reabrir:
+            self._executar_varios(
+                "INSERT INTO tarefas (endpoint, player_id, atualizado_em) VALUES (?, ?, ?) "
+                "ON CONFLICT(endpoint, player_id) DO UPDATE SET estado = 'pendente', atualizado_em = excluded.atualizado_em",
+                linhas,
+            )
+        else:
+            self._executar_varios(
+                "INSERT OR IGNORE INTO tarefas (endpoint, player_id, atualizado_em) VALUES (?, ?, ?)",
+                linhas,
+            )
+
+    def semear(self, endpoint, resultados):
+        """
+        Registra como concluído o que já foi coletado antes da fila existir (ex: CSV ou JSONL antigo)
+
+        Args:
+            endpoint: nome do endpoint
+            resultados: dicionário {player_id: resultado}; resultado pode ser None quando o dado
+                fica em outro arquivo (ex: JSONL das estatísticas)
+        """
+        agora = _agora()
+        linhas = []
+        for pid, resultado in resultados.items():
+            if resultado is not None:
+                resultado = json.dumps(resultado, ensure_ascii=False, default=str)
+            linhas.append((endpoint, int(pid), CONCLUIDO, resultado, agora))
+        self._executar_varios(
+            "INSERT OR IGNORE INTO tarefas (endpoint, player_id, estado, resultado, atualizado_em) "
+            "VALUES (?, ?, ?, ?, ?)",
+            linhas,
+        )
+
+    def remover(self, endpoint, ids):
+        """Tira jogadores da fila (ex: saíram do campeonato)."""
+        self._executar_varios(
+            "DELETE FROM tarefas WHERE endpoint = ? AND player_id = ?",
+            [(endpoint, int(pid)) for pid in ids],
+        )
+
+    def sincronizar_elenco(self, endpoint, ids_elenco, alteracoes):
+        """
+        Ajusta a fila do endpoint ao elenco atual
+
+        Args:
+            endpoint: nome do endpoint
+            ids_elenco: ids de todos os jogadores do CSV do discovery
+            alteracoes: conjunto de mudanças do discovery (diff_elencos) ou None. Com ele, quem
+                mudou de time/posição é revisitado e quem saiu do campeonato deixa a fila.
+        """
+        # Todo o elenco fica na fila; quem já estava não muda de estado
+        self.enfileirar(endpoint, ids_elenco)
+        if alteracoes is not None:
+            # Quem mudou de time/posição é coletado de novo
+            self.enfileirar(endpoint, alteracoes['alterados'], reabrir=True)
+            self.remover(endpoint, alteracoes['saidas'])
+
+        validade = VALIDADE_CONCLUIDAS.get(endpoint)
+        if validade is not None:
+            reabertas = self.reabrir_vencidas(endpoint, validade)
+            if reabertas:
+                print(f"[Fila] {reabertas} tarefas de '{endpoint}' vencidas voltaram para pendente.")
+
+    def reabrir_vencidas(self, endpoint, segundos):
+        """
+        Devolve para pendente as tarefas concluídas há mais de `segundos`
+
+        Returns:
+            int: quantidade de tarefas reabertas
+        """
+        limite = (datetime.now() - timedelta(seconds=segundos)).strftime("%Y-%m-%d %H:%M:%S")
+        cursor = self._executar(
+            "UPDATE tarefas SET estado = 'pendente', atualizado_em = ? "
+            "WHERE endpoint = ? AND estado = 'concluido' AND atualizado_em < ?",
+            (_agora(), endpoint, limite),
+        )
+        return cursor.rowcount
+
+    def reabrir_falhas(self, endpoint):
+        """
+        Devolve para pendente tudo o que falhou no endpoint
+
+        Returns:
+            int: quantidade de tarefas reabertas
+        """
+        cursor = self._executar(
+            "UPDATE tarefas SET estado = 'pendente', atualizado_em = ? WHERE endpoint = ? AND estado = 'falhou'",
+            (_agora(), endpoint),
+        )
+        return cursor.rowcount
+
+    # --- CONSULTA ---
+
+    def pendentes(self, endpoint):
+        """
+        Ids que ainda precisam ser processados. Tarefas 'em andamento' de uma execução
+        que caiu no meio também voltam, já que ninguém mais está trabalhando nelas.
+
+        Returns:
+            set: ids dos jogadores pendentes
+        """
+        cursor = self._executar(
+            "SELECT player_id FROM tarefas WHERE endpoint = ? AND estado IN ('pendente', 'em_andamento')",
+            (endpoint,),
+        )
+        return {linha[0] for linha in cursor.fetchall()}
+
+    def ids(self, endpoint):
+        """
+        Todos os jogadores com tarefa no endpoint, em qualquer estado (quem saiu do campeonato já foi removido)
+
+        Returns:
+            set: ids dos jogadores
+        """
+        cursor = self._executar("SELECT player_id FROM tarefas WHERE endpoint = ?", (endpoint,))
+        return {linha[0] for linha in cursor.fetchall()}
+
+    def esta_vazia(self, endpoint):
+        cursor = self._executar("SELECT 1 FROM tarefas WHERE endpoint = ? LIMIT 1", (endpoint,))
+        return cursor.fetchone() is None
+
+    def resultados(self, endpoint):
+        """
+        Resultados guardados pelas tarefas concluídas do endpoint
+
+        Returns:
+            list: dicionários salvos em concluir(..., resultado=...)
+        """
+        cursor = self._executar(
+            "SELECT resultado FROM tarefas WHERE endpoint = ? AND estado = 'concluido' AND resultado IS NOT NULL "
+            "ORDER BY player_id",
+            (endpoint,),
+        )
+        return [json.loads(linha[0]) for linha in cursor.fetchall()]
+
+    def resumo(self, endpoint):
+        """
+        Contagem de tarefas por estado
+
+        Returns:
+            dict: {estado: quantidade}
+        """
+        cursor = self._executar(
+            "SELECT estado, COUNT(*) FROM tarefas WHERE endpoint = ? GROUP BY estado",
+            (endpoint,),
+        )
+        return dict(cursor.fetchall())
+
+    # --- TRANSIÇÕES DE ESTADO ---
+
+    def iniciar(self, endpoint, player_id):
+        """Marca a tarefa como em andamento e conta mais uma tentativa."""
+        self._executar(
+            "UPDATE tarefas SET estado = 'em_andamento', tentativas = tentativas + 1, atualizado_em = ? "
+            "WHERE endpoint = ? AND player_id = ?",
+            (_agora(), endpoint, int(player_id)),
+        )
+
+    def concluir(self, endpoint, player_id, resultado=None):
+        """
+        Marca a tarefa como concluída
+
+        Args:
+            endpoint: nome do endpoint
+            player_id: id do jogador
+            resultado: dicionário opcional com o dado processado (guardado como JSON)
+        """
+        if resultado is not None:
+            resultado = json.dumps(resultado, ensure_ascii=False, default=str)
+        self._executar(
+            "UPDATE tarefas SET estado = 'concluido', resultado = ?, ultimo_erro = NULL, atualizado_em = ? "
+            "WHERE endpoint = ? AND player_id = ?",
+            (resultado, _agora(), endpoint, int(player_id)),
+        )
+
+    def falhar(self, endpoint, player_id, erro):
+        """Marca a tarefa como falha, guardando a mensagem para reprocessar depois."""
+        self._executar(
+            "UPDATE tarefas SET estado = 'falhou', ultimo_erro = ?, atualizado_em = ? "
+            "WHERE endpoint = ? AND player_id = ?",
+            (str(erro), _agora(), endpoint, int(player_id)),
+        )
+
+    def devolver(self, endpoint, player_id):
+        """Volta a tarefa para pendente sem contar como falha (ex: bloqueio 403, interrupção)."""
+        self._executar(
+            "UPDATE tarefas SET estado = 'pendente', atualizado_em = ? WHERE endpoint = ? AND player_id = ?",
+            (_agora(), endpoint, int(player_id)),
+        )
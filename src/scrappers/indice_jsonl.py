@@ -0,0 +1,188 @@
+import json
+import os
+import struct
+import zlib
+
+# Cada entrada do índice: player_id (int64), offset (uint64), tamanho (uint32), crc32 (uint32)
+FORMATO_ENTRADA = struct.Struct('<qQII')
+EXTENSAO_INDICE = '.idx'
+
+
+def caminho_indice(caminho_jsonl):
+    """O índice fica ao lado do JSONL, com a extensão .idx."""
+    return caminho_jsonl + EXTENSAO_INDICE
+
+
+def _cortar_linha_rasgada(caminho_jsonl):
+    """
+    Se o JSONL não termina em '\\n', a última linha foi cortada no meio de uma escrita (queda).
+    Trunca o arquivo no fim da última linha completa.
+
+    Returns:
+        int: tamanho final do arquivo
+    """
+    if not os.path.exists(caminho_jsonl):
+        return 0
+
+    with open(caminho_jsonl, 'r+b') as f:
+        f.seek(0, os.SEEK_END)
+        tamanho = f.tell()
+        if tamanho == 0:
+            return 0
+
+        f.seek(tamanho - 1)
+        if f.read(1) == b'\n':
+            return tamanho
+
+        # Procura o último '\n' lendo de trás para frente em blocos
+        posicao = tamanho
+        corte = 0
+        while posicao > 0:
+            inicio = max(0, posicao - 64 * 1024)
+            f.seek(inicio)
+            bloco = f.read(posicao - inicio)
+            indice = bloco.rfind(b'\n')
+            if indice != -1:
+                corte = inicio + indice + 1
+                break
+            posicao = inicio
+
+        print(f"Aviso: última linha do JSONL estava incompleta ({tamanho - corte} bytes). Arquivo truncado.")
+        f.truncate(corte)
+        return corte
+
+
+class IndiceJsonl:
+    """
+    Índice append-only de um JSONL: player_id -> (offset, tamanho, crc32) de cada linha.
+
+    Permite saber quem já foi coletado e ler o payload bruto de um jogador sem decodificar
+    o arquivo inteiro. Ao abrir, corrige linhas rasgadas por queda e indexa só a cauda
+    que ainda não estava no índice.
+    """
+
+    def __init__(self, caminho_jsonl):
+        self.caminho_jsonl = caminho_jsonl
+        self.caminho_indice = caminho_indice(caminho_jsonl)
+        self.entradas = {}   # player_id -> (offset, tamanho, crc32) da linha mais recente
+        self._fim_indexado = 0
+        self._arquivo_jsonl = None
+        self._arquivo_indice = None
+        self._carregar()
+
+    # --- ABERTURA / REPARO ---
+
+    def _carregar(self):
+        tamanho_jsonl = _cortar_linha_rasgada(self.caminho_jsonl)
+
+        if os.path.exists(self.caminho_indice):
+            with open(self.caminho_indice, 'r+b') as f:
+                dados = f.read()
+                # Entrada do índice cortada no meio também é descartada
+                validos = len(dados) - len(dados) % FORMATO_ENTRADA.size
+                corte = 0
+                for posicao in range(0, validos, FORMATO_ENTRADA.size):
+                    player_id, offset, tamanho, crc = FORMATO_ENTRADA.unpack_from(dados, posicao)
+                    # Entradas que apontam para além do JSONL (linha truncada acima) são descartadas
+                    if offset + tamanho > tamanho_jsonl:
+                        break
+                    self.entradas[player_id] = (offset, tamanho, crc)
+                    self._fim_indexado = max(self._fim_indexado, offset + tamanho)
+                    corte = posicao + FORMATO_ENTRADA.size
+                if corte != len(dados):
+                    f.truncate(corte)
+
+        # Linhas gravadas no JSONL mas não no índice (queda entre as duas escritas, ou JSONL antigo sem índice)
+        if self._fim_indexado < tamanho_jsonl:
+            self._indexar_cauda()
+
+    def _indexar_cauda(self):
+        novas = 0
+        with open(self.caminho_jsonl, 'rb') as f_jsonl, open(self.caminho_indice, 'ab') as f_indice:
+            f_jsonl.seek(self._fim_indexado)
+            offset = self._fim_indexado
+            for linha in f_jsonl:
+                tamanho = len(linha)
+                try:
+                    player_id = int(json.loads(linha)['player_id'])
+                except (ValueError, KeyError, TypeError):
+                    print(f"Aviso: linha corrompida no offset {offset} do JSONL não foi indexada.")
+                    offset += tamanho
+                    continue
+
+                crc = zlib.crc32(linha)
+                f_indice.write(FORMATO_ENTRADA.pack(player_id, offset, tamanho, crc))
+                self.entradas[player_id] = (offset, tamanho, crc)
+                offset += tamanho
+                novas += 1
+            self._fim_indexado = offset
+        if novas:
+            print(f"Índice: {novas} linhas indexadas a partir do JSONL.")
+
+    # --- CONSULTA ---
+
+    def ids(self):
+        """Ids de todos os jogadores presentes no JSONL."""
+        return set(self.entradas)
+
+    def __contains__(self, player_id):
+        return int(player_id) in self.entradas
+
+    def ler(self, player_id):
+        """
+        Lê o payload bruto de um jogador direto do offset guardado
+
+        Args:
+            player_id: id do jogador
+
+        Returns:
+            dict: registro do jogador (a linha mais recente, se ele foi recoletado)
+            None: jogador não está no JSONL
+
+        Raises:
+            ValueError: o checksum não bate (a linha foi alterada/corrompida depois de indexada)
+        """
+        entrada = self.entradas.get(int(player_id))
+        if entrada is None:
+            return None
+        offset, tamanho, crc = entrada
+        with open(self.caminho_jsonl, 'rb') as f:
+            f.seek(offset)
+            linha = f.read(tamanho)
+        if zlib.crc32(linha) != crc:
+            raise ValueError(f"Checksum inválido para o jogador {player_id} no offset {offset}")
+        return json.loads(linha)
+
+    # --- ESCRITA ---
+
+    def anexar(self, registro):
+        """
+        Grava o registro no fim do JSONL e a entrada correspondente no índice
+
+        Args:
+            registro: dicionário com pelo menos a chave 'player_id'
+        """
+        if self._arquivo_jsonl is None:
+            self._arquivo_jsonl = open(self.caminho_jsonl, 'ab')
+            self._arquivo_indice = open(self.caminho_indice, 'ab')
+
+        linha = (json.dumps(registro, ensure_ascii=False) + '\n').encode('utf-8')
+        offset = self._arquivo_jsonl.seek(0, os.SEEK_END)
+        self._arquivo_jsonl.write(linha)
+        self._arquivo_jsonl.flush()
+
+        # O índice é escrito depois do dado: se cair entre os dois, a cauda é reindexada na abertura
+        player_id = int(registro['player_id'])
+        crc = zlib.crc32(linha)
+        self._arquivo_indice.write(FORMATO_ENTRADA.pack(player_id, offset, len(linha), crc))
+        self._arquivo_indice.flush()
+
+        self.entradas[player_id] = (offset, len(linha), crc)
+        self._fim_indexado = offset + len(linha)
+
+    def fechar(self):
+        if self._arquivo_jsonl is not None:
+            self._arquivo_jsonl.close()
+            self._arquivo_indice.close()
+            self._arquivo_jsonl = None
+            self._arquivo_indice = None
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+
+# --- CONFIGURAÇÃO DO LIMITADOR (AIMD) ---
+TAXA_INICIAL = 0.5        # requisições por segundo no início da execução
+TAXA_MINIMA = 0.1         # nunca desce abaixo disso (1 requisição a cada 10s)
+TAXA_MAXIMA = 4.0         # teto de segurança, mesmo que o servidor aceite mais
+INCREMENTO = 0.05         # aumento aditivo a cada resposta 200
+FATOR_REDUCAO = 0.5       # redução multiplicativa em 429/5xx/falha de conexão
+CAPACIDADE = 2.0          # tamanho do balde: quantas requisições podem sair em rajada
+PAUSA_403 = 60            # segundos de "geladeira" depois de um 403 antes de tentar de novo
+
+STATUS_SOBRECARGA = [429, 500, 502, 503, 504]
+
+
+class LimitadorAIMD:
+    """
+    Balde de fichas (token bucket) cuja taxa se adapta às respostas do servidor.
+
+    - Resposta 200/304: aumento aditivo da taxa (+INCREMENTO req/s).
+    - 429 / 5xx / erro de conexão: redução multiplicativa (x FATOR_REDUCAO).
+    - Retry-After: ninguém sai antes do horário pedido pelo servidor.
+    - 403: a taxa vai para o mínimo e todo mundo espera PAUSA_403 segundos.
+
+    A mesma instância é usada pelas chamadas síncronas (threads) e assíncronas,
+    então o ritmo contra o Sofascore é único para o processo inteiro.
+    """
+
+    def __init__(self, taxa_inicial=TAXA_INICIAL, taxa_minima=TAXA_MINIMA, taxa_maxima=TAXA_MAXIMA,
+                 incremento=INCREMENTO, fator_reducao=FATOR_REDUCAO, capacidade=CAPACIDADE):
+        self.taxa = taxa_inicial
+        self.taxa_minima = taxa_minima
+        self.taxa_maxima = taxa_maxima
+        self.incremento = incremento
+        self.fator_reducao = fator_reducao
+        self.capacidade = capacidade
+
+        self._fichas = 1.0
+        self._ultima_recarga = time.monotonic()
+        self._pausado_ate = 0.0
+        self._trava = threading.Lock()
+
+    def _reservar(self):
+        """Reserva uma ficha e devolve quantos segundos o chamador deve esperar."""
+        with self._trava:
+            agora = time.monotonic()
+            # Durante uma pausa o balde não recarrega: a contagem recomeça quando ela termina
+            referencia = max(agora, self._pausado_ate)
+            if referencia > self._ultima_recarga:
+                self._fichas = min(self.capacidade, self._fichas + (referencia - self._ultima_recarga) * self.taxa)
+                self._ultima_recarga = referencia
+
+            # Fichas negativas = fila de quem já reservou e ainda está esperando
+            self._fichas -= 1
+            espera = 0.0
+            if self._fichas < 0:
+                espera = -self._fichas / self.taxa
+
+            return (referencia - agora) + espera
+
+    def aguardar(self):
+        """Bloqueia a thread atual até a próxima ficha disponível."""
+        espera = self._reservar()
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+    async def aguardar_async(self):
+        """Versão assíncrona do aguardar (não bloqueia o loop)."""
+        espera = self._reservar()
+        if espera > 0:
+            await asyncio.sleep(espera)
+        return espera
+
+    def _pausar(self, segundos):
+        """
+        Ninguém sai antes de agora + segundos, e depois saem um a um (1/taxa), não em rajada
+
+        O balde é esvaziado e só volta a encher no fim da pausa. Reservas já feitas (fichas
+        negativas) continuam na fila, na frente de quem reservar durante a pausa.
+        """
+        self._pausado_ate = max(self._pausado_ate, time.monotonic() + segundos)
+        self._fichas = min(self._fichas, 0.0)
+        self._ultima_recarga = max(self._ultima_recarga, self._pausado_ate)
+
+    def registrar_resposta(self, status_code, retry_after=None):
+        """
+        Ajusta a taxa de acordo com a resposta recebida
+
+        Args:
+            status_code: status HTTP da resposta
+            retry_after: valor do cabeçalho Retry-After (segundos ou HTTP-date), se o servidor enviou
+        """
+        with self._trava:
+            if status_code in (200, 304):
+                self.taxa = min(self.taxa_maxima, self.taxa + self.incremento)
+            elif status_code == 403:
+                self.taxa = self.taxa_minima
+                self._pausar(PAUSA_403)
+            elif status_code in STATUS_SOBRECARGA:
+                self.taxa = max(self.taxa_minima, self.taxa * self.fator_reducao)
+
+            segundos = converter_retry_after(retry_after)
+            if segundos:
+                self._pausar(segundos)
+
+    def dividir_orcamento(self, partes):
+        """
+        Reparte o orçamento de requisições entre vários processos
+
+        Cada processo tem o seu LIMITADOR; quando N processos batem no mesmo servidor
+        (ex: colheita de várias competições), cada um fica com 1/N das taxas.
+
+        Args:
+            partes: número de processos que vão dividir o orçamento
+        """
+        with self._trava:
+            self.taxa = self.taxa / partes
+            self.taxa_minima = self.taxa_minima / partes
+            self.taxa_maxima = self.taxa_maxima / partes
+            self.incremento = self.incremento / partes
+
+    def registrar_falha_conexao(self):
+        """Erro de rede conta como sinal de sobrecarga."""
+        with self._trava:
+            self.taxa = max(self.taxa_minima, self.taxa * self.fator_reducao)
+
+
+def converter_retry_after(valor, agora=None):
+    """
+    Converte o cabeçalho Retry-After em segundos
+
+    Args:
+        valor: conteúdo do cabeçalho, em segundos (ex: "30") ou HTTP-date
+            (ex: "Wed, 21 Oct 2026 07:28:00 GMT"), ou None
+        agora: horário de referência (epoch); padrão é time.time()
+
+    Returns:
+        float: segundos de espera pedidos pelo servidor (0 se ausente, inválido ou já passado)
+    """
+    if not valor:
+        return 0
+    try:
+        return max(0.0, float(valor))
+    except (TypeError, ValueError):
+        pass
+
+    try:
+        horario = parsedate_to_datetime(str(valor))
+    except (TypeError, ValueError, IndexError):
+        return 0
+    if horario.tzinfo is None:
+        # HTTP-date é sempre GMT; o "-0000" sai sem fuso no parsedate_to_datetime
+        horario = horario.replace(tzinfo=timezone.utc)
+    agora = time.time() if agora is None else agora
+    return max(0.0, horario.timestamp() - agora)
+
+
+# Instância única do processo: todos os faz_requisicao usam o mesmo ritmo
+LIMITADOR = LimitadorAIMD()
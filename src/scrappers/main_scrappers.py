@@ -1,14 +1,47 @@
 from modulo_discovery import modulo_discovery
-from modulo_extraction import modulo_extracao
-from especificador_de_posicoes import especificador_posicoes
-import time
-
-print('Começando a Raspagem dos dados do Sofascore')
-time.sleep(5)
-modulo_discovery()
-time.sleep(5)
-modulo_extracao()
-time.sleep(10)
-especificador_posicoes()
-time.sleep(10)
-print('Fim')
\ No newline at end of file
+from modulo_coleta_jogadores import modulo_coleta_jogadores
+from modulo_partidas import modulo_partidas, ARQUIVO_FORMA
+from conversor_jsonl import ARQUIVO_CSV_FINAL
+from fila_trabalho import FilaTrabalho, VALIDADE_CONCLUIDAS
+from orquestrador import Estagio, executar_grafo
+
+# --- ARQUIVOS TROCADOS ENTRE OS ESTÁGIOS ---
+PASTA_PROJETO = 'caminho'
+ARQUIVO_JOGADORES = f'{PASTA_PROJETO}/jogadores_brasileirao_2025.csv'
+ARQUIVO_POSICOES = f'{PASTA_PROJETO}/jogadores_posicoes_detalhadas.csv'
+
+
+def fila_tem_pendencias(endpoint):
+    """Cria a verificação de pendências de um estágio que usa a fila de trabalho."""
+    def verificar():
+        fila = FilaTrabalho()
+        try:
+            return bool(fila.pendentes(endpoint))
+        finally:
+            fila.fechar()
+    return verificar
+
+
+def filas_tem_pendencias(*endpoints):
+    """Cria a verificação de pendências de um estágio que alimenta várias filas."""
+    verificacoes = [fila_tem_pendencias(endpoint) for endpoint in endpoints]
+    return lambda: any(verificar() for verificar in verificacoes)
+
+
+# Estatísticas e características saem numa única visita por jogador (modulo_coleta_jogadores);
+# modulo_extracao e especificador_posicoes continuam disponíveis para rodar cada endpoint sozinho
+ESTAGIOS = [
+    Estagio('discovery', modulo_discovery, saidas=[ARQUIVO_JOGADORES]),
+    Estagio('coleta_jogadores', modulo_coleta_jogadores,
+            entradas=[ARQUIVO_JOGADORES], saidas=[ARQUIVO_CSV_FINAL, ARQUIVO_POSICOES],
+            depende_de=['discovery'], tem_pendencias=filas_tem_pendencias('estatisticas', 'caracteristicas'),
+            # Elenco igual não quer dizer estatísticas iguais: os totais da temporada mudam a cada rodada
+            validade=VALIDADE_CONCLUIDAS['estatisticas']),
+    # Independente do elenco: só busca as rodadas que ainda não estão gravadas (sem entradas = nunca é pulado)
+    Estagio('partidas', modulo_partidas, saidas=[ARQUIVO_FORMA]),
+]
+
+if __name__ == "__main__":
+    print('Começando a Raspagem dos dados do Sofascore')
+    executar_grafo(ESTAGIOS)
+    print('Fim')
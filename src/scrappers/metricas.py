@@ -0,0 +1,240 @@
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from limitador_taxa import LIMITADOR
+
+# --- CONFIGURAÇÃO ---
+# O arquivo .prom vai para a pasta lida pelo textfile collector do node_exporter
+PASTA_METRICAS = 'caminho/metricas'
+NOME_PADRAO = 'scrapers'
+INTERVALO_EXPORTACAO = 15  # segundos entre gravações durante a execução
+
+# Limites (em segundos) dos baldes do histograma de latência
+BALDES_LATENCIA = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+# Endpoint de cada url (mesmos padrões do cache_http); o resto conta como 'outro'
+ENDPOINTS = [
+    ('standings', re.compile(r'/standings/')),
+    ('elenco', re.compile(r'/team/\d+/players')),
+    ('caracteristicas', re.compile(r'/characteristics')),
+    ('estatisticas', re.compile(r'/statistics/overall')),
+]
+
+
+def endpoint_da_url(url):
+    for nome, padrao in ENDPOINTS:
+        if padrao.search(url):
+            return nome
+    return 'outro'
+
+
+def _rotulos(**rotulos):
+    return '{' + ','.join(f'{chave}="{valor}"' for chave, valor in rotulos.items()) + '}'
+
+
+def _gravar_atomico(caminho, conteudo):
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        f.write(conteudo)
+    os.replace(temporario, caminho)
+
+
+class Metricas:
+    """
+    Contadores e histogramas do caminho de requisições, com exportação periódica.
+
+    Tudo fica em memória (dicionários protegidos por uma trava); uma thread em segundo plano
+    grava a cada INTERVALO_EXPORTACAO segundos um arquivo Prometheus (.prom) e um resumo JSON,
+    para acompanhar uma execução enquanto ela ainda está rodando.
+    """
+
+    def __init__(self, pasta=PASTA_METRICAS, nome=NOME_PADRAO, intervalo=INTERVALO_EXPORTACAO):
+        self.pasta = pasta
+        self.nome = nome
+        self.intervalo = intervalo
+        self._trava = threading.Lock()
+        self._exportador = None
+        self.zerar()
+
+    def zerar(self):
+        self.inicio = time.time()
+        self.requisicoes = {}     # (endpoint, status) -> nº de respostas
+        self.baldes = {}          # endpoint -> contagem por balde (+ o último, +Inf)
+        self.soma_latencia = {}   # endpoint -> soma das latências
+        self.bytes = {}           # endpoint -> bytes baixados
+        self.tentativas = {}      # nº da tentativa (1, 2, ...) -> requisições feitas nela
+        self.cache = {}           # endpoint -> respostas servidas pelo cache (sem rede)
+        self.espera_segundos = 0.0
+        self.itens = {}           # estágio -> itens concluídos
+        self.inicio_estagio = {}  # estágio -> instante do primeiro item
+
+    def configurar(self, pasta=None, nome=None):
+        """Muda o destino dos arquivos (ex: um nome por partição na colheita)."""
+        with self._trava:
+            if pasta is not None:
+                self.pasta = pasta
+            if nome is not None:
+                self.nome = nome
+
+    # --- REGISTRO ---
+
+    def registrar_requisicao(self, url, status, segundos, tamanho, tentativa):
+        """
+        Registra uma ida à rede
+
+        Args:
+            url: url da requisição
+            status: status HTTP ou 'erro_conexao'
+            segundos: latência da requisição
+            tamanho: bytes do corpo da resposta
+            tentativa: nº da tentativa dentro da chamada (1 = primeira)
+        """
+        endpoint = endpoint_da_url(url)
+        with self._trava:
+            chave = (endpoint, str(status))
+            self.requisicoes[chave] = self.requisicoes.get(chave, 0) + 1
+            self.tentativas[tentativa] = self.tentativas.get(tentativa, 0) + 1
+            self.bytes[endpoint] = self.bytes.get(endpoint, 0) + tamanho
+            self.soma_latencia[endpoint] = self.soma_latencia.get(endpoint, 0.0) + segundos
+            baldes = self.baldes.setdefault(endpoint, [0] * (len(BALDES_LATENCIA) + 1))
+            for posicao, limite in enumerate(BALDES_LATENCIA):
+                if segundos <= limite:
+                    baldes[posicao] += 1
+                    break
+            else:
+                baldes[-1] += 1
+        self._garantir_exportador()
+
+    def registrar_cache(self, url):
+        endpoint = endpoint_da_url(url)
+        with self._trava:
+            self.cache[endpoint] = self.cache.get(endpoint, 0) + 1
+
+    def registrar_espera(self, segundos):
+        """Tempo parado no limitador de taxa (politeness)."""
+        if segundos > 0:
+            with self._trava:
+                self.espera_segundos += segundos
+
+    def registrar_itens(self, estagio, quantidade=1):
+        """Itens concluídos por um estágio (ex: jogadores gravados no JSONL)."""
+        with self._trava:
+            self.inicio_estagio.setdefault(estagio, time.time())
+            self.itens[estagio] = self.itens.get(estagio, 0) + quantidade
+        self._garantir_exportador()
+
+    # --- EXPORTAÇÃO ---
+
+    def _itens_por_segundo(self, agora):
+        taxas = {}
+        for estagio, quantidade in self.itens.items():
+            decorrido = agora - self.inicio_estagio[estagio]
+            taxas[estagio] = round(quantidade / decorrido, 3) if decorrido > 0 else 0.0
+        return taxas
+
+    def resumo(self):
+        """
+        Retrato atual das métricas
+
+        Returns:
+            dict: contagens por endpoint/status, latência média, bytes, espera e itens/s
+        """
+        agora = time.time()
+        with self._trava:
+            por_endpoint = {}
+            for (endpoint, status), quantidade in self.requisicoes.items():
+                linha = por_endpoint.setdefault(endpoint, {'status': {}, 'bytes': self.bytes.get(endpoint, 0),
+                                                           'cache': self.cache.get(endpoint, 0)})
+                linha['status'][status] = quantidade
+            for endpoint, linha in por_endpoint.items():
+                total = sum(self.baldes[endpoint])
+                linha['latencia_media_ms'] = round(self.soma_latencia[endpoint] / total * 1000, 1)
+            return {
+                'atualizado_em': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'segundos_execucao': round(agora - self.inicio, 1),
+                'endpoints': por_endpoint,
+                'tentativas': {str(k): v for k, v in sorted(self.tentativas.items())},
+                'espera_limitador_segundos': round(self.espera_segundos, 1),
+                'taxa_limitador': round(LIMITADOR.taxa, 3),
+                'itens': dict(self.itens),
+                'itens_por_segundo': self._itens_por_segundo(agora),
+            }
+
+    def texto_prometheus(self):
+        """Métricas no formato de texto do Prometheus."""
+        agora = time.time()
+        linhas = []
+        with self._trava:
+            linhas.append('# TYPE scraper_requisicoes_total counter')
+            for (endpoint, status), quantidade in sorted(self.requisicoes.items()):
+                linhas.append(f'scraper_requisicoes_total{_rotulos(endpoint=endpoint, status=status)} {quantidade}')
+
+            linhas.append('# TYPE scraper_latencia_segundos histogram')
+            for endpoint, baldes in sorted(self.baldes.items()):
+                acumulado = 0
+                for limite, quantidade in zip(BALDES_LATENCIA + ['+Inf'], baldes):
+                    acumulado += quantidade
+                    linhas.append(f'scraper_latencia_segundos_bucket{_rotulos(endpoint=endpoint, le=limite)} {acumulado}')
+                linhas.append(f'scraper_latencia_segundos_sum{_rotulos(endpoint=endpoint)} {self.soma_latencia[endpoint]:.6f}')
+                linhas.append(f'scraper_latencia_segundos_count{_rotulos(endpoint=endpoint)} {acumulado}')
+
+            linhas.append('# TYPE scraper_tentativas_total counter')
+            for tentativa, quantidade in sorted(self.tentativas.items()):
+                linhas.append(f'scraper_tentativas_total{_rotulos(tentativa=tentativa)} {quantidade}')
+
+            linhas.append('# TYPE scraper_bytes_total counter')
+            for endpoint, quantidade in sorted(self.bytes.items()):
+                linhas.append(f'scraper_bytes_total{_rotulos(endpoint=endpoint)} {quantidade}')
+
+            linhas.append('# TYPE scraper_cache_total counter')
+            for endpoint, quantidade in sorted(self.cache.items()):
+                linhas.append(f'scraper_cache_total{_rotulos(endpoint=endpoint)} {quantidade}')
+
+            linhas.append('# TYPE scraper_espera_limitador_segundos_total counter')
+            linhas.append(f'scraper_espera_limitador_segundos_total {self.espera_segundos:.3f}')
+            linhas.append('# TYPE scraper_taxa_limitador gauge')
+            linhas.append(f'scraper_taxa_limitador {LIMITADOR.taxa:.4f}')
+
+            linhas.append('# TYPE scraper_itens_total counter')
+            for estagio, quantidade in sorted(self.itens.items()):
+                linhas.append(f'scraper_itens_total{_rotulos(estagio=estagio)} {quantidade}')
+            linhas.append('# TYPE scraper_itens_por_segundo gauge')
+            for estagio, taxa in sorted(self._itens_por_segundo(agora).items()):
+                linhas.append(f'scraper_itens_por_segundo{_rotulos(estagio=estagio)} {taxa}')
+
+            linhas.append('# TYPE scraper_ultima_exportacao_timestamp gauge')
+            linhas.append(f'scraper_ultima_exportacao_timestamp {agora:.0f}')
+        return '\n'.join(linhas) + '\n'
+
+    def exportar(self):
+        """Grava o .prom e o resumo JSON (escrita atômica: o coletor nunca lê arquivo pela metade)."""
+        try:
+            _gravar_atomico(os.path.join(self.pasta, f'{self.nome}.prom'), self.texto_prometheus())
+            _gravar_atomico(os.path.join(self.pasta, f'{self.nome}.json'),
+                            json.dumps(self.resumo(), ensure_ascii=False, indent=2))
+        except OSError as e:
+            print(f"[Métricas] Erro ao exportar: {e}")
+
+    def _garantir_exportador(self):
+        if self._exportador is not None:
+            return
+        with self._trava:
+            if self._exportador is not None:
+                return
+            self._exportador = threading.Thread(target=self._laco_exportacao, daemon=True)
+            self._exportador.start()
+        atexit.register(self.exportar)
+
+    def _laco_exportacao(self):
+        while True:
+            time.sleep(self.intervalo)
+            self.exportar()
+
+
+# Instância única do processo, usada pelo cliente_http e pelos estágios
+METRICAS = Metricas()
@@ -0,0 +1,212 @@
+def modulo_coleta_jogadores(reprocessar_falhas=False, id_torneio=325, id_season=72034):
+    """
+    Coleta estatísticas e características táticas numa única passada pelo elenco
+
+    Cada jogador é visitado uma vez: os endpoints ainda pendentes dele saem em sequência
+    pelo mesmo trabalhador (mesma conexão, mesmo referer, mesmo LIMITADOR) e cada resposta
+    vai para o seu destino (JSONL das estatísticas ou resultado tático na fila). Substitui
+    rodar modulo_extracao e especificador_posicoes em duas passadas separadas.
+
+    Args:
+        reprocessar_falhas: se True, as tarefas que falharam antes voltam para as filas
+        id_torneio: id do torneio no Sofascore (325 = Brasileirão Série A)
+        id_season: id da temporada no Sofascore (72034 = 2025)
+    """
+    import pandas as pd
+    import time
+    from datetime import datetime
+    from conectar_google_api import salvar_dataframe
+    from conversor_jsonl import processar_conversao, ARQUIVO_JSONL
+    from motor_assincrono import executar_coleta
+    from cliente_http import URL_API, url_perfil_jogador
+    from metricas import METRICAS
+    from diff_elencos import carregar_alteracoes
+    from fila_trabalho import FilaTrabalho
+    from indice_jsonl import IndiceJsonl
+    from especificador_de_posicoes import montar_item_tatico, salvar_caracteristicas, semear_caracteristicas
+
+    # --- CONFIGURAÇÃO ---
+    PASTA_PROJETO = 'caminho'
+    ARQUIVO_ENTRADA = f'{PASTA_PROJETO}/jogadores_brasileirao_2025.csv'
+    ARQUIVO_POSICOES = f'{PASTA_PROJETO}/jogadores_posicoes_detalhadas.csv'
+    SPREADSHEET_ID = "id"
+    MAX_EM_VOO = 4
+
+    # Endpoints coletados em cada visita: nome na fila -> url do jogador.
+    # Um endpoint novo entra aqui e no tratamento do ao_receber, sem outra passada pelo elenco.
+    ENDPOINTS = {
+        'estatisticas': lambda pid: f"{URL_API}/player/{pid}/unique-tournament/{id_torneio}/season/{id_season}/statistics/overall",
+        'caracteristicas': lambda pid: f"{URL_API}/player/{pid}/characteristics",
+    }
+
+    # --- SISTEMA DE LOGS ---
+    lista_erros = []
+
+    def registrar_erro(tipo, mensagem, alvo):
+        """
+        Padroniza o registro de erros
+
+        Args:
+            tipo (str): tipo do erro.
+            mensagem (str): mensagem do erro.
+            alvo (str, opcional): alvo do erro. Por padrão pode ser "N/A".
+        """
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        print(f"⚠️ [{tipo}] {alvo}: {mensagem}")
+        lista_erros.append({
+            "Data_Hora": timestamp,
+            "Script": "Coleta por Jogador",
+            "Contexto": tipo,
+            "Alvo": alvo,
+            "Mensagem": str(mensagem)
+        })
+
+    # --- 1. CARREGAR OS JOGADORES E AS FILAS ---
+    print(f"Lendo {ARQUIVO_ENTRADA}...")
+    try:
+        df_jogadores = pd.read_csv(ARQUIVO_ENTRADA, sep=';')
+    except FileNotFoundError:
+        print("Erro: CSV de entrada não encontrado. Rode o discovery antes.")
+        exit()
+
+    fila = FilaTrabalho()
+    indice = IndiceJsonl(ARQUIVO_JSONL)
+
+    # Primeira execução com a fila: aproveita o que já está no JSONL e no CSV tático (uma única vez)
+    if fila.esta_vazia('estatisticas') and indice.ids():
+        fila.semear('estatisticas', dict.fromkeys(indice.ids()))
+    semear_caracteristicas(fila, ARQUIVO_POSICOES, 'caracteristicas')
+
+    alteracoes = carregar_alteracoes()
+    pendentes = {}
+    for endpoint in ENDPOINTS:
+        fila.sincronizar_elenco(endpoint, df_jogadores['id'].tolist(), alteracoes)
+        if reprocessar_falhas:
+            print(f"Reabrindo {fila.reabrir_falhas(endpoint)} tarefas de '{endpoint}' que falharam antes.")
+        pendentes[endpoint] = fila.pendentes(endpoint)
+        print(f"'{endpoint}': {fila.resumo(endpoint)}")
+
+    # --- 2. UMA TAREFA POR JOGADOR, SÓ COM OS ENDPOINTS PENDENTES DELE ---
+    tarefas = []
+    for index, row in df_jogadores.iterrows():
+        player_id = int(row['id'])
+        requisicoes = {}
+        for endpoint, montar_url in ENDPOINTS.items():
+            if player_id in pendentes[endpoint]:
+                requisicoes[endpoint] = montar_url(player_id)
+        if not requisicoes:
+            continue
+
+        tarefas.append({
+            'requisicoes': requisicoes,
+            'referer': url_perfil_jogador(row['slug'], player_id),
+            'contexto': f"[{index + 1}/{len(df_jogadores)}] {row['name']}",
+            'player_id': player_id,
+            'player_name': row['name'],
+            'team_id': row['time_id'],
+        })
+
+    print(f"{len(tarefas)} jogadores para visitar ({MAX_EM_VOO} simultâneos).")
+
+    # --- 3. DESTINOS DE CADA ENDPOINT ---
+    def guardar_estatisticas(tarefa, data):
+        stats = data.get('statistics', {})
+        stats['player_id'] = tarefa['player_id']
+        stats['player_name'] = tarefa['player_name']
+        stats['team_id'] = tarefa['team_id']
+        indice.anexar(stats)
+        fila.concluir('estatisticas', tarefa['player_id'])
+
+    def guardar_caracteristicas(tarefa, data):
+        item = montar_item_tatico(tarefa['player_id'], tarefa['player_name'], data)
+        fila.concluir('caracteristicas', tarefa['player_id'], resultado=item)
+
+    DESTINOS = {'estatisticas': guardar_estatisticas, 'caracteristicas': guardar_caracteristicas}
+
+    def ao_iniciar(tarefa):
+        for endpoint in tarefa['requisicoes']:
+            fila.iniciar(endpoint, tarefa['player_id'])
+
+    def ao_receber(tarefa, respostas):
+        """
+        Encaminha cada resposta do jogador para o destino do endpoint
+
+        Returns:
+            False: bloqueio 403 detectado, o motor para de iniciar visitas
+            None: segue a coleta normalmente
+        """
+        player_id = tarefa['player_id']
+        player_name = tarefa['player_name']
+        bloqueado = False
+        falhas = []  # endpoints que foram para fila.falhar nesta visita
+
+        for endpoint in tarefa['requisicoes']:
+            resp = respostas.get(endpoint)
+
+            # Visita interrompida por um 403 num endpoint anterior
+            if endpoint not in respostas or bloqueado:
+                fila.devolver(endpoint, player_id)
+                continue
+
+            if resp is None:
+                registrar_erro("Conexão", f"Falha de conexão após 5 tentativas ({endpoint})", player_name)
+                fila.falhar(endpoint, player_id, "Falha de conexão")
+                falhas.append(endpoint)
+            elif resp.status_code == 200:
+                try:
+                    DESTINOS[endpoint](tarefa, resp.json())
+                    METRICAS.registrar_itens(endpoint)
+                except Exception as e:
+                    registrar_erro("Parse JSON", f"Erro ao ler JSON ({endpoint}): {e}", player_name)
+                    fila.falhar(endpoint, player_id, f"Parse JSON: {e}")
+                    falhas.append(endpoint)
+            elif resp.status_code == 404:
+                # Sem dados não é falha: táticas entram vazias, estatísticas simplesmente não existem
+                if endpoint == 'caracteristicas':
+                    guardar_caracteristicas(tarefa, None)
+                else:
+                    fila.concluir(endpoint, player_id)
+            elif resp.status_code == 403:
+                registrar_erro("FATAL", "ERRO 403: Bloqueio detectado! Pare e troque o Cookie.", player_name)
+                fila.devolver(endpoint, player_id)
+                bloqueado = True
+            else:
+                registrar_erro("HTTP Error", f"Status {resp.status_code} ({endpoint})", player_name)
+                fila.falhar(endpoint, player_id, f"Status {resp.status_code}")
+                falhas.append(endpoint)
+
+        if bloqueado:
+            situacao = 'Bloqueado'
+        elif falhas:
+            situacao = f"Falha ({', '.join(falhas)})"
+        else:
+            situacao = 'Ok'
+        print(f"{tarefa['contexto']} {situacao}")
+        if bloqueado:
+            return False
+
+    try:
+        executar_coleta(tarefas, ao_receber, max_em_voo=MAX_EM_VOO, ao_iniciar=ao_iniciar)
+    except KeyboardInterrupt:
+        print("\nInterrompido pelo usuário.")
+    finally:
+        # --- 4. CADA DESTINO FECHA A SUA SAÍDA ---
+        indice.fechar()
+        print("\nProcessando conversão final...")
+        try:
+            processar_conversao(ids_validos=fila.ids('estatisticas') or None)
+        except Exception as e:
+            print(f"Erro na conversão automática: {e}")
+
+        for endpoint in ENDPOINTS:
+            print(f"Situação da fila '{endpoint}': {fila.resumo(endpoint)}")
+        dados_taticos = fila.resultados('caracteristicas')
+        fila.fechar()
+        # Os erros vão num log só (abaixo), com os dos dois endpoints
+        salvar_caracteristicas(dados_taticos, [], ARQUIVO_POSICOES, SPREADSHEET_ID)
+
+        time.sleep(5)
+        if lista_erros and salvar_dataframe:
+            print("\nEnviando relatório de erros para o Google Sheets...")
+            salvar_dataframe(pd.DataFrame(lista_erros), SPREADSHEET_ID, "Log_Erros_Coleta_Jogadores")
+        print("Script finalizado.")
@@ -1,29 +1,37 @@
-def modulo_discovery():
+def modulo_discovery(id_torneio=325, id_season=72034, pasta_particao=None):
+    """
+    Descobre os times da competição e baixa o elenco de cada um
+
+    Args:
+        id_torneio: id do torneio no Sofascore (325 = Brasileirão Série A)
+        id_season: id da temporada no Sofascore (72034 = 2025)
+        pasta_particao: se informada (modo colheita), os arquivos vão para essa pasta e
+            nada é enviado ao Google Sheets (quem publica é a etapa de mescla)
+    """
     # --- IMPORTAÇÃO DAS BIBLIOTECAS NECESSÁRIAS ---
 
-    import time
-    import random
     import pandas as pd
     import os
-    from curl_cffi import requests
     from datetime import datetime
     from conectar_google_api import salvar_dataframe
-
-    # --- CONFIGURAÇÃO DA REQUISIÇÃO ---
-    headers = {
-        'authority': 'www.sofascore.com',
-        'accept': '*/*',
-        'referer': 'https://www.sofascore.com/pt/torneio/futebol/brazil/brasileirao-serie-a/325',
-        'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-        'x-requested-with': 'x',
-        'cookie': 'cookie',
-    }
+    from area_staging import publicar_tabela, ESPELHAR_NO_SHEETS
+    from cliente_http import faz_requisicao, URL_API, referer_torneio
+    from metricas import METRICAS
+    from diff_elencos import calcular_alteracoes, salvar_alteracoes, ARQUIVO_ALTERACOES
 
     # --- CONFIGURAÇÃO DE ARQUIVOS ---
     id_da_planilha = "id"
 
     pasta_destino = 'caminho'
     nome_arquivo = 'jogadores_brasileirao_2025.csv'
+    arquivo_alteracoes = ARQUIVO_ALTERACOES
+    publicar = True
+
+    # Modo colheita: cada competição/temporada escreve na sua própria partição
+    if pasta_particao:
+        pasta_destino = pasta_particao
+        arquivo_alteracoes = os.path.join(pasta_particao, os.path.basename(ARQUIVO_ALTERACOES))
+        publicar = False
 
     # Lista para acumular os erros
     lista_erros = []
@@ -49,52 +57,13 @@ def modulo_discovery():
         print(f"Foi encontrado um erro com a mensagem {mensagem}. Já adicionei na lista de erros")
 
 
-    def faz_requisicao(url, dados_sendo_baixados):
-        """
-        Tenta fazer a requisição X vezes antes de desistir
-
-        Args:
-            url: url da requisição
-            dados_sendo_baixados: diferenciar qual arquivo estais fazendo a raspagem dos dados
-
-        Returns:
-            resposta_da_requisicao: A requisição foi um sucesso e o dado pôde ser raspado
-            None: A requisição não funcionou e mesmo após 5 tentativas o algoritmo não retornou com sucesso.
-            Nesse caso, ele desiste e parte para o próximo item.
-
-        """
-
-        tentativas = 5
-        espera = 3
-
-        for i in range(tentativas):
-            try:
-                resposta_da_requisicao = requests.get(url, headers=headers, impersonate="chrome")
-                if resposta_da_requisicao.status_code == 200:
-                    return resposta_da_requisicao
-                else:
-                    # Se não for 200, avisa e tenta de novo
-                    print(f"Tentativa {i + 1}/{tentativas} falhou (Status {resposta_da_requisicao.status_code})...", end=" ")
-
-            except Exception as erro_requsicao:
-                print(f"Tentativa {i + 1}/{tentativas} falhou (Erro {erro_requsicao})...", end=" ")
-
-            # Se ainda não é a última tentativa, espera um pouco
-            if i < tentativas - 1:
-                print(f"Aguardando {espera}s.")
-                time.sleep(espera)
-            else:
-                print("Desistindo.")
-
-        return None
-
     # --- 1. PEGAR OS TIMES ---
     print(">>> 1. Buscando times...")
-    url_tabela = "https://www.sofascore.com/api/v1/unique-tournament/325/season/72034/standings/total"
+    url_tabela = f"{URL_API}/unique-tournament/{id_torneio}/season/{id_season}/standings/total"
     lista_times = []
 
     # Usa a nova função com retry
-    requisicao_times = faz_requisicao(url_tabela, "Tabela de Times")
+    requisicao_times = faz_requisicao(url_tabela, referer=referer_torneio(id_torneio), contexto="Tabela de Times")
 
     if requisicao_times and requisicao_times.status_code == 200:
         try:
@@ -124,7 +93,7 @@ def modulo_discovery():
         registrar_erro("Busca de Times", mensagem_de_erro, url_tabela)
 
         # Salva o log e sai
-        if lista_erros:
+        if lista_erros and publicar:
             df_erros = pd.DataFrame(lista_erros)
             salvar_dataframe(df_erros, id_da_planilha, "Log_Erros")
         exit()
@@ -132,13 +101,14 @@ def modulo_discovery():
     # --- 2. PEGAR OS JOGADORES ---
     print("\n>>> 2. Buscando elencos...")
     todos_jogadores = []
+    times_com_falha = []
 
     for id_do_time, nome_do_time in lista_times:
         print(f"Processando {id_do_time}...", end="")
 
-        url_elenco = f"https://www.sofascore.com/api/v1/team/{id_do_time}/players"
+        url_elenco = f"{URL_API}/team/{id_do_time}/players"
 
-        requisicao_jogadores = faz_requisicao(url_elenco, f"Elenco {nome_do_time}")
+        requisicao_jogadores = faz_requisicao(url_elenco, referer=referer_torneio(id_torneio), contexto=f"Elenco {nome_do_time}")
 
         if requisicao_jogadores and requisicao_jogadores.status_code == 200:
             try:
@@ -153,19 +123,18 @@ def modulo_discovery():
                         todos_jogadores.append(jogador_normalizado)
 
                 print(f" Ok! (+{len(jogadores)})")
+                METRICAS.registrar_itens('discovery', len(jogadores))
             except Exception as e:
                 print(f" Erro JSON: {e}")
                 registrar_erro("Parse Jogadores", f"Erro JSON: {e}", nome_do_time)
+                times_com_falha.append(id_do_time)
         else:
             # Falhou as 5 tentativas para este time específico
             print(f"Falha total.")
+            times_com_falha.append(id_do_time)
             status_final = requisicao_jogadores.status_code if requisicao_jogadores else "Erro Conexão"
             registrar_erro("Busca Jogadores", f"Falha após 5 tentativas (Status: {status_final})", nome_do_time)
 
-        # Pausa entre times (diferente da pausa de retry)
-        pausa = random.uniform(1.5, 4.0)
-        time.sleep(pausa)
-
     # --- 3. SALVAR OS DADOS (SUCESSO) ---
     if todos_jogadores:
         df = pd.json_normalize(todos_jogadores)
@@ -187,22 +156,35 @@ def modulo_discovery():
         os.makedirs(pasta_destino, exist_ok=True)
         caminho_completo = os.path.join(pasta_destino, nome_arquivo)
 
+        # 0. Diferença em relação ao snapshot anterior (extração e especificador só
+        # precisam revisitar quem entrou ou mudou de time/posição)
+        df_anterior = None
+        if os.path.exists(caminho_completo):
+            df_anterior = pd.read_csv(caminho_completo, sep=';')
+        alteracoes = calcular_alteracoes(df_anterior, df, times_com_falha)
+        salvar_alteracoes(alteracoes, arquivo_alteracoes)
+        print(f"Alterações no elenco: {len(alteracoes['novos'])} novos, "
+              f"{len(alteracoes['saidas'])} saídas, {len(alteracoes['alterados'])} alterados.")
+
         # 1. Backup Local
         df.to_csv(caminho_completo, index=False, sep=';', encoding='utf-8-sig')
         print(f"CSV salvo em: {caminho_completo}")
 
-        # 2. Google Sheets - Dados
-        print("Enviando dados para o Google Sheets...")
-        salvar_dataframe(df, id_da_planilha, "Geral_Times_Jogadores_2025")
+        # 2. Staging local (lido direto pela carga no banco) e espelho no Google Sheets
+        if publicar:
+            publicar_tabela('geral', df)
+        if publicar and ESPELHAR_NO_SHEETS:
+            print("Enviando dados para o Google Sheets...")
+            salvar_dataframe(df, id_da_planilha, "Geral_Times_Jogadores_2025")
 
     else:
         print("Nenhum dado coletado de jogadores.")
         registrar_erro("Finalização", "Nenhum jogador foi coletado após o loop dos times.")
 
     # --- 4. SALVAR OS ERROS (SE HOUVER) ---
-    if lista_erros:
+    if lista_erros and publicar:
         print("\nSalvando LOG DE ERROS no Sheets...")
         df_erros = pd.DataFrame(lista_erros)
         salvar_dataframe(df_erros, id_da_planilha, "Erros_Info_Gerais_dos_Times_e_Jogadores_2025")
-    else:
+    elif not lista_erros:
         print("\nExecução perfeita! Nenhum erro registrado.")
\ No newline at end of file
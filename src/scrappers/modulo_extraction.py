@@ -1,30 +1,49 @@
-def modulo_extracao():
-    from curl_cffi import requests
+def modulo_extracao(reprocessar_falhas=False, id_torneio=325, id_season=72034, pasta_particao=None):
+    """
+    Coleta as estatísticas da temporada de cada jogador descoberto
+
+    Args:
+        reprocessar_falhas: se True, as tarefas que falharam em execuções anteriores voltam para a fila
+        id_torneio: id do torneio no Sofascore (325 = Brasileirão Série A)
+        id_season: id da temporada no Sofascore (72034 = 2025)
+        pasta_particao: se informada (modo colheita), entrada, saída e fila ficam nessa pasta e
+            nada é enviado ao Google Sheets
+    """
     import pandas as pd
     import time
-    import random
     import os
-    import json
     from datetime import datetime
     from conectar_google_api import salvar_dataframe
     from conversor_jsonl import processar_conversao
+    from motor_assincrono import executar_coleta
+    from cliente_http import URL_API, url_perfil_jogador
+    from metricas import METRICAS
+    from diff_elencos import carregar_alteracoes, ARQUIVO_ALTERACOES
+    from fila_trabalho import FilaTrabalho, ARQUIVO_FILA
+    from indice_jsonl import IndiceJsonl
 
     # --- CONFIGURAÇÃO ---
     ARQUIVO_ENTRADA = 'caminho'
     ARQUIVO_SAIDA = 'caminho'
     SPREADSHEET_ID = "id"
+    ENDPOINT = 'estatisticas'  # nome deste estágio na fila de trabalho
+    arquivo_fila = ARQUIVO_FILA
+    arquivo_alteracoes = ARQUIVO_ALTERACOES
+    publicar = True
 
-    ID_TORNEIO = 325
-    ID_SEASON = 72034
+    ID_TORNEIO = id_torneio
+    ID_SEASON = id_season
 
-    headers = {
-        'authority': 'www.sofascore.com',
-        'accept': '*/*',
-        'referer': 'https://www.sofascore.com/pt/torneio/futebol/brazil/brasileirao-serie-a/325',
-        'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-        'x-requested-with': 'x',
-        'cookie': 'cookie',
-    }
+    # Modo colheita: cada competição/temporada tem seus próprios arquivos e sua própria fila
+    if pasta_particao:
+        ARQUIVO_ENTRADA = os.path.join(pasta_particao, 'jogadores_brasileirao_2025.csv')
+        ARQUIVO_SAIDA = os.path.join(pasta_particao, 'dados_brutos_stats.jsonl')
+        arquivo_fila = os.path.join(pasta_particao, os.path.basename(ARQUIVO_FILA))
+        arquivo_alteracoes = os.path.join(pasta_particao, os.path.basename(ARQUIVO_ALTERACOES))
+        publicar = False
+
+    # Paralelismo: o ritmo total é dado pelo limitador adaptativo (limitador_taxa.py)
+    MAX_EM_VOO = 4
 
     # --- SISTEMA DE LOGS ---
     lista_erros = []
@@ -50,52 +69,12 @@ def modulo_extracao():
 
     def salvar_logs_nuvem():
         """Envia os erros acumulados para o Google Sheets"""
-        if lista_erros and salvar_dataframe:
+        if lista_erros and salvar_dataframe and publicar:
             print("\nEnviando relatório de erros para o Google Sheets...")
             df_erros = pd.DataFrame(lista_erros)
             salvar_dataframe(df_erros, SPREADSHEET_ID, "Log_Erros_Estatísticas_dos_Atletas")
 
-    # --- NOVO: FUNÇÃO DE RETRY (Blindada) ---
-    def faz_requisicao(url, headers_req, tentativas=5, espera=3):
-        """
-        Tenta fazer a requisição X vezes antes de desistir
-
-        Args:
-            url: url da requisição
-            headers_req: cabeçalhos da requisição
-            tentativas: nº de vezes que o algoritmo tentará requisitar antes de desistir
-            espera: o algoritmo espera 3 segundos antes de fazer uma nova tentativa
-
-        Returns:
-            resposta_da_requisicao: A requisição foi um sucesso e o dado pôde ser raspado
-            None: A requisição não funcionou e mesmo após 5 tentativas o algoritmo não retornou com sucesso.
-            Nesse caso, ele desiste e parte para o próximo item.
-
-        """
-
-        for i in range(tentativas):
-            try:
-                # Importante: Passamos os headers dinâmicos aqui
-                resposta_da_requisicao = requests.get(url, headers=headers_req, impersonate="chrome")
-
-                # Se for sucesso (200) ou Não Encontrado (404 - erro definitivo), retorna logo
-                if resposta_da_requisicao.status_code in [200, 404, 403]:
-                    return resposta_da_requisicao
-
-                # Se for erro 5xx ou outro, tenta de novo
-                print(f"Tentativa {i + 1}/{tentativas} falhou (Status {resposta_da_requisicao.status_code})...", end=" ")
-
-            except Exception as e:
-                print(f"Tentativa {i + 1}/{tentativas} falhou (Erro {e})...", end=" ")
-
-            # Aguarda antes da próxima, menos na última
-            if i < tentativas - 1:
-                time.sleep(espera)
-
-        # Se saiu do loop, é porque falhou todas
-        return None
-
-        # --- 1. CARREGAR OS JOGADORES ---
+    # --- 1. CARREGAR OS JOGADORES ---
 
     print(f"Lendo {ARQUIVO_ENTRADA}...")
     try:
@@ -107,79 +86,112 @@ def modulo_extracao():
         print("Erro: Arquivo de entrada não encontrado.")
         exit()
 
-    # Descobrir onde paramos
-    ids_processados = set()
-    if os.path.exists(ARQUIVO_SAIDA):
-        with open(ARQUIVO_SAIDA, 'r', encoding='utf-8') as f:
-            for linha in f:
-                try:
-                    dado = json.loads(linha)
-                    ids_processados.add(dado['player_id'])
-                except:
-                    pass
-        print(f"Retomando: {len(ids_processados)} jogadores já coletados.")
+    # Descobrir onde paramos: a fila persistente sabe o que já foi feito
+    fila = FilaTrabalho(arquivo_fila)
 
-    # --- 2. LOOP DE MINERAÇÃO ---
-    print(">>> Iniciando coleta...")
+    # Índice ao lado do JSONL: corrige linha rasgada por queda e diz quem já está no arquivo
+    indice = IndiceJsonl(ARQUIVO_SAIDA)
 
-    try:
-        with open(ARQUIVO_SAIDA, 'a', encoding='utf-8') as f_saida:
-            for index, row in df_jogadores.iterrows():
-                player_id = row['id']
-                player_name = row['name']
-                player_slug = row['slug']
+    # Primeira execução com a fila: aproveita o que já está no JSONL (uma única vez)
+    if fila.esta_vazia(ENDPOINT) and indice.ids():
+        ids_legados = indice.ids()
+        fila.semear(ENDPOINT, dict.fromkeys(ids_legados))
+        print(f"Fila inicializada com {len(ids_legados)} jogadores já coletados no JSONL.")
 
-                if player_id in ids_processados:
-                    continue
+    # Se o discovery gerou um conjunto de mudanças, só revisita quem entrou ou mudou
+    # (quem é recoletado aparece de novo no JSONL e o conversor fica com a linha mais recente)
+    fila.sincronizar_elenco(ENDPOINT, df_jogadores['id'].tolist(), carregar_alteracoes(arquivo_alteracoes))
 
-                print(f"[{index + 1}/{len(df_jogadores)}] {player_name}...", end="")
+    if reprocessar_falhas:
+        print(f"Reabrindo {fila.reabrir_falhas(ENDPOINT)} tarefas que falharam antes.")
 
-                # Referer Dinâmico (Muda a cada jogador)
-                url_perfil_fake = f"https://www.sofascore.com/pt/football/player/{player_slug}/{player_id}"
-                headers['referer'] = url_perfil_fake
+    ids_pendentes = fila.pendentes(ENDPOINT)
+    print(f"Retomando: {fila.resumo(ENDPOINT)}")
 
-                url_stats = f"https://www.sofascore.com/api/v1/player/{player_id}/unique-tournament/{ID_TORNEIO}/season/{ID_SEASON}/statistics/overall"
-
-                resp = faz_requisicao(url_stats, headers, tentativas=5, espera=3)
-
-                if resp:  # Se houve resposta (mesmo que erro)
-                    if resp.status_code == 200:
-                        try:
-                            data = resp.json()
-                            stats = data.get('statistics', {})
+    # --- 2. LOOP DE MINERAÇÃO ---
+    print(">>> Iniciando coleta...")
 
-                            # Metadados
-                            stats['player_id'] = player_id
-                            stats['player_name'] = player_name
-                            stats['team_id'] = row['time_id']
+    # Monta a lista de tarefas apenas com quem está pendente na fila
+    tarefas = []
+    for index, row in df_jogadores.iterrows():
+        player_id = row['id']
+        if player_id not in ids_pendentes:
+            continue
+
+        tarefas.append({
+            'url': f"{URL_API}/player/{player_id}/unique-tournament/{ID_TORNEIO}/season/{ID_SEASON}/statistics/overall",
+            # Referer Dinâmico (Muda a cada jogador)
+            'referer': url_perfil_jogador(row['slug'], player_id),
+            'contexto': f"[{index + 1}/{len(df_jogadores)}] {row['name']}",
+            'player_id': player_id,
+            'player_name': row['name'],
+            'team_id': row['time_id'],
+        })
 
-                            # Salva JSONL Local
-                            json.dump(stats, f_saida, ensure_ascii=False)
-                            f_saida.write('\n')
-                            f_saida.flush()
-                            print(" Sucesso!")
-                        except Exception as e:
-                            print(f" Erro JSON: {e}")
-                            registrar_erro("Parse JSON", f"Erro ao ler JSON: {e}", player_name)
+    print(f"{len(tarefas)} jogadores na fila ({MAX_EM_VOO} requisições simultâneas).")
 
-                    elif resp.status_code == 404:
-                        print(" Sem dados (404).")
-                        # Opcional: talvez ainda seja feito um registrar_erro("Aviso 404", "Sem dados na temporada", player_name)
+    try:
+        def ao_receber(tarefa, resp):
+            """
+            Trata a resposta de um jogador assim que ela chega
+
+            Args:
+                tarefa: dicionário da tarefa (url, referer e metadados do jogador)
+                resp: resposta da requisição ou None se todas as tentativas falharam
+
+            Returns:
+                False: bloqueio 403 detectado, o motor para de iniciar requisições
+                None: segue a coleta normalmente
+            """
+            player_id = tarefa['player_id']
+            player_name = tarefa['player_name']
+            prefixo = tarefa['contexto']
+
+            if resp:  # Se houve resposta (mesmo que erro)
+                if resp.status_code == 200:
+                    try:
+                        data = resp.json()
+                        stats = data.get('statistics', {})
+
+                        # Metadados
+                        stats['player_id'] = tarefa['player_id']
+                        stats['player_name'] = player_name
+                        stats['team_id'] = tarefa['team_id']
+
+                        # Salva JSONL Local (e a posição da linha no índice)
+                        indice.anexar(stats)
+                        fila.concluir(ENDPOINT, player_id)
+                        METRICAS.registrar_itens('extracao')
+                        print(f"{prefixo} Sucesso!")
+                    except Exception as e:
+                        print(f"{prefixo} Erro JSON: {e}")
+                        registrar_erro("Parse JSON", f"Erro ao ler JSON: {e}", player_name)
+                        fila.falhar(ENDPOINT, player_id, f"Parse JSON: {e}")
+
+                elif resp.status_code == 404:
+                    print(f"{prefixo} Sem dados (404).")
+                    fila.concluir(ENDPOINT, player_id)  # Sem dados na temporada não é falha
+
+                elif resp.status_code == 403:
+                    msg = "ERRO 403: Bloqueio detectado! Pare e troque o Cookie."
+                    registrar_erro("FATAL", msg, player_name)
+                    fila.devolver(ENDPOINT, player_id)
+                    return False  # BLOQUEIO É FATAL -> PARE O SCRIPT
 
-                    elif resp.status_code == 403:
-                        msg = "ERRO 403: Bloqueio detectado! Pare e troque o Cookie."
-                        registrar_erro("FATAL", msg, player_name)
-                        break  # BLOQUEIO É FATAL -> PARE O SCRIPT
+                else:
+                    registrar_erro("HTTP Error", f"Falha após 5 tentativas. Status {resp.status_code}", player_name)
+                    fila.falhar(ENDPOINT, player_id, f"Status {resp.status_code}")
 
-                    else:
-                        registrar_erro("HTTP Error", f"Falha após 5 tentativas. Status {resp.status_code}", player_name)
+            else:
+                # Se resp for None, significa que deu exceção nas 5 tentativas
+                print(f"{prefixo} Falha Total.")
+                registrar_erro("Conexão", "Falha de conexão após 5 tentativas", player_name)
+                fila.falhar(ENDPOINT, player_id, "Falha de conexão")
 
-                else:
-                    # Se resp for None, significa que deu exceção nas 5 tentativas
-                    print(" Falha Total.")
-                    registrar_erro("Conexão", "Falha de conexão após 5 tentativas", player_name)
+        def ao_iniciar(tarefa):
+            fila.iniciar(ENDPOINT, tarefa['player_id'])
 
-                time.sleep(random.uniform(2.0, 4.0))
+        executar_coleta(tarefas, ao_receber, max_em_voo=MAX_EM_VOO, ao_iniciar=ao_iniciar)
 
     except KeyboardInterrupt:
         print("\nInterrompido pelo usuário.")
@@ -188,10 +200,18 @@ def modulo_extracao():
         # --- BLOCO FINAL ---
         print("\nProcessando conversão final...")
         try:
-            processar_conversao()
+            if pasta_particao:
+                processar_conversao(ARQUIVO_SAIDA, os.path.join(pasta_particao, 'tabela_final_stats_2025.csv'),
+                                    publicar=False, ids_validos=fila.ids(ENDPOINT) or None)
+            else:
+                processar_conversao(ids_validos=fila.ids(ENDPOINT) or None)
         except Exception as e:
             print(f"Erro na conversão automática: {e}")
 
+        print(f"Situação da fila: {fila.resumo(ENDPOINT)}")
+        fila.fechar()
+        indice.fechar()
+
         time.sleep(5)
         salvar_logs_nuvem()
         print("Script finalizado.")
\ No newline at end of file
@@ -0,0 +1,334 @@
+import os
+import pandas as pd
+
+# Parquet é opcional: sem o pyarrow as partições são gravadas em CSV
+try:
+    import pyarrow  # noqa: F401
+    EXTENSAO = '.parquet'
+except ImportError:
+    EXTENSAO = '.csv'
+
+# --- CONFIGURAÇÃO ---
+PASTA_PROJETO = 'caminho'
+PASTA_PARTIDAS = f'{PASTA_PROJETO}/partidas'
+ARQUIVO_FORMA = f'{PASTA_PROJETO}/forma_recente.csv'
+
+# Marca de rodada fechada: todas as partidas terminaram e foram gravadas (a rodada não é mais pedida)
+MARCA_COMPLETA = '_COMPLETA'
+
+# Partida encerrada sem escalação (404, ou ninguém com minutos): marca vazia no lugar do arquivo,
+# para não ser pedida de novo a cada execução
+SUFIXO_SEM_ESCALACAO = '.sem_escalacao'
+
+# Situações finais de um evento: só 'finished' tem escalação, mas cancelado/abandonado também
+# não muda mais e não pode segurar a rodada aberta
+STATUS_COM_ESCALACAO = 'finished'
+STATUS_FINAIS = ('finished', 'canceled', 'abandoned')
+
+# Quantas partidas por jogador ficam no estado da janela móvel (o maior N consultável)
+JANELA_MAXIMA = 10
+JANELA_PADRAO = 5
+
+COLUNAS_FIXAS = ['id_evento', 'rodada', 'timestamp', 'time_id', 'player_id', 'player_name', 'position']
+
+# O /lineups omite as estatísticas que ficaram em zero (ex: sem gols, nenhum desarme): para quem entrou
+# em campo, métrica ausente é 0. A nota é a exceção: quem jogou poucos minutos fica sem nota, e isso
+# não é nota 0.
+METRICAS_SEM_ZERO = ['rating']
+
+
+def pasta_da_rodada(id_torneio, id_season, rodada, pasta_partidas=PASTA_PARTIDAS):
+    """Partição de uma rodada: torneio=X/season=Y/round=N."""
+    return os.path.join(pasta_partidas, f"torneio={id_torneio}", f"season={id_season}", f"round={rodada}")
+
+
+def caminho_estado(id_torneio, id_season, pasta_partidas=PASTA_PARTIDAS):
+    """Estado da janela móvel (últimas JANELA_MAXIMA partidas de cada jogador) da temporada."""
+    return os.path.join(pasta_partidas, f"torneio={id_torneio}", f"season={id_season}", f"ultimas_partidas{EXTENSAO}")
+
+
+def _gravar(df, caminho):
+    # Grava num temporário e troca: uma queda nunca deixa arquivo de partida pela metade
+    temporario = caminho + '.tmp'
+    if EXTENSAO == '.parquet':
+        df.to_parquet(temporario, index=False)
+    else:
+        df.to_csv(temporario, index=False, sep=';')
+    os.replace(temporario, caminho)
+
+
+def _ja_coletado(pasta, id_evento):
+    """A partida já tem arquivo (ou a marca de que não tem escalação)."""
+    base = os.path.join(pasta, f"evento_{id_evento}")
+    return os.path.exists(base + EXTENSAO) or os.path.exists(base + SUFIXO_SEM_ESCALACAO)
+
+
+def _ler(caminho):
+    if caminho.endswith('.parquet'):
+        return pd.read_parquet(caminho)
+    return pd.read_csv(caminho, sep=';')
+
+
+def completar_metricas(df):
+    """
+    Preenche com 0 as métricas ausentes (todas as linhas são de jogadores que entraram em campo)
+
+    Args:
+        df: linhas de partidas (colunas fixas + métricas)
+
+    Returns:
+        DataFrame: o mesmo df, com as métricas (menos METRICAS_SEM_ZERO) sem vazios
+    """
+    metricas = [c for c in df.columns if c not in COLUNAS_FIXAS and c not in METRICAS_SEM_ZERO]
+    df[metricas] = df[metricas].fillna(0)
+    return df
+
+
+def linhas_da_partida(evento, rodada, lineups):
+    """
+    Transforma o /event/{id}/lineups numa linha por jogador que entrou em campo
+
+    Args:
+        evento: dicionário do evento (da lista de eventos da rodada)
+        rodada: nº da rodada
+        lineups: JSON do /lineups
+
+    Returns:
+        list: dicionários com as colunas fixas + as estatísticas numéricas do jogador na partida
+    """
+    linhas = []
+    for lado, chave_time in (('home', 'homeTeam'), ('away', 'awayTeam')):
+        for jogador in lineups.get(lado, {}).get('players', []):
+            estatisticas = jogador.get('statistics') or {}
+            # Reservas que não entraram vêm sem estatísticas: não contam como partida jogada
+            if not estatisticas.get('minutesPlayed'):
+                continue
+            linha = {
+                'id_evento': evento['id'],
+                'rodada': rodada,
+                'timestamp': evento.get('startTimestamp'),
+                'time_id': evento.get(chave_time, {}).get('id'),
+                'player_id': jogador['player']['id'],
+                'player_name': jogador['player'].get('name'),
+                'position': jogador.get('position'),
+            }
+            for nome, valor in estatisticas.items():
+                if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+                    linha[nome] = valor
+            linhas.append(linha)
+    return linhas
+
+
+def atualizar_estado(df_novas, arquivo_estado, janela_maxima=JANELA_MAXIMA):
+    """
+    Junta as partidas recém gravadas ao estado da janela móvel e corta o que passou da janela
+
+    O estado guarda só as últimas janela_maxima partidas de cada jogador, então o custo não
+    cresce com o histórico da temporada.
+
+    Args:
+        df_novas: linhas das partidas novas
+        arquivo_estado: arquivo do estado (ver caminho_estado)
+        janela_maxima: nº de partidas mantidas por jogador
+
+    Returns:
+        DataFrame: estado atualizado
+    """
+    partes = [df_novas]
+    if os.path.exists(arquivo_estado):
+        partes.insert(0, _ler(arquivo_estado))
+    # Partidas diferentes trazem métricas diferentes: o que falta numa delas vira 0
+    estado = completar_metricas(pd.concat(partes, ignore_index=True))
+
+    estado = estado.drop_duplicates(subset=['player_id', 'id_evento'], keep='last')
+    estado = estado.sort_values(['player_id', 'timestamp'])
+    estado = estado.groupby('player_id', sort=False).tail(janela_maxima).reset_index(drop=True)
+
+    _gravar(estado, arquivo_estado)
+    return estado
+
+
+def forma_recente(estado, n=JANELA_PADRAO):
+    """
+    Média das estatísticas de cada jogador nas suas últimas n partidas
+
+    Args:
+        estado: DataFrame do estado da janela móvel (ver atualizar_estado)
+        n: tamanho da janela (até JANELA_MAXIMA)
+
+    Returns:
+        DataFrame: uma linha por jogador com 'partidas' (quantas entraram na média) e as médias
+    """
+    if n > JANELA_MAXIMA:
+        raise ValueError(f"A janela máxima guardada é de {JANELA_MAXIMA} partidas")
+
+    # mean() pula vazios: sem o 0, quem não marcou numa partida teria a média só das que marcou
+    estado = completar_metricas(estado.copy())
+    ultimas = estado.sort_values(['player_id', 'timestamp']).groupby('player_id', sort=False).tail(n)
+    metricas = [c for c in ultimas.columns if c not in COLUNAS_FIXAS]
+
+    agrupado = ultimas.groupby('player_id')
+    df_forma = agrupado[metricas].mean()
+    df_forma.insert(0, 'partidas', agrupado.size())
+    df_forma.insert(0, 'player_name', agrupado['player_name'].last())
+    return df_forma.reset_index()
+
+
+def elenco_da_temporada(id_torneio, id_season, pasta_partidas=PASTA_PARTIDAS):
+    """
+    Elenco de uma temporada montado com quem entrou em campo nas partidas gravadas dela
+
+    O /team/{id}/players só devolve o elenco de hoje; para temporadas passadas as escalações
+    são a fonte de quem jogou e por qual time.
+
+    Args:
+        id_torneio: id do torneio no Sofascore
+        id_season: id da temporada no Sofascore
+        pasta_partidas: raiz das partições por temporada/rodada
+
+    Returns:
+        DataFrame: uma linha por jogador com as colunas do CSV do discovery usadas na extração
+            (id, name, slug, position, time_id); time e posição são os da última partida dele
+    """
+    pasta_temporada = os.path.join(pasta_partidas, f"torneio={id_torneio}", f"season={id_season}")
+    partes = []
+    for raiz, _, arquivos in os.walk(pasta_temporada):
+        for nome in arquivos:
+            if nome.startswith('evento_') and nome.endswith(('.parquet', '.csv')):
+                partes.append(_ler(os.path.join(raiz, nome))[COLUNAS_FIXAS])
+    if not partes:
+        return pd.DataFrame(columns=['id', 'name', 'slug', 'position', 'time_id'])
+
+    df = pd.concat(partes, ignore_index=True).sort_values(['player_id', 'timestamp'])
+    df = df.drop_duplicates(subset=['player_id'], keep='last')
+    df = df.rename(columns={'player_id': 'id', 'player_name': 'name'})
+    # As escalações não trazem o slug do perfil; o referer aceita um genérico (como no especificador)
+    df['slug'] = 'player'
+    return df[['id', 'name', 'slug', 'position', 'time_id']].reset_index(drop=True)
+
+
+def modulo_partidas(id_torneio=325, id_season=72034, janela=JANELA_PADRAO, pasta_partidas=PASTA_PARTIDAS,
+                    arquivo_forma=ARQUIVO_FORMA, publicar=True):
+    """
+    Coleta as estatísticas por partida das rodadas encerradas e atualiza a forma recente
+
+    Só as rodadas sem a marca _COMPLETA são consultadas e, dentro delas, só as partidas
+    encerradas que ainda não têm arquivo. Cada partida vira um arquivo na partição da rodada
+    (nada é reescrito).
+
+    Args:
+        id_torneio: id do torneio no Sofascore (325 = Brasileirão Série A)
+        id_season: id da temporada no Sofascore (72034 = 2025)
+        janela: nº de partidas da média de forma recente
+        pasta_partidas: raiz das partições por temporada/rodada
+        arquivo_forma: CSV da forma recente
+        publicar: se False, a forma recente não vai para o staging (ex: temporadas da colheita)
+    """
+    from cliente_http import faz_requisicao, URL_API, referer_torneio
+    from motor_assincrono import executar_coleta
+    from metricas import METRICAS
+    from area_staging import publicar_tabela
+
+    url_base = f"{URL_API}/unique-tournament/{id_torneio}/season/{id_season}"
+    referer = referer_torneio(id_torneio)
+
+    # --- 1. RODADAS ---
+    print(">>> Buscando rodadas...")
+    resp = faz_requisicao(f"{url_base}/rounds", referer=referer, contexto="Rodadas")
+    if not resp or resp.status_code != 200:
+        print(f"Erro: não foi possível obter as rodadas (status {resp.status_code if resp else 'Erro Conexão'}).")
+        return
+    dados_rodadas = resp.json()
+    rodada_atual = dados_rodadas.get('currentRound', {}).get('round')
+    rodadas = sorted({r['round'] for r in dados_rodadas.get('rounds', []) if 'round' in r})
+    if rodada_atual is not None:
+        rodadas = [r for r in rodadas if r <= rodada_atual]
+
+    abertas = []
+    for rodada in rodadas:
+        if not os.path.exists(os.path.join(pasta_da_rodada(id_torneio, id_season, rodada, pasta_partidas), MARCA_COMPLETA)):
+            abertas.append(rodada)
+    print(f"{len(rodadas) - len(abertas)} rodadas já gravadas, {len(abertas)} para consultar.")
+
+    # --- 2. PARTIDAS ENCERRADAS QUE AINDA NÃO TÊM ARQUIVO ---
+    tarefas = []
+    for rodada in abertas:
+        pasta = pasta_da_rodada(id_torneio, id_season, rodada, pasta_partidas)
+        resp = faz_requisicao(f"{url_base}/events/round/{rodada}", referer=referer, contexto=f"Rodada {rodada}")
+        if not resp or resp.status_code != 200:
+            print(f"Rodada {rodada}: falha ao listar partidas.")
+            continue
+
+        eventos = resp.json().get('events', [])
+        situacoes = [e.get('status', {}).get('type') for e in eventos]
+        encerrados = [e for e, situacao in zip(eventos, situacoes) if situacao == STATUS_COM_ESCALACAO]
+        pendentes = [e for e in encerrados if not _ja_coletado(pasta, e['id'])]
+        rodada_fechada = bool(eventos) and all(situacao in STATUS_FINAIS for situacao in situacoes)
+
+        # Todas as partidas em situação final e gravadas: a rodada nunca mais é consultada
+        if rodada_fechada and not pendentes:
+            os.makedirs(pasta, exist_ok=True)
+            open(os.path.join(pasta, MARCA_COMPLETA), 'w').close()
+            continue
+
+        for evento in pendentes:
+            tarefas.append({
+                'url': f"{URL_API}/event/{evento['id']}/lineups",
+                'referer': referer,
+                'contexto': f"Rodada {rodada} - evento {evento['id']}",
+                'evento': evento,
+                'rodada': rodada,
+                'pasta': pasta,
+                'rodada_fechada': rodada_fechada,
+            })
+
+    print(f"{len(tarefas)} partidas novas para coletar.")
+
+    # --- 3. COLETA (uma partição por rodada, um arquivo por partida) ---
+    novas = []
+    restantes = {}  # pasta da rodada -> partidas ainda não gravadas nesta execução
+    for tarefa in tarefas:
+        if tarefa['rodada_fechada']:
+            restantes[tarefa['pasta']] = restantes.get(tarefa['pasta'], 0) + 1
+
+    def ao_receber(tarefa, resp):
+        if resp is None or resp.status_code not in (200, 404):
+            print(f"{tarefa['contexto']}: falha (status {resp.status_code if resp else 'Erro Conexão'}).")
+            return False if resp is not None and resp.status_code == 403 else None
+
+        # 404: partida sem escalação publicada (ex: W.O.); conta como coletada, só com a marca
+        linhas = linhas_da_partida(tarefa['evento'], tarefa['rodada'], resp.json()) if resp.status_code == 200 else []
+        os.makedirs(tarefa['pasta'], exist_ok=True)
+        base = os.path.join(tarefa['pasta'], f"evento_{tarefa['evento']['id']}")
+        if linhas:
+            df_partida = completar_metricas(pd.DataFrame(linhas))
+            _gravar(df_partida, base + EXTENSAO)
+            novas.append(df_partida)
+            METRICAS.registrar_itens('partidas')
+        else:
+            open(base + SUFIXO_SEM_ESCALACAO, 'w').close()
+
+        if tarefa['rodada_fechada']:
+            restantes[tarefa['pasta']] -= 1
+            if restantes[tarefa['pasta']] == 0:
+                open(os.path.join(tarefa['pasta'], MARCA_COMPLETA), 'w').close()
+                print(f"Rodada {tarefa['rodada']} completa.")
+
+    if tarefas:
+        executar_coleta(tarefas, ao_receber)
+
+    # --- 4. JANELA MÓVEL: só as partidas novas entram no estado ---
+    arquivo_estado = caminho_estado(id_torneio, id_season, pasta_partidas)
+    if novas:
+        estado = atualizar_estado(pd.concat(novas, ignore_index=True), arquivo_estado)
+    elif os.path.exists(arquivo_estado):
+        estado = _ler(arquivo_estado)
+    else:
+        print("Nenhuma partida coletada ainda.")
+        return
+
+    df_forma = forma_recente(estado, janela)
+    df_forma.to_csv(arquivo_forma, index=False, sep=';', encoding='utf-8-sig')
+    if publicar:
+        publicar_tabela('forma_recente', df_forma)
+    print(f"Forma recente (últimas {janela} partidas) de {len(df_forma)} jogadores salva em {arquivo_forma}")
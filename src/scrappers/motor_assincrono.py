@@ -0,0 +1,72 @@
+import asyncio
+from cliente_http import criar_sessao_assincrona, faz_requisicao_async
+
+# --- CONFIGURAÇÃO PADRÃO DO MOTOR ---
+# O ritmo (requisições por segundo) é do LIMITADOR compartilhado em limitador_taxa.py;
+# aqui só se controla quantas requisições podem estar abertas ao mesmo tempo
+MAX_EM_VOO_PADRAO = 4
+
+
+async def _executar(tarefas, ao_receber, max_em_voo, ao_iniciar):
+    fila = asyncio.Queue()
+    for tarefa in tarefas:
+        fila.put_nowait(tarefa)
+
+    abortar = asyncio.Event()
+
+    async def trabalhador(sessao):
+        while not abortar.is_set():
+            try:
+                tarefa = fila.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            if ao_iniciar is not None:
+                ao_iniciar(tarefa)
+
+            # Cada tarefa carrega o seu próprio referer (perfil do jogador)
+            if 'requisicoes' in tarefa:
+                # Visita única: os endpoints do jogador saem em sequência pelo mesmo trabalhador
+                # (mesma conexão aquecida e o mesmo LIMITADOR)
+                resp = {}
+                for nome, url in tarefa['requisicoes'].items():
+                    resp[nome] = await faz_requisicao_async(sessao, url, referer=tarefa.get('referer'),
+                                                            contexto=f"{tarefa.get('contexto', '')} ({nome})")
+                    # Bloqueio: não adianta pedir os outros endpoints do jogador
+                    if resp[nome] is not None and resp[nome].status_code == 403:
+                        break
+            else:
+                resp = await faz_requisicao_async(sessao, tarefa['url'], referer=tarefa.get('referer'),
+                                                  contexto=tarefa.get('contexto', ''))
+
+            # O callback roda no próprio loop (uma thread só), então pode escrever em arquivo sem trava
+            if ao_receber(tarefa, resp) is False:
+                abortar.set()
+
+    async with criar_sessao_assincrona(max_em_voo) as sessao:
+        trabalhadores = []
+        for _ in range(max_em_voo):
+            trabalhadores.append(asyncio.create_task(trabalhador(sessao)))
+        await asyncio.gather(*trabalhadores)
+
+    return abortar.is_set()
+
+
+def executar_coleta(tarefas, ao_receber, max_em_voo=MAX_EM_VOO_PADRAO, ao_iniciar=None):
+    """
+    Executa uma lista de requisições com paralelismo limitado e o ritmo do LIMITADOR do processo
+
+    Args:
+        tarefas: lista de dicionários com 'url' e, opcionalmente, 'referer' e 'contexto'.
+            No lugar de 'url', a tarefa pode trazer 'requisicoes' ({nome: url}): todas são feitas
+            na mesma visita e o callback recebe {nome: resposta}.
+            Qualquer outra chave é repassada intacta para o callback.
+        ao_receber: função (tarefa, resposta) chamada a cada tarefa concluída.
+            Se retornar False (ex: bloqueio 403), nenhuma nova requisição é iniciada.
+        max_em_voo: nº máximo de requisições abertas ao mesmo tempo
+        ao_iniciar: função opcional (tarefa) chamada logo antes de a requisição da tarefa começar
+
+    Returns:
+        bool: True se a coleta foi abortada pelo callback, False se terminou normalmente
+    """
+    return asyncio.run(_executar(tarefas, ao_receber, max_em_voo, ao_iniciar))
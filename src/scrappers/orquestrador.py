@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# --- CONFIGURAÇÃO ---
+PASTA_PROJETO = 'caminho'
+ARQUIVO_ESTADO = f'{PASTA_PROJETO}/estado_orquestrador.json'
+MAX_PARALELO_PADRAO = 2
+
+
+class Estagio:
+    """
+    Um estágio do pipeline e o que ele consome/produz.
+
+    Args:
+        nome: nome único do estágio (usado nas dependências e no relatório)
+        funcao: função sem argumentos que executa o estágio
+        entradas: arquivos lidos pelo estágio. Se nenhum mudou desde a última execução
+            bem-sucedida (e as saídas existem), o estágio é pulado.
+        saidas: arquivos produzidos pelo estágio
+        depende_de: nomes dos estágios que precisam terminar antes deste começar
+        tem_pendencias: função opcional que retorna True se o estágio ainda tem trabalho
+            pendente (ex: fila com itens abertos). Nesse caso ele nunca é pulado.
+        validade: segundos opcionais depois dos quais a última execução bem-sucedida vence e o
+            estágio roda de novo mesmo com as entradas iguais (ex: dados que mudam a cada rodada).
+    """
+
+    def __init__(self, nome, funcao, entradas=(), saidas=(), depende_de=(), tem_pendencias=None, validade=None):
+        self.nome = nome
+        self.funcao = funcao
+        self.entradas = list(entradas)
+        self.saidas = list(saidas)
+        self.depende_de = list(depende_de)
+        self.tem_pendencias = tem_pendencias
+        self.validade = validade
+
+
+def _hash_arquivo(caminho):
+    if not os.path.exists(caminho):
+        return None
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def _impressao_digital(estagio):
+    """Hash de todas as entradas do estágio (None se ele não declara entradas)."""
+    if not estagio.entradas:
+        return None
+    hashes = {}
+    for caminho in estagio.entradas:
+        hashes[caminho] = _hash_arquivo(caminho)
+    return hashlib.sha256(json.dumps(hashes, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _carregar_estado(arquivo_estado):
+    if not os.path.exists(arquivo_estado):
+        return {}
+    try:
+        with open(arquivo_estado, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _salvar_estado(arquivo_estado, estado):
+    os.makedirs(os.path.dirname(arquivo_estado) or '.', exist_ok=True)
+    with open(arquivo_estado, 'w', encoding='utf-8') as f:
+        json.dump(estado, f, ensure_ascii=False, indent=2)
+
+
+def _ultima_execucao(estado, nome):
+    """Impressão digital e horário (epoch) da última execução bem-sucedida do estágio."""
+    registro = estado.get(nome)
+    if isinstance(registro, str):
+        # Estado gravado antes da validade existir: só a impressão, sem horário
+        return registro, None
+    if not registro:
+        return None, None
+    return registro.get('impressao'), registro.get('concluido_em')
+
+
+def _pode_pular(estagio, impressao, estado):
+    """Entradas iguais às da última execução bem-sucedida, ainda dentro da validade, saídas no lugar e nada pendente."""
+    impressao_anterior, concluido_em = _ultima_execucao(estado, estagio.nome)
+    if impressao is None or impressao_anterior != impressao:
+        return False
+    if estagio.validade is not None and (concluido_em is None or time.time() - concluido_em > estagio.validade):
+        return False
+    for caminho in estagio.saidas:
+        if not os.path.exists(caminho):
+            return False
+    if estagio.tem_pendencias is not None and estagio.tem_pendencias():
+        return False
+    return True
+
+
+def _validar_grafo(estagios):
+    nomes = set()
+    for estagio in estagios:
+        if estagio.nome in nomes:
+            raise ValueError(f"Estágio duplicado: {estagio.nome}")
+        nomes.add(estagio.nome)
+    for estagio in estagios:
+        for dependencia in estagio.depende_de:
+            if dependencia not in nomes:
+                raise ValueError(f"Estágio '{estagio.nome}' depende de '{dependencia}', que não existe")
+
+
+def executar_grafo(estagios, max_paralelo=MAX_PARALELO_PADRAO, arquivo_estado=ARQUIVO_ESTADO):
+    """
+    Executa os estágios respeitando as dependências; estágios independentes rodam ao mesmo tempo
+
+    Args:
+        estagios: lista de Estagio
+        max_paralelo: nº máximo de estágios rodando simultaneamente
+        arquivo_estado: JSON com a impressão digital das entradas e o horário da última execução bem-sucedida
+
+    Returns:
+        dict: {nome do estágio: {'situacao': 'ok'|'pulado'|'erro'|'cancelado', 'segundos': float, 'erro': str}}
+    """
+    _validar_grafo(estagios)
+    estado = _carregar_estado(arquivo_estado)
+    relatorio = {}
+    em_execucao = {}  # futuro -> (nome do estágio, impressão digital das entradas)
+
+    def executar(estagio):
+        inicio = time.time()
+        estagio.funcao()
+        return time.time() - inicio
+
+    def liberados():
+        """Estágios cujas dependências terminaram e que ainda não começaram."""
+        rodando = {nome for nome, _ in em_execucao.values()}
+        prontos = []
+        for estagio in estagios:
+            if estagio.nome in relatorio or estagio.nome in rodando:
+                continue
+            situacoes = [relatorio.get(dep, {}).get('situacao') for dep in estagio.depende_de]
+            if any(s in ('erro', 'cancelado') for s in situacoes):
+                relatorio[estagio.nome] = {'situacao': 'cancelado', 'segundos': 0.0,
+                                           'erro': "Uma dependência falhou"}
+                continue
+            if all(s in ('ok', 'pulado') for s in situacoes):
+                prontos.append(estagio)
+        return prontos
+
+    with ThreadPoolExecutor(max_workers=max_paralelo) as executor:
+        while len(relatorio) < len(estagios):
+            ja_resolvidos = len(relatorio)
+            prontos = liberados()
+
+            for estagio in prontos:
+                impressao = _impressao_digital(estagio)
+                if _pode_pular(estagio, impressao, estado):
+                    print(f"[Orquestrador] '{estagio.nome}' pulado: entradas não mudaram e a última execução ainda vale.")
+                    relatorio[estagio.nome] = {'situacao': 'pulado', 'segundos': 0.0, 'erro': None}
+                    continue
+
+                print(f"[Orquestrador] Iniciando '{estagio.nome}'...")
+                em_execucao[executor.submit(executar, estagio)] = (estagio.nome, impressao)
+
+            if not em_execucao:
+                if not prontos and len(relatorio) == ja_resolvidos:
+                    raise ValueError("Dependência circular entre os estágios")
+                # Pulos/cancelamentos podem ter liberado novos estágios: volta para o início do laço
+                continue
+
+            concluidos, _ = wait(list(em_execucao), return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                nome, impressao = em_execucao.pop(futuro)
+                try:
+                    segundos = futuro.result()
+                    relatorio[nome] = {'situacao': 'ok', 'segundos': round(segundos, 1), 'erro': None}
+                    if impressao is not None:
+                        estado[nome] = {'impressao': impressao, 'concluido_em': time.time()}
+                        _salvar_estado(arquivo_estado, estado)
+                    print(f"[Orquestrador] '{nome}' terminou em {segundos:.1f}s.")
+                except BaseException as e:
+                    # BaseException: os módulos usam exit() quando não conseguem continuar
+                    relatorio[nome] = {'situacao': 'erro', 'segundos': 0.0, 'erro': repr(e)}
+                    print(f"[Orquestrador] '{nome}' falhou: {e!r}")
+
+    print("\n--- Tempo por estágio ---")
+    for estagio in estagios:
+        linha = relatorio[estagio.nome]
+        print(f"{estagio.nome:.<25} {linha['situacao']:<10} {linha['segundos']:>8.1f}s")
+
+    # Mantém a ordem declarada no relatório
+    return {estagio.nome: relatorio[estagio.nome] for estagio in estagios}
@@ -0,0 +1,90 @@
+import gspread
+from gspread.utils import a1_to_rowcol
+
+# --- GOOGLE SHEETS FALSO (EM MEMÓRIA) ---
+# Imita só a parte do gspread usada pelo conectar_google_api (open_by_key, worksheet, add_worksheet,
+# get_all_values, update, batch_update, resize, clear) para testar o salvar_dataframe sem a API.
+# Para usar: conectar_google_api.definir_cliente(ClienteFalso()).
+
+
+class AbaFalsa:
+    """
+    Aba com grade de tamanho fixo, como a real: escrever fora da grade dá erro
+
+    Cada chamada que iria para a API fica em self.requisicoes como (método, nº de linhas).
+    """
+
+    def __init__(self, titulo, rows=1000, cols=26):
+        self.title = titulo
+        self.row_count = rows
+        self.col_count = cols
+        self.celulas = {}  # (linha, coluna) -> valor, começando em 1 como na API
+        self.requisicoes = []
+
+    def _escrever(self, linha, coluna, valores):
+        for i, valores_linha in enumerate(valores):
+            for j, valor in enumerate(valores_linha):
+                if linha + i > self.row_count or coluna + j > self.col_count:
+                    raise ValueError(f"Intervalo fora da grade ({self.row_count}x{self.col_count})")
+                self.celulas[(linha + i, coluna + j)] = valor
+
+    def get_all_values(self, **kwargs):
+        self.requisicoes.append(('get_all_values', 0))
+        ocupadas = [c for c, v in self.celulas.items() if v != '']
+        if not ocupadas:
+            return []
+        linhas = max(l for l, _ in ocupadas)
+        colunas = max(c for _, c in ocupadas)
+        return [[self.celulas.get((l, c), '') for c in range(1, colunas + 1)] for l in range(1, linhas + 1)]
+
+    def update(self, range_name, values):
+        self.requisicoes.append(('update', len(values)))
+        linha, coluna = a1_to_rowcol(range_name.split(':')[0])
+        self._escrever(linha, coluna, values)
+
+    def batch_update(self, data):
+        self.requisicoes.append(('batch_update', len(data)))
+        for intervalo in data:
+            linha, coluna = a1_to_rowcol(intervalo['range'].split(':')[0])
+            self._escrever(linha, coluna, intervalo['values'])
+
+    def resize(self, rows=None, cols=None):
+        self.requisicoes.append(('resize', 0))
+        self.row_count = rows if rows is not None else self.row_count
+        self.col_count = cols if cols is not None else self.col_count
+        # Linhas/colunas cortadas da grade somem junto com o conteúdo
+        self.celulas = {(l, c): v for (l, c), v in self.celulas.items() if l <= self.row_count and c <= self.col_count}
+
+    def clear(self):
+        self.requisicoes.append(('clear', 0))
+        self.celulas = {}
+
+    def valores(self):
+        """Conteúdo atual da aba, sem contar como requisição (para conferir nos testes)."""
+        conteudo = self.get_all_values()
+        self.requisicoes.pop()
+        return conteudo
+
+
+class PlanilhaFalsa:
+    def __init__(self):
+        self.abas = {}
+
+    def worksheet(self, titulo):
+        if titulo not in self.abas:
+            raise gspread.WorksheetNotFound(titulo)
+        return self.abas[titulo]
+
+    def add_worksheet(self, title, rows, cols):
+        self.abas[title] = AbaFalsa(title, rows, cols)
+        return self.abas[title]
+
+
+class ClienteFalso:
+    """Substituto do gspread.Client: cada id de planilha abre (ou cria) uma PlanilhaFalsa."""
+
+    def __init__(self):
+        self.planilhas = {}
+
+    def open_by_key(self, id_planilha):
+        return self.planilhas.setdefault(id_planilha, PlanilhaFalsa())
@@ -0,0 +1,360 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# --- SERVIDOR FALSO DO SOFASCORE ---
+# Imita os endpoints usados pelos scrapers para rodar o pipeline sem o site real.
+# Para usar: SOFASCORE_URL_SITE=http://127.0.0.1:<porta> antes de importar o cliente_http.
+
+# Métricas reais do /statistics/overall; o resto do payload é completado com 'metrica_N'
+METRICAS_REAIS = [
+    ('rating', float), ('totalRating', float), ('countRating', int), ('goals', int),
+    ('bigChancesCreated', int), ('bigChancesMissed', int), ('assists', int), ('expectedAssists', float),
+    ('accuratePasses', int), ('inaccuratePasses', int), ('totalPasses', int),
+    ('accuratePassesPercentage', float), ('minutesPlayed', int), ('appearances', int),
+    ('tackles', int), ('interceptions', int), ('saves', int), ('yellowCards', int),
+]
+POSICOES = ['G', 'D', 'M', 'F']
+POSICOES_DETALHADAS = {'G': ['GK'], 'D': ['DC', 'DR', 'DL'], 'M': ['DM', 'MC', 'AM', 'MR', 'ML'],
+                       'F': ['ST', 'RW', 'LW']}
+
+ROTAS = [
+    ('standings', re.compile(r'/api/v1/unique-tournament/(\d+)/season/(\d+)/standings/total$')),
+    ('elenco', re.compile(r'/api/v1/team/(\d+)/players$')),
+    ('caracteristicas', re.compile(r'/api/v1/player/(\d+)/characteristics$')),
+    ('estatisticas', re.compile(r'/api/v1/player/(\d+)/unique-tournament/(\d+)/season/(\d+)/statistics/overall$')),
+    ('rodadas', re.compile(r'/api/v1/unique-tournament/(\d+)/season/(\d+)/rounds$')),
+    ('eventos', re.compile(r'/api/v1/unique-tournament/(\d+)/season/(\d+)/events/round/(\d+)$')),
+    ('escalacoes', re.compile(r'/api/v1/event/(\d+)/lineups$')),
+]
+
+
+def carregar_gravacoes(pasta_cache):
+    """
+    Lê respostas reais gravadas pelo cache_http para servi-las no lugar das sintéticas
+
+    Args:
+        pasta_cache: pasta do cache_http (cada entrada guarda url, status e corpo)
+
+    Returns:
+        dict: caminho da url -> (status, corpo)
+    """
+    gravacoes = {}
+    for raiz, _, arquivos in os.walk(pasta_cache):
+        for nome in arquivos:
+            if not nome.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(raiz, nome), 'r', encoding='utf-8') as f:
+                    entrada = json.load(f)
+                gravacoes[urlsplit(entrada['url']).path] = (entrada['status_code'], entrada['corpo'])
+            except (OSError, ValueError, KeyError):
+                continue
+    print(f"[Servidor falso] {len(gravacoes)} respostas gravadas carregadas de {pasta_cache}")
+    return gravacoes
+
+
+class ServidorFalso:
+    """
+    Servidor HTTP local com payloads sintéticos (ou gravados) e falhas injetáveis.
+
+    Args:
+        times: nº de times na tabela (o tamanho do campeonato)
+        jogadores_por_time: nº de jogadores em cada elenco (máx. 99)
+        numero_metricas: nº de métricas no payload de estatísticas
+        latencia_ms: latência média de cada resposta (varia entre 50% e 150% desse valor)
+        taxa_403: fração das requisições respondidas com 403 (bloqueio)
+        taxa_429: fração respondida com 429 e Retry-After
+        taxa_5xx: fração respondida com 503
+        semente: semente dos dados sintéticos e do sorteio de falhas
+        pasta_gravacoes: pasta do cache_http com respostas reais (têm prioridade sobre as sintéticas)
+        rodada_atual: rodada em andamento (as anteriores aparecem encerradas); None = temporada encerrada
+        porta: porta local (0 = qualquer porta livre)
+    """
+
+    def __init__(self, times=20, jogadores_por_time=30, numero_metricas=116, latencia_ms=0,
+                 taxa_403=0.0, taxa_429=0.0, taxa_5xx=0.0, semente=42, pasta_gravacoes=None, rodada_atual=None,
+                 porta=0):
+        self.times = times
+        self.jogadores_por_time = min(jogadores_por_time, 99)
+        self.numero_metricas = numero_metricas
+        self.latencia_ms = latencia_ms
+        self.taxa_403 = taxa_403
+        self.taxa_429 = taxa_429
+        self.taxa_5xx = taxa_5xx
+        self.semente = semente
+        self.gravacoes = carregar_gravacoes(pasta_gravacoes) if pasta_gravacoes else {}
+        self.rodada_atual = rodada_atual
+        self.porta = porta
+        self.registros = []  # (rota, status, segundos de atendimento, instante)
+        self._sorteio = random.Random(semente)
+        self._trava = threading.Lock()
+        self._http = None
+        self._thread = None
+
+    # --- PAYLOADS SINTÉTICOS ---
+
+    def _standings(self):
+        linhas = []
+        for posicao, time_id in enumerate(range(1, self.times + 1), start=1):
+            linhas.append({'position': posicao, 'team': {'id': time_id, 'name': f'Time {time_id}'}})
+        return {'standings': [{'rows': linhas}]}
+
+    def _elenco(self, time_id):
+        if not 1 <= time_id <= self.times:
+            return None
+        jogadores = []
+        for numero in range(1, self.jogadores_por_time + 1):
+            player_id = time_id * 100 + numero
+            aleatorio = random.Random(self.semente + player_id)
+            posicao = aleatorio.choice(POSICOES)
+            jogadores.append({'player': {
+                'id': player_id,
+                'name': f'Jogador {player_id}',
+                'slug': f'jogador-{player_id}',
+                'position': posicao,
+                'positionsDetailed': aleatorio.sample(POSICOES_DETALHADAS[posicao], 1),
+                'dateOfBirthTimestamp': aleatorio.randint(631152000, 1104537600),
+                'height': aleatorio.randint(165, 200),
+                'preferredFoot': aleatorio.choice(['Right', 'Left', 'Both']),
+                'country': {'name': 'Brazil'},
+            }})
+        return {'players': jogadores}
+
+    def _existe(self, player_id):
+        return 1 <= player_id // 100 <= self.times and 1 <= player_id % 100 <= self.jogadores_por_time
+
+    def _caracteristicas(self, player_id):
+        if not self._existe(player_id):
+            return None
+        aleatorio = random.Random(self.semente + player_id)
+        posicao = aleatorio.choice(POSICOES)
+        return {
+            'positions': aleatorio.sample(POSICOES_DETALHADAS[posicao], 1),
+            'positive': [{'type': t, 'rank': 1} for t in aleatorio.sample(range(1, 40), 3)],
+            'negative': [{'type': t, 'rank': 1} for t in aleatorio.sample(range(1, 40), 2)],
+        }
+
+    def _estatisticas(self, player_id):
+        if not self._existe(player_id):
+            return None
+        aleatorio = random.Random(self.semente + player_id)
+        estatisticas = {}
+        for nome, tipo in METRICAS_REAIS[:self.numero_metricas]:
+            estatisticas[nome] = round(aleatorio.uniform(0, 10), 2) if tipo is float else aleatorio.randint(0, 50)
+        for numero in range(len(estatisticas), self.numero_metricas):
+            estatisticas[f'metrica_{numero}'] = aleatorio.randint(0, 100)
+        estatisticas['type'] = 'overall'
+        return {'statistics': estatisticas}
+
+    def _confrontos(self, rodada):
+        """Pares (mandante, visitante) da rodada pelo método do círculo (turno e returno)."""
+        times = list(range(1, self.times + 1))
+        if len(times) % 2:
+            times.append(None)
+        total_turno = len(times) - 1
+        giro = (rodada - 1) % total_turno
+        ordem = [times[0]] + (times[1:][-giro:] + times[1:][:-giro] if giro else times[1:])
+        pares = []
+        for i in range(len(ordem) // 2):
+            mandante, visitante = ordem[i], ordem[-1 - i]
+            if mandante is None or visitante is None:
+                continue
+            pares.append((visitante, mandante) if rodada > total_turno else (mandante, visitante))
+        return pares
+
+    def _total_rodadas(self):
+        return 2 * (self.times - 1 + self.times % 2)
+
+    def _rodadas(self):
+        total = self._total_rodadas()
+        return {'currentRound': {'round': self.rodada_atual or total},
+                'rounds': [{'round': r} for r in range(1, total + 1)]}
+
+    def _eventos(self, rodada):
+        if not 1 <= rodada <= self._total_rodadas():
+            return None
+        encerrada = self.rodada_atual is None or rodada < self.rodada_atual
+        eventos = []
+        for numero, (mandante, visitante) in enumerate(self._confrontos(rodada)):
+            eventos.append({
+                'id': rodada * 1000 + numero,
+                'startTimestamp': 1735700000 + rodada * 7 * 86400,
+                'status': {'type': 'finished' if encerrada else 'notstarted'},
+                'homeTeam': {'id': mandante, 'name': f'Time {mandante}'},
+                'awayTeam': {'id': visitante, 'name': f'Time {visitante}'},
+            })
+        return {'events': eventos}
+
+    def _escalacoes(self, id_evento):
+        rodada, numero = divmod(id_evento, 1000)
+        pares = self._confrontos(rodada) if 1 <= rodada <= self._total_rodadas() else []
+        if numero >= len(pares):
+            return None
+        aleatorio = random.Random(self.semente + id_evento)
+        lados = {}
+        for lado, time_id in zip(('home', 'away'), pares[numero]):
+            jogadores = []
+            for numero_jogador in range(1, min(self.jogadores_por_time, 14) + 1):
+                player_id = time_id * 100 + numero_jogador
+                estatisticas = {}
+                if numero_jogador <= 11 or aleatorio.random() < 0.5:
+                    estatisticas = {
+                        'minutesPlayed': 90 if numero_jogador <= 11 else aleatorio.randint(5, 45),
+                        'rating': round(aleatorio.uniform(5.5, 9.0), 1),
+                        'goals': aleatorio.choice([0, 0, 0, 1]),
+                        'totalPass': aleatorio.randint(5, 80),
+                        'accuratePass': aleatorio.randint(0, 60),
+                        'totalTackle': aleatorio.randint(0, 6),
+                    }
+                    # Como o Sofascore: estatística zerada não vem na escalação
+                    estatisticas = {chave: valor for chave, valor in estatisticas.items() if valor}
+                jogadores.append({'player': {'id': player_id, 'name': f'Jogador {player_id}'},
+                                  'position': aleatorio.choice(POSICOES), 'statistics': estatisticas})
+            lados[lado] = {'players': jogadores}
+        return lados
+
+    def responder(self, caminho):
+        """
+        Monta a resposta de um caminho (sem latência nem falhas)
+
+        Returns:
+            tuple: (nome da rota, status, corpo em bytes)
+        """
+        for nome, padrao in ROTAS:
+            encontrado = padrao.match(caminho)
+            if not encontrado:
+                continue
+            if caminho in self.gravacoes:
+                status, corpo = self.gravacoes[caminho]
+                return nome, status, corpo.encode('utf-8')
+
+            if nome == 'standings':
+                payload = self._standings()
+            elif nome == 'elenco':
+                payload = self._elenco(int(encontrado.group(1)))
+            elif nome == 'caracteristicas':
+                payload = self._caracteristicas(int(encontrado.group(1)))
+            elif nome == 'estatisticas':
+                payload = self._estatisticas(int(encontrado.group(1)))
+            elif nome == 'rodadas':
+                payload = self._rodadas()
+            elif nome == 'eventos':
+                payload = self._eventos(int(encontrado.group(3)))
+            else:
+                payload = self._escalacoes(int(encontrado.group(1)))
+
+            if payload is None:
+                return nome, 404, b'{"error": {"code": 404, "message": "Not Found"}}'
+            return nome, 200, json.dumps(payload).encode('utf-8')
+        return 'desconhecida', 404, b'{"error": {"code": 404, "message": "Not Found"}}'
+
+    def _sortear_falha(self):
+        with self._trava:
+            sorteio = self._sorteio.random()
+        if sorteio < self.taxa_403:
+            return 403
+        if sorteio < self.taxa_403 + self.taxa_429:
+            return 429
+        if sorteio < self.taxa_403 + self.taxa_429 + self.taxa_5xx:
+            return 503
+        return None
+
+    # --- CICLO DE VIDA ---
+
+    def iniciar(self):
+        """
+        Sobe o servidor numa thread em segundo plano
+
+        Returns:
+            str: url do site falso (valor para SOFASCORE_URL_SITE)
+        """
+        servidor = self
+
+        class Atendente(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, como o site real
+
+            def do_GET(self):
+                inicio = time.perf_counter()
+                caminho = urlsplit(self.path).path
+                rota, status, corpo = servidor.responder(caminho)
+                headers = {'Content-Type': 'application/json'}
+
+                if servidor.latencia_ms:
+                    time.sleep(servidor.latencia_ms * random.uniform(0.5, 1.5) / 1000)
+
+                falha = servidor._sortear_falha()
+                if falha is not None:
+                    status, corpo = falha, b'{"error": {"code": %d}}' % falha
+                    if falha == 429:
+                        headers['Retry-After'] = '1'
+                elif status == 200:
+                    etag = '"' + hashlib.sha1(corpo).hexdigest() + '"'
+                    headers['ETag'] = etag
+                    if self.headers.get('If-None-Match') == etag:
+                        status, corpo = 304, b''
+
+                self.send_response(status)
+                for chave, valor in headers.items():
+                    self.send_header(chave, valor)
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+                with servidor._trava:
+                    servidor.registros.append((rota, status, time.perf_counter() - inicio, time.time()))
+
+            def log_message(self, formato, *args):
+                pass  # sem uma linha no terminal por requisição
+
+        self._http = ThreadingHTTPServer(('127.0.0.1', self.porta), Atendente)
+        self._http.daemon_threads = True
+        self.porta = self._http.server_address[1]
+        self._thread = threading.Thread(target=self._http.serve_forever, daemon=True)
+        self._thread.start()
+        url = f'http://127.0.0.1:{self.porta}'
+        print(f"[Servidor falso] Ouvindo em {url} ({self.times} times x {self.jogadores_por_time} jogadores)")
+        return url
+
+    def parar(self):
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+            self._http = None
+
+    def zerar_registros(self):
+        """Devolve os registros acumulados e começa uma nova contagem."""
+        with self._trava:
+            registros = self.registros
+            self.registros = []
+        return registros
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor falso do Sofascore para testes offline")
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--times', type=int, default=20)
+    parser.add_argument('--jogadores-por-time', type=int, default=30)
+    parser.add_argument('--latencia-ms', type=float, default=0)
+    parser.add_argument('--taxa-403', type=float, default=0.0)
+    parser.add_argument('--taxa-429', type=float, default=0.0)
+    parser.add_argument('--taxa-5xx', type=float, default=0.0)
+    parser.add_argument('--gravacoes', default=None, help="pasta do cache_http com respostas reais")
+    args = parser.parse_args()
+
+    servidor = ServidorFalso(times=args.times, jogadores_por_time=args.jogadores_por_time,
+                             latencia_ms=args.latencia_ms, taxa_403=args.taxa_403, taxa_429=args.taxa_429,
+                             taxa_5xx=args.taxa_5xx, pasta_gravacoes=args.gravacoes, porta=args.porta)
+    servidor.iniciar()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        servidor.parar()
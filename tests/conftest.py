@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+# Os módulos são importados pelo nome, como quando os scripts rodam de dentro da própria pasta
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for pasta in ('src/scrappers', 'src/database'):
+    caminho = os.path.join(RAIZ, pasta)
+    if caminho not in sys.path:
+        sys.path.insert(0, caminho)
+
+# O database.py cria o engine ao ser importado: os testes usam um SQLite descartável
+os.environ['TCC_BANCO'] = 'sqlite'
+os.environ['TCC_DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'tcc_testes.sqlite')}"
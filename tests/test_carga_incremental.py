@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from database import engine, Base
+import models  # noqa: F401 (registra as tabelas no Base)
+from models import COLUNAS_METRICAS
+from limpeza_insercao_bd import carregar_estatisticas_incremental
+
+JOGADORES = 60
+
+
+@pytest.fixture
+def banco():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conexao:
+        conexao.execute(text("INSERT INTO jogadores (player_id, name, slug) VALUES (:id, :nome, :slug)"),
+                        [{'id': pid, 'nome': f"J{pid}", 'slug': f"j{pid}"} for pid in range(1, JOGADORES + 1)])
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+def _estatisticas(ids):
+    aleatorio = np.random.default_rng(7)
+    df = pd.DataFrame(aleatorio.integers(0, 50, size=(len(ids), len(COLUNAS_METRICAS))).astype(float),
+                      columns=COLUNAS_METRICAS)
+    df.insert(0, 'player_id', list(ids))
+    return df
+
+
+def _contar(nome_tabela):
+    with engine.connect() as conexao:
+        return conexao.execute(text(f"SELECT COUNT(*) FROM {nome_tabela}")).scalar()
+
+
+def test_carga_incremental_so_grava_o_que_mudou(banco):
+    df = _estatisticas(range(1, JOGADORES + 1))
+
+    primeira = carregar_estatisticas_incremental(df)
+    assert primeira == {'inseridos': 60, 'atualizados': 0, 'inalterados': 0, 'removidos': 0}
+
+    # Mesma planilha: nada a gravar
+    segunda = carregar_estatisticas_incremental(df)
+    assert segunda == {'inseridos': 0, 'atualizados': 0, 'inalterados': 60, 'removidos': 0}
+
+    # 3 jogadores com métricas novas e 1 que saiu da planilha
+    df_rodada = df[df['player_id'] != 60].copy()
+    df_rodada.loc[df_rodada['player_id'].isin([1, 2, 3]), 'goals'] += 1
+    terceira = carregar_estatisticas_incremental(df_rodada)
+    assert terceira == {'inseridos': 0, 'atualizados': 3, 'inalterados': 56, 'removidos': 1}
+
+    assert _contar('estatisticas_2025') == 59
+    assert _contar('hash_estatisticas_2025') == 59
+    with engine.connect() as conexao:
+        gols = conexao.execute(text("SELECT goals FROM estatisticas_2025 WHERE player_id = 1")).scalar()
+    assert gols == df.loc[df['player_id'] == 1, 'goals'].iloc[0] + 1
+
+
+def test_tipo_da_coluna_nao_muda_o_hash(banco):
+    df = _estatisticas(range(1, 11))
+    carregar_estatisticas_incremental(df)
+
+    # Mesmos valores lidos como inteiros numa carga seguinte
+    df_inteiros = df.astype({'goals': 'int64', 'assists': 'int64'})
+    assert carregar_estatisticas_incremental(df_inteiros)['inalterados'] == 10
@@ -0,0 +1,144 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip('gspread')
+
+import conectar_google_api as api
+from planilha_falsa import ClienteFalso
+
+ID_PLANILHA = 'id'
+ABA = 'Teste'
+
+
+@pytest.fixture
+def cliente():
+    cliente = ClienteFalso()
+    api.definir_cliente(cliente)
+    yield cliente
+    api.limpar_cache()
+
+
+def _aba(cliente):
+    return cliente.open_by_key(ID_PLANILHA).worksheet(ABA)
+
+
+def _df(ids, valor=1.0):
+    return pd.DataFrame({'player_id': list(ids), 'nome': [f"J{i}" for i in ids], 'nota': [valor] * len(ids)})
+
+
+def _chaves(aba):
+    return [linha[0] for linha in aba.valores()[1:]]
+
+
+def _contar(aba, metodo):
+    return [linhas for nome, linhas in aba.requisicoes if nome == metodo]
+
+
+def test_substituir_envia_em_lotes(cliente):
+    api.salvar_dataframe(_df(range(7)), ID_PLANILHA, ABA, lote_linhas=3)
+
+    aba = _aba(cliente)
+    # Cabeçalho + 7 linhas em lotes de 3
+    assert _contar(aba, 'update') == [3, 3, 2]
+    assert aba.valores()[0] == ['player_id', 'nome', 'nota']
+    assert _chaves(aba) == list(range(7))
+
+
+def test_substituir_aumenta_a_grade(cliente):
+    api.salvar_dataframe(_df(range(3)), ID_PLANILHA, ABA)
+    aba = _aba(cliente)
+    aba.resize(rows=4)
+
+    api.salvar_dataframe(_df(range(100)), ID_PLANILHA, ABA, lote_linhas=40)
+
+    assert aba.row_count >= 101
+    assert _chaves(aba) == list(range(100))
+
+
+def test_anexar_so_acrescenta_chaves_novas(cliente):
+    api.salvar_dataframe(_df(range(3)), ID_PLANILHA, ABA)
+    aba = _aba(cliente)
+    aba.requisicoes.clear()
+
+    # A nota mudou, mas ANEXAR não reescreve linhas existentes
+    api.salvar_dataframe(_df(range(5), valor=2.0), ID_PLANILHA, ABA, modo=api.ANEXAR)
+
+    assert _contar(aba, 'update') == [2]
+    assert _contar(aba, 'batch_update') == []
+    assert _chaves(aba) == list(range(5))
+    assert aba.valores()[1][2] == 1.0
+
+
+def test_alterados_sem_mudanca_nao_escreve(cliente):
+    api.salvar_dataframe(_df(range(5)), ID_PLANILHA, ABA)
+    aba = _aba(cliente)
+    aba.requisicoes.clear()
+
+    # 1 e 1.0 são o mesmo valor para o Sheets
+    df = _df(range(5))
+    df['nota'] = 1
+    api.salvar_dataframe(df, ID_PLANILHA, ABA, modo=api.ALTERADOS)
+
+    assert [nome for nome, _ in aba.requisicoes] == ['get_all_values']
+
+
+def test_alterados_reescreve_so_as_linhas_que_mudaram(cliente):
+    api.salvar_dataframe(_df(range(10)), ID_PLANILHA, ABA)
+    aba = _aba(cliente)
+    aba.requisicoes.clear()
+
+    df = _df(range(10))
+    df.loc[df['player_id'].isin([2, 5, 7]), 'nota'] = 9.0
+    api.salvar_dataframe(df, ID_PLANILHA, ABA, modo=api.ALTERADOS, lote_linhas=2)
+
+    # 3 linhas alteradas em lotes de 2 entradas
+    assert _contar(aba, 'batch_update') == [2, 1]
+    assert _contar(aba, 'update') == []
+    notas = {linha[0]: linha[2] for linha in aba.valores()[1:]}
+    assert [pid for pid, nota in notas.items() if nota == 9.0] == [2, 5, 7]
+
+
+def test_alterados_remove_chaves_que_sairam(cliente):
+    api.salvar_dataframe(_df(range(10)), ID_PLANILHA, ABA)
+    aba = _aba(cliente)
+
+    # Saem 1, 4 e 8; nada entra
+    restantes = [0, 2, 3, 5, 6, 7, 9]
+    api.salvar_dataframe(_df(restantes), ID_PLANILHA, ABA, modo=api.ALTERADOS)
+
+    assert sorted(_chaves(aba)) == restantes
+    assert aba.row_count == len(restantes) + 1
+    assert all(linha[1] == f"J{linha[0]}" for linha in aba.valores()[1:])
+
+
+def test_alterados_reaproveita_linhas_das_saidas(cliente):
+    api.salvar_dataframe(_df(range(6)), ID_PLANILHA, ABA)
+    aba = _aba(cliente)
+    aba.requisicoes.clear()
+
+    # Saem 1 e 3, entram 10, 11 e 12: duas vão para as vagas, uma vai para o fim
+    df = _df([0, 2, 4, 5, 10, 11, 12])
+    api.salvar_dataframe(df, ID_PLANILHA, ABA, modo=api.ALTERADOS)
+
+    assert _chaves(aba) == [0, 10, 2, 11, 4, 5, 12]
+    assert _contar(aba, 'resize') == []
+
+
+def test_alterados_remove_linhas_com_chave_repetida(cliente):
+    api.salvar_dataframe(_df([1, 2, 2, 3]), ID_PLANILHA, ABA)
+    aba = _aba(cliente)
+
+    api.salvar_dataframe(_df([1, 2, 3]), ID_PLANILHA, ABA, modo=api.ALTERADOS)
+
+    assert sorted(_chaves(aba)) == [1, 2, 3]
+
+
+def test_cabecalho_diferente_reescreve_a_aba(cliente):
+    api.salvar_dataframe(_df(range(3)), ID_PLANILHA, ABA)
+    aba = _aba(cliente)
+
+    df = _df(range(3)).rename(columns={'nota': 'rating'})
+    api.salvar_dataframe(df, ID_PLANILHA, ABA, modo=api.ALTERADOS)
+
+    assert aba.valores()[0] == ['player_id', 'nome', 'rating']
+    assert _chaves(aba) == [0, 1, 2]
@@ -0,0 +1,37 @@
+import json
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('gspread')
+
+from conversor_jsonl import processar_conversao
+
+
+def _jsonl(caminho, registros):
+    with open(caminho, 'w', encoding='utf-8') as f:
+        for registro in registros:
+            f.write(json.dumps(registro) + '\n')
+
+
+def test_recoleta_vale_a_linha_mais_recente(tmp_path):
+    arquivo_jsonl = str(tmp_path / 'dados.jsonl')
+    arquivo_csv = str(tmp_path / 'stats.csv')
+    _jsonl(arquivo_jsonl, [{'player_id': 1, 'goals': 1}, {'player_id': 2, 'goals': 0},
+                           {'player_id': 1, 'goals': 3}])
+
+    processar_conversao(arquivo_jsonl, arquivo_csv, publicar=False)
+
+    df = pd.read_csv(arquivo_csv, sep=';').set_index('player_id')
+    assert df['goals'].to_dict() == {1: 3, 2: 0}
+
+
+def test_quem_saiu_fica_fora_da_tabela(tmp_path):
+    arquivo_jsonl = str(tmp_path / 'dados.jsonl')
+    arquivo_csv = str(tmp_path / 'stats.csv')
+    _jsonl(arquivo_jsonl, [{'player_id': pid, 'goals': pid} for pid in (1, 2, 3)])
+
+    # 2 saiu do campeonato: continua no JSONL, mas não na fila
+    processar_conversao(arquivo_jsonl, arquivo_csv, publicar=False, ids_validos={1, 3})
+
+    assert sorted(pd.read_csv(arquivo_csv, sep=';')['player_id']) == [1, 3]
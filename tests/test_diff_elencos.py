@@ -0,0 +1,57 @@
+import pandas as pd
+
+from diff_elencos import calcular_alteracoes, salvar_alteracoes, carregar_alteracoes
+
+
+def _elenco(linhas):
+    return pd.DataFrame(linhas, columns=['id', 'time_id', 'position'])
+
+
+ANTERIOR = _elenco([(1, 10, 'F'), (2, 10, 'M'), (3, 20, 'D'), (4, 20, 'G'), (5, 30, 'M')])
+
+
+def test_primeira_execucao_e_completa():
+    alteracoes = calcular_alteracoes(None, ANTERIOR)
+
+    assert alteracoes['completo'] is True
+    assert alteracoes['novos'] == [1, 2, 3, 4, 5]
+    assert alteracoes['saidas'] == [] and alteracoes['alterados'] == []
+
+
+def test_classifica_novos_saidas_e_alterados():
+    novo = _elenco([
+        (1, 10, 'F'),   # igual
+        (2, 20, 'M'),   # mudou de time
+        (3, 20, 'M'),   # mudou de posição
+        (5, 30, 'M'),   # igual
+        (6, 30, 'F'),   # novo
+    ])                  # 4 saiu
+
+    alteracoes = calcular_alteracoes(ANTERIOR, novo)
+
+    assert alteracoes['completo'] is False
+    assert alteracoes['novos'] == [6]
+    assert alteracoes['saidas'] == [4]
+    assert alteracoes['alterados'] == [2, 3]
+
+
+def test_time_com_falha_nao_gera_saidas():
+    # O elenco do time 20 não foi baixado: 3 e 4 não aparecem, mas não saíram
+    novo = _elenco([(1, 10, 'F'), (2, 10, 'M'), (5, 30, 'M')])
+
+    alteracoes = calcular_alteracoes(ANTERIOR, novo, times_com_falha=[20])
+
+    assert alteracoes['saidas'] == []
+    assert alteracoes['novos'] == [] and alteracoes['alterados'] == []
+
+
+def test_carregar_ignora_descoberta_completa(tmp_path):
+    caminho = str(tmp_path / 'alteracoes.json')
+    assert carregar_alteracoes(caminho) is None
+
+    salvar_alteracoes(calcular_alteracoes(None, ANTERIOR), caminho)
+    assert carregar_alteracoes(caminho) is None
+
+    novo = _elenco([(1, 10, 'F'), (2, 10, 'M'), (3, 20, 'D'), (4, 20, 'G'), (5, 30, 'M'), (6, 30, 'F')])
+    salvar_alteracoes(calcular_alteracoes(ANTERIOR, novo), caminho)
+    assert carregar_alteracoes(caminho)['novos'] == [6]
@@ -0,0 +1,118 @@
+import pytest
+
+from fila_trabalho import FilaTrabalho, VALIDADE_CONCLUIDAS
+
+ENDPOINT = 'estatisticas'
+
+
+@pytest.fixture
+def fila(tmp_path):
+    fila = FilaTrabalho(str(tmp_path / 'fila.sqlite'))
+    yield fila
+    fila.fechar()
+
+
+def _envelhecer(fila, endpoint, player_id):
+    fila._executar("UPDATE tarefas SET atualizado_em = '2000-01-01 00:00:00' WHERE endpoint = ? AND player_id = ?",
+                   (endpoint, player_id))
+
+
+def test_ciclo_de_uma_tarefa(fila):
+    fila.enfileirar(ENDPOINT, [1, 2, 3])
+    assert fila.pendentes(ENDPOINT) == {1, 2, 3}
+
+    fila.iniciar(ENDPOINT, 1)
+    fila.iniciar(ENDPOINT, 2)
+    fila.iniciar(ENDPOINT, 3)
+    # Em andamento de uma execução que caiu continua pendente
+    assert fila.pendentes(ENDPOINT) == {1, 2, 3}
+
+    fila.concluir(ENDPOINT, 1, resultado={'player_id': 1, 'x': 'a'})
+    fila.falhar(ENDPOINT, 2, 'Status 500')
+    fila.devolver(ENDPOINT, 3)
+
+    assert fila.resumo(ENDPOINT) == {'concluido': 1, 'falhou': 1, 'pendente': 1}
+    assert fila.pendentes(ENDPOINT) == {3}
+    assert fila.resultados(ENDPOINT) == [{'player_id': 1, 'x': 'a'}]
+
+
+def test_reabrir_falhas(fila):
+    fila.enfileirar(ENDPOINT, [1, 2])
+    fila.falhar(ENDPOINT, 1, 'Falha de conexão')
+    fila.concluir(ENDPOINT, 2)
+
+    assert fila.reabrir_falhas(ENDPOINT) == 1
+    assert fila.pendentes(ENDPOINT) == {1}
+
+
+def test_enfileirar_nao_reabre_sem_pedir(fila):
+    fila.enfileirar(ENDPOINT, [1])
+    fila.concluir(ENDPOINT, 1)
+
+    fila.enfileirar(ENDPOINT, [1])
+    assert fila.pendentes(ENDPOINT) == set()
+
+    fila.enfileirar(ENDPOINT, [1], reabrir=True)
+    assert fila.pendentes(ENDPOINT) == {1}
+
+
+def test_endpoints_sao_independentes(fila):
+    fila.enfileirar('estatisticas', [1])
+    fila.enfileirar('caracteristicas', [1])
+    fila.concluir('estatisticas', 1)
+
+    assert fila.pendentes('estatisticas') == set()
+    assert fila.pendentes('caracteristicas') == {1}
+
+
+def test_semear_marca_como_concluido(fila):
+    assert fila.esta_vazia('caracteristicas')
+    fila.semear('caracteristicas', {1: {'player_id': 1}, 2: None})
+
+    assert not fila.esta_vazia('caracteristicas')
+    assert fila.pendentes('caracteristicas') == set()
+    assert fila.resultados('caracteristicas') == [{'player_id': 1}]
+
+
+def test_sincronizar_elenco_com_alteracoes(fila):
+    endpoint = 'caracteristicas'
+    fila.sincronizar_elenco(endpoint, [1, 2, 3], None)
+    for pid in (1, 2, 3):
+        fila.concluir(endpoint, pid)
+
+    alteracoes = {'novos': [4], 'alterados': [2], 'saidas': [3]}
+    fila.sincronizar_elenco(endpoint, [1, 2, 4], alteracoes)
+
+    assert fila.pendentes(endpoint) == {2, 4}
+    assert fila.resumo(endpoint) == {'concluido': 1, 'pendente': 2}
+
+
+def test_sincronizar_elenco_reabre_estatisticas_vencidas(fila):
+    assert ENDPOINT in VALIDADE_CONCLUIDAS
+    fila.sincronizar_elenco(ENDPOINT, [1, 2, 3], None)
+    for pid in (1, 2, 3):
+        fila.concluir(ENDPOINT, pid)
+    _envelhecer(fila, ENDPOINT, 1)
+
+    # Sem mudança de elenco: só quem passou da validade volta
+    fila.sincronizar_elenco(ENDPOINT, [1, 2, 3], {'novos': [], 'alterados': [], 'saidas': []})
+    assert fila.pendentes(ENDPOINT) == {1}
+
+
+def test_caracteristicas_nao_vencem(fila):
+    endpoint = 'caracteristicas'
+    assert endpoint not in VALIDADE_CONCLUIDAS
+    fila.sincronizar_elenco(endpoint, [1], None)
+    fila.concluir(endpoint, 1)
+    _envelhecer(fila, endpoint, 1)
+
+    fila.sincronizar_elenco(endpoint, [1], None)
+    assert fila.pendentes(endpoint) == set()
+
+
+def test_ids_sem_quem_saiu(fila):
+    fila.sincronizar_elenco(ENDPOINT, [1, 2, 3], None)
+    fila.concluir(ENDPOINT, 1)
+    fila.sincronizar_elenco(ENDPOINT, [1, 3], {'novos': [], 'alterados': [], 'saidas': [2]})
+
+    assert fila.ids(ENDPOINT) == {1, 3}
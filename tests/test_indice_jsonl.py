@@ -0,0 +1,95 @@
+import json
+import os
+
+import pytest
+
+from indice_jsonl import IndiceJsonl, FORMATO_ENTRADA, caminho_indice
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / 'dados.jsonl')
+
+
+def _gravar(caminho, registros):
+    indice = IndiceJsonl(caminho)
+    for registro in registros:
+        indice.anexar(registro)
+    indice.fechar()
+
+
+def test_anexar_e_ler(caminho):
+    _gravar(caminho, [{'player_id': 1, 'goals': 2}, {'player_id': 2, 'goals': 0}])
+
+    indice = IndiceJsonl(caminho)
+    assert indice.ids() == {1, 2}
+    assert 1 in indice
+    assert indice.ler(1) == {'player_id': 1, 'goals': 2}
+    assert indice.ler(99) is None
+
+
+def test_recoleta_vale_a_linha_mais_recente(caminho):
+    _gravar(caminho, [{'player_id': 1, 'goals': 2}, {'player_id': 1, 'goals': 3}])
+
+    assert IndiceJsonl(caminho).ler(1) == {'player_id': 1, 'goals': 3}
+
+
+def test_linha_rasgada_e_cortada(caminho):
+    _gravar(caminho, [{'player_id': 1, 'goals': 2}])
+    with open(caminho, 'ab') as f:
+        f.write(b'{"player_id": 2, "go')
+
+    indice = IndiceJsonl(caminho)
+    assert indice.ids() == {1}
+    with open(caminho, 'rb') as f:
+        assert f.read().endswith(b'\n')
+
+    # Depois do reparo o arquivo continua recebendo linhas normalmente
+    indice.anexar({'player_id': 2, 'goals': 1})
+    indice.fechar()
+    assert IndiceJsonl(caminho).ler(2) == {'player_id': 2, 'goals': 1}
+
+
+def test_entrada_do_indice_cortada_e_descartada(caminho):
+    _gravar(caminho, [{'player_id': 1}, {'player_id': 2}])
+    with open(caminho_indice(caminho), 'ab') as f:
+        f.write(b'\x01\x02\x03')
+
+    indice = IndiceJsonl(caminho)
+    assert indice.ids() == {1, 2}
+    assert os.path.getsize(caminho_indice(caminho)) == 2 * FORMATO_ENTRADA.size
+
+
+def test_indice_que_aponta_alem_do_jsonl(caminho):
+    _gravar(caminho, [{'player_id': 1}, {'player_id': 2}])
+    # Queda no meio da segunda linha, com o índice já gravado: a linha some e a entrada também
+    with open(caminho, 'r+b') as f:
+        f.truncate(os.path.getsize(caminho) - 3)
+
+    indice = IndiceJsonl(caminho)
+    assert indice.ids() == {1}
+    assert os.path.getsize(caminho_indice(caminho)) == FORMATO_ENTRADA.size
+
+
+def test_jsonl_sem_indice_e_indexado_na_abertura(caminho):
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'player_id': 1}) + '\n')
+        f.write('lixo que não é json\n')
+        f.write(json.dumps({'player_id': 2}) + '\n')
+
+    indice = IndiceJsonl(caminho)
+    assert indice.ids() == {1, 2}
+    assert indice.ler(2) == {'player_id': 2}
+    assert os.path.exists(caminho_indice(caminho))
+
+
+def test_checksum_invalido(caminho):
+    _gravar(caminho, [{'player_id': 1, 'goals': 2}])
+    # Mesmo tamanho, conteúdo diferente
+    with open(caminho, 'r+b') as f:
+        dados = f.read()
+        f.seek(0)
+        f.write(dados.replace(b'2}', b'7}'))
+
+    with pytest.raises(ValueError):
+        IndiceJsonl(caminho).ler(1)
@@ -0,0 +1,64 @@
+from email.utils import format_datetime
+from datetime import datetime, timezone
+
+import pytest
+
+from limitador_taxa import LimitadorAIMD, converter_retry_after, PAUSA_403
+
+AGORA = datetime(2025, 10, 21, 7, 28, 0, tzinfo=timezone.utc).timestamp()
+
+
+def test_retry_after_em_segundos():
+    assert converter_retry_after("30") == 30
+    assert converter_retry_after("-5") == 0
+    assert converter_retry_after(None) == 0
+    assert converter_retry_after("") == 0
+
+
+def test_retry_after_em_http_date():
+    assert converter_retry_after("Tue, 21 Oct 2025 07:29:30 GMT", agora=AGORA) == 90
+    horario = datetime.fromtimestamp(AGORA + 45, tz=timezone.utc)
+    assert converter_retry_after(format_datetime(horario, usegmt=True), agora=AGORA) == 45
+
+
+def test_retry_after_no_passado_nao_espera():
+    assert converter_retry_after("Tue, 21 Oct 2025 07:00:00 GMT", agora=AGORA) == 0
+
+
+def test_retry_after_invalido_nao_espera():
+    assert converter_retry_after("amanhã", agora=AGORA) == 0
+
+
+def _espacamentos(esperas):
+    # O relógio anda um pouco entre uma reserva e outra
+    return [pytest.approx(b - a, abs=0.01) for a, b in zip(esperas, esperas[1:])]
+
+
+def test_fim_da_pausa_403_nao_vira_rajada():
+    limitador = LimitadorAIMD()
+    limitador.registrar_resposta(403)
+
+    esperas = [limitador._reservar() for _ in range(10)]
+
+    assert min(esperas) >= PAUSA_403
+    # Depois da pausa, um a um no ritmo mínimo
+    assert _espacamentos(esperas) == [1 / limitador.taxa] * 9
+
+
+def test_retry_after_espaca_quem_esperou():
+    limitador = LimitadorAIMD(taxa_inicial=2.0)
+    limitador.registrar_resposta(429, retry_after="30")
+
+    esperas = [limitador._reservar() for _ in range(5)]
+
+    assert min(esperas) >= 30
+    assert _espacamentos(esperas) == [1 / limitador.taxa] * 4
+
+
+def test_reservas_anteriores_continuam_na_frente():
+    limitador = LimitadorAIMD(taxa_inicial=1.0)
+    antes = [limitador._reservar() for _ in range(3)]
+    limitador._pausar(10)
+    depois = limitador._reservar()
+
+    assert max(antes) < 10 <= depois
@@ -0,0 +1,50 @@
+import os
+
+import pandas as pd
+
+from modulo_partidas import (linhas_da_partida, pasta_da_rodada, elenco_da_temporada, _gravar, _ja_coletado,
+                             EXTENSAO, SUFIXO_SEM_ESCALACAO)
+
+
+def _evento(id_evento, timestamp, casa, fora):
+    return {'id': id_evento, 'startTimestamp': timestamp, 'homeTeam': {'id': casa}, 'awayTeam': {'id': fora}}
+
+
+def _jogador(player_id, posicao, minutos=90):
+    return {'player': {'id': player_id, 'name': f"J{player_id}"}, 'position': posicao,
+            'statistics': {'minutesPlayed': minutos} if minutos else {}}
+
+
+def _gravar_partida(pasta_partidas, rodada, evento, casa, fora):
+    linhas = linhas_da_partida(evento, rodada, {'home': {'players': casa}, 'away': {'players': fora}})
+    pasta = pasta_da_rodada(325, 1, rodada, pasta_partidas)
+    os.makedirs(pasta, exist_ok=True)
+    _gravar(pd.DataFrame(linhas), os.path.join(pasta, f"evento_{evento['id']}{EXTENSAO}"))
+
+
+def test_elenco_da_temporada_vem_das_escalacoes(tmp_path):
+    pasta = str(tmp_path)
+    # Rodada 1: jogador 2 pelo time 10; reserva 4 não entrou
+    _gravar_partida(pasta, 1, _evento(1, 100, 10, 20),
+                    [_jogador(1, 'F'), _jogador(2, 'M'), _jogador(4, 'D', minutos=0)], [_jogador(3, 'G')])
+    # Rodada 2: jogador 2 já joga pelo time 20, em outra posição
+    _gravar_partida(pasta, 2, _evento(2, 200, 30, 20), [_jogador(5, 'D')], [_jogador(2, 'F'), _jogador(3, 'G')])
+
+    elenco = elenco_da_temporada(325, 1, pasta).set_index('id')
+
+    assert sorted(elenco.index) == [1, 2, 3, 5]
+    assert elenco.loc[2, 'time_id'] == 20 and elenco.loc[2, 'position'] == 'F'
+    assert elenco.loc[1, 'name'] == 'J1'
+    assert list(elenco.columns) == ['name', 'slug', 'position', 'time_id']
+
+
+def test_elenco_de_temporada_sem_partidas(tmp_path):
+    assert elenco_da_temporada(325, 1, str(tmp_path)).empty
+
+
+def test_partida_sem_escalacao_conta_como_coletada(tmp_path):
+    pasta = str(tmp_path)
+    assert not _ja_coletado(pasta, 7)
+
+    open(os.path.join(pasta, f"evento_7{SUFIXO_SEM_ESCALACAO}"), 'w').close()
+    assert _ja_coletado(pasta, 7)
@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import pytest
+
+from operacoes_bd import chaves_estrangeiras_desligadas
+
+
+class ConexaoFalsa:
+    """Só o que o chaves_estrangeiras_desligadas usa de uma conexão MariaDB."""
+
+    def __init__(self, falhar_ao_religar=False):
+        self.dialect = SimpleNamespace(name='mariadb')
+        self.comandos = []
+        self.invalidada = False
+        self.falhar_ao_religar = falhar_ao_religar
+
+    def execute(self, comando):
+        sql = str(comando)
+        if self.falhar_ao_religar and sql.endswith('= 1'):
+            raise ConnectionError("servidor caiu")
+        self.comandos.append(sql)
+
+    def invalidate(self):
+        self.invalidada = True
+
+
+def test_religa_as_fks_depois_do_bloco():
+    conexao = ConexaoFalsa()
+    with chaves_estrangeiras_desligadas(conexao):
+        conexao.execute("DELETE FROM setores_ref")
+
+    assert conexao.comandos == ["SET FOREIGN_KEY_CHECKS = 0", "DELETE FROM setores_ref", "SET FOREIGN_KEY_CHECKS = 1"]
+
+
+def test_religa_as_fks_mesmo_com_erro():
+    conexao = ConexaoFalsa()
+    with pytest.raises(RuntimeError):
+        with chaves_estrangeiras_desligadas(conexao):
+            raise RuntimeError("INSERT falhou")
+
+    assert conexao.comandos[-1] == "SET FOREIGN_KEY_CHECKS = 1"
+    assert not conexao.invalidada
+
+
+def test_invalida_a_conexao_se_nao_conseguir_religar():
+    conexao = ConexaoFalsa(falhar_ao_religar=True)
+    with pytest.raises(ConnectionError):
+        with chaves_estrangeiras_desligadas(conexao):
+            pass
+
+    assert conexao.invalidada
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from database import engine, Base
+import models  # noqa: F401 (registra as tabelas no Base)
+from limpeza_insercao_bd import substituir_tabela
+
+
+@pytest.fixture
+def banco():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+def _setores():
+    with engine.connect() as conexao:
+        return dict(conexao.execute(text("SELECT id_setor, nome_setor FROM setores_ref ORDER BY id_setor")).all())
+
+
+def test_troca_tabela_referenciada(banco):
+    substituir_tabela('setores_ref', pd.DataFrame({'id_setor': [1, 2], 'nome_setor': ['Defesa', 'Meio']}))
+    substituir_tabela('setores_ref', pd.DataFrame({'id_setor': [1, 2], 'nome_setor': ['Defesa', 'Ataque']}))
+
+    assert _setores() == {1: 'Defesa', 2: 'Ataque'}
+
+
+def test_troca_com_colunas_em_outra_ordem(banco):
+    # Tabela viva criada fora do models.py, com as colunas na ordem inversa
+    with engine.begin() as conexao:
+        conexao.execute(text("PRAGMA foreign_keys = OFF"))
+        conexao.execute(text("DROP TABLE setores_ref"))
+        conexao.execute(text("CREATE TABLE setores_ref (nome_setor VARCHAR(50) NOT NULL, id_setor INTEGER PRIMARY KEY)"))
+        conexao.execute(text("INSERT INTO setores_ref VALUES ('Defesa', 1), ('Meio', 2)"))
+
+    substituir_tabela('setores_ref', pd.DataFrame({'id_setor': [1, 2], 'nome_setor': ['Defesa', 'Ataque']}))
+
+    assert _setores() == {1: 'Defesa', 2: 'Ataque'}